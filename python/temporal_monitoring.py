@@ -9,9 +9,12 @@ import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, Any, Optional, List
-from collections import defaultdict
+from collections import defaultdict, deque
 import statistics
 
+# Most recent API errors kept in memory; older ones are only in the event log
+MAX_RECENT_API_ERRORS = 100
+
 
 class TemporalMarkerMonitor:
     """Monitors temporal marker usage and performance"""
@@ -31,13 +34,31 @@ class TemporalMarkerMonitor:
             'total_marker_size_kb': 0,
             'marker_sizes': [],
             'extraction_times': [],
-            'api_errors': [],
+            'api_errors': deque(maxlen=MAX_RECENT_API_ERRORS),
+            'api_error_count': 0,
             'rollout_decisions': defaultdict(int)
         }
         
         # Load historical metrics
         self.historical_metrics = self._load_historical_metrics()
         
+        # Scores available to get_quality_comparison, so empty renders can skip it
+        self.quality_sample_count = sum(
+            len(scores) for scores in self.historical_metrics.get('insights_quality_scores', {}).values()
+        )
+        
+        # Bumped by every record_* call; derived views are cached per version
+        self._version = 0
+        self._derived_cache: Dict[str, Any] = {}
+        
+    def _cached(self, name: str, compute):
+        """Return compute() memoized until the next recorded event"""
+        entry = self._derived_cache.get(name)
+        if entry is None or entry[0] != self._version:
+            entry = (self._version, compute())
+            self._derived_cache[name] = entry
+        return entry[1]
+        
     def _load_historical_metrics(self) -> Dict[str, Any]:
         """Load metrics from previous sessions"""
         metrics_file = self.metrics_dir / "historical_metrics.json"
@@ -62,6 +83,7 @@ class TemporalMarkerMonitor:
                          extraction_time: float, marker_size_kb: Optional[float] = None,
                          error: Optional[str] = None):
         """Record temporal marker extraction event"""
+        self._version += 1
         self.session_metrics['extraction_count'] += 1
         
         if success:
@@ -89,6 +111,7 @@ class TemporalMarkerMonitor:
                             prompt_size_kb: float, success: bool,
                             error: Optional[str] = None):
         """Record Claude API request with temporal marker status"""
+        self._version += 1
         if has_temporal_markers:
             self.session_metrics['claude_requests_with_markers'] += 1
         else:
@@ -97,6 +120,7 @@ class TemporalMarkerMonitor:
         self.session_metrics['rollout_decisions'][rollout_decision] += 1
         
         if not success and error:
+            self.session_metrics['api_error_count'] += 1
             self.session_metrics['api_errors'].append({
                 'video_id': video_id,
                 'prompt_name': prompt_name,
@@ -122,6 +146,7 @@ class TemporalMarkerMonitor:
                              with_markers: bool, quality_score: float,
                              specific_patterns_found: List[str]):
         """Record insight quality metrics for A/B testing"""
+        self._version += 1
         event = {
             'timestamp': datetime.now().isoformat(),
             'video_id': video_id,
@@ -138,9 +163,14 @@ class TemporalMarkerMonitor:
         if key not in self.historical_metrics['insights_quality_scores']:
             self.historical_metrics['insights_quality_scores'][key] = []
         self.historical_metrics['insights_quality_scores'][key].append(quality_score)
+        self.quality_sample_count += 1
     
     def get_current_metrics(self) -> Dict[str, Any]:
         """Get current session metrics with calculations"""
+        # Shallow copy so callers can add keys without touching the cache
+        return dict(self._cached('current_metrics', self._compute_current_metrics))
+    
+    def _compute_current_metrics(self) -> Dict[str, Any]:
         metrics = self.session_metrics.copy()
         
         # Calculate averages
@@ -167,8 +197,9 @@ class TemporalMarkerMonitor:
             
         total_claude_requests = (metrics['claude_requests_with_markers'] + 
                                metrics['claude_requests_without_markers'])
+        metrics['total_claude_requests'] = total_claude_requests
         if total_claude_requests > 0:
-            metrics['api_error_rate'] = len(metrics['api_errors']) / total_claude_requests
+            metrics['api_error_rate'] = metrics['api_error_count'] / total_claude_requests
             metrics['temporal_marker_adoption'] = (
                 metrics['claude_requests_with_markers'] / total_claude_requests
             )
@@ -180,6 +211,9 @@ class TemporalMarkerMonitor:
     
     def get_quality_comparison(self) -> Dict[str, Any]:
         """Compare insight quality with and without temporal markers"""
+        return self._cached('quality_comparison', self._compute_quality_comparison)
+    
+    def _compute_quality_comparison(self) -> Dict[str, Any]:
         comparison = {}
         
         # Get all keys and extract prompt names
@@ -220,6 +254,7 @@ class TemporalMarkerMonitor:
         # Get final metrics
         final_metrics = self.get_current_metrics()
         final_metrics['end_time'] = datetime.now().isoformat()
+        final_metrics['api_errors'] = list(final_metrics['api_errors'])  # deque isn't JSON serializable
         
         # Update historical metrics
         self.historical_metrics['total_extractions'] += final_metrics['extraction_count']
@@ -308,6 +343,9 @@ class TemporalMarkerMonitor:
     
     def check_rollout_health(self) -> Dict[str, Any]:
         """Check if rollout is healthy and can proceed"""
+        return self._cached('rollout_health', self._compute_rollout_health)
+    
+    def _compute_rollout_health(self) -> Dict[str, Any]:
         current = self.get_current_metrics()
         
         health_checks = {
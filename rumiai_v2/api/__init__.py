@@ -1,13 +1,30 @@
 """
 API clients for RumiAI v2.
+
+Clients are imported on first access so that, for example, using
+ClaudeClient does not pull in aiohttp for the Apify client.
 """
-from .claude_client import ClaudeClient, APIMetrics
-from .apify_client import ApifyClient
-from .ml_services import MLServices
+import importlib
+
+_LAZY_IMPORTS = {
+    'ClaudeClient': '.claude_client',
+    'APIMetrics': '.claude_client',
+    'ApifyClient': '.apify_client',
+    'MLServices': '.ml_services'
+}
 
 __all__ = [
     'ClaudeClient',
     'APIMetrics',
     'ApifyClient',
     'MLServices'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
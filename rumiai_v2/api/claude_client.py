@@ -8,8 +8,10 @@ import requests
 import time
 import json
 import logging
+import random
+from email.utils import parsedate_to_datetime
 from typing import Dict, Any, Optional, List
-from datetime import datetime
+from datetime import datetime, timezone
 from collections import defaultdict
 
 from ..core.exceptions import APIError
@@ -79,6 +81,7 @@ class ClaudeClient:
         self.api_url = "https://api.anthropic.com/v1/messages"
         self.max_retries = 3
         self.base_delay = 5  # seconds
+        self.max_delay = 60  # seconds, cap for backoff and Retry-After
         self.metrics = APIMetrics()
         
         # Set default pricing based on initial model
@@ -238,8 +241,8 @@ class ClaudeClient:
                     })
                     
                     if attempt < self.max_retries - 1:
-                        delay = self.base_delay * (2 ** attempt)
-                        logger.warning(f"Rate limited, retrying in {delay}s...")
+                        delay = self._retry_delay(attempt, response.headers.get('retry-after'))
+                        logger.warning(f"Rate limited, retrying in {delay:.1f}s...")
                         time.sleep(delay)
                         continue
                     else:
@@ -271,9 +274,9 @@ class ClaudeClient:
                 })
                 
                 if attempt < self.max_retries - 1:
-                    delay = self.base_delay * (2 ** attempt)
+                    delay = self._retry_delay(attempt)
                     logger.warning(f"🔌 Connection error: {error_msg}")
-                    logger.warning(f"⏳ Retrying in {delay}s (attempt {attempt + 1}/{self.max_retries})...")
+                    logger.warning(f"⏳ Retrying in {delay:.1f}s (attempt {attempt + 1}/{self.max_retries})...")
                     time.sleep(delay)
                     continue
                 else:
@@ -330,6 +333,30 @@ class ClaudeClient:
             retry_attempts=self.max_retries
         )
     
+    def _retry_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Seconds to wait before retrying a failed attempt.
+        
+        A Retry-After header (seconds or HTTP date) from the API wins.
+        Otherwise the delay grows exponentially from base_delay with random
+        jitter, so concurrent prompts that were throttled together do not
+        all retry at the same moment. Both are capped at max_delay.
+        """
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                try:
+                    retry_at = parsedate_to_datetime(retry_after)
+                    delay = (retry_at - datetime.now(timezone.utc)).total_seconds()
+                except (TypeError, ValueError):
+                    delay = None
+            if delay is not None:
+                return min(max(delay, 0.0), self.max_delay)
+        
+        backoff = min(self.base_delay * (2 ** attempt), self.max_delay)
+        return random.uniform(backoff / 2, backoff)
+    
     def _build_prompt_content(self, prompt: str, context_data: Dict[str, Any]) -> str:
         """Build complete prompt with context."""
         # Remove internal fields from context
@@ -3,6 +3,7 @@ Configuration settings for RumiAI v2.
 """
 import os
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, Any, Optional
 import json
 import logging
@@ -10,6 +11,18 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+# Prompt timeouts (seconds), shared read-only by every Settings instance
+PROMPT_TIMEOUTS = MappingProxyType({
+    'creative_density': 60,
+    'emotional_journey': 90,
+    'speech_analysis': 90,
+    'visual_overlay_analysis': 120,  # Larger timeout for problematic prompt
+    'metadata_analysis': 60,
+    'person_framing': 60,
+    'scene_pacing': 60
+})
+
+
 class Settings:
     """
     Central configuration for RumiAI v2.
@@ -36,27 +49,23 @@ class Settings:
         self.unified_dir = Path(os.getenv('RUMIAI_UNIFIED_DIR', 'unified_analysis'))
         self.insights_dir = Path(os.getenv('RUMIAI_INSIGHTS_DIR', 'insights'))
         self.temporal_dir = Path(os.getenv('RUMIAI_TEMPORAL_DIR', 'temporal_markers'))
+        self.cache_dir = Path(os.getenv('RUMIAI_CACHE_DIR', 'cache'))
         
         # Processing settings
         self.max_video_duration = int(os.getenv('RUMIAI_MAX_VIDEO_DURATION', '300'))  # 5 minutes
         self.frame_sample_rate = float(os.getenv('RUMIAI_FRAME_SAMPLE_RATE', '1.0'))  # 1 fps
         self.prompt_delay = int(os.getenv('RUMIAI_PROMPT_DELAY', '10'))  # seconds between prompts
+        self.max_concurrent_prompts = max(1, int(os.getenv('RUMIAI_MAX_CONCURRENT_PROMPTS', '4')))  # Claude calls in flight
         
         # Prompt timeouts (seconds)
-        self.prompt_timeouts = {
-            'creative_density': 60,
-            'emotional_journey': 90,
-            'speech_analysis': 90,
-            'visual_overlay_analysis': 120,  # Larger timeout for problematic prompt
-            'metadata_analysis': 60,
-            'person_framing': 60,
-            'scene_pacing': 60
-        }
+        self.prompt_timeouts = PROMPT_TIMEOUTS
         
         # Feature flags
         self.temporal_markers_enabled = os.getenv('RUMIAI_TEMPORAL_MARKERS', 'true').lower() == 'true'
         self.strict_mode = os.getenv('RUMIAI_STRICT_MODE', 'false').lower() == 'true'
         self.cleanup_video = os.getenv('RUMIAI_CLEANUP_VIDEO', 'false').lower() == 'true'
+        self.prompt_cache_enabled = os.getenv('RUMIAI_PROMPT_CACHE', 'true').lower() == 'true'  # Reuse results for unchanged prompts
+        self.prompt_cache_ttl = float(os.getenv('RUMIAI_PROMPT_CACHE_TTL', '0')) or None  # seconds; 0 = until the prompt changes
         
         # ML Enhancement Feature Flags
         self.use_ml_precompute = os.getenv('USE_ML_PRECOMPUTE', 'false').lower() == 'true'
@@ -192,7 +201,8 @@ Provide insights on the video's editing rhythm and viewer attention management."
             ('temp_dir', self.temp_dir),
             ('unified_dir', self.unified_dir),
             ('insights_dir', self.insights_dir),
-            ('temporal_dir', self.temporal_dir)
+            ('temporal_dir', self.temporal_dir),
+            ('cache_dir', self.cache_dir)
         ]:
             try:
                 path.mkdir(parents=True, exist_ok=True)
@@ -215,9 +225,12 @@ Provide insights on the video's editing rhythm and viewer attention management."
             'max_video_duration': self.max_video_duration,
             'frame_sample_rate': self.frame_sample_rate,
             'prompt_delay': self.prompt_delay,
+            'max_concurrent_prompts': self.max_concurrent_prompts,
             'temporal_markers_enabled': self.temporal_markers_enabled,
             'strict_mode': self.strict_mode,
             'cleanup_video': self.cleanup_video,
+            'prompt_cache_enabled': self.prompt_cache_enabled,
+            'prompt_cache_ttl': self.prompt_cache_ttl,
             'use_ml_precompute': self.use_ml_precompute,
             'use_claude_sonnet': self.use_claude_sonnet,
             'output_format_version': self.output_format_version,
@@ -72,6 +72,21 @@ class PromptResult:
             'timestamp': self.timestamp.isoformat()
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'PromptResult':
+        """Rebuild a result from to_dict() output."""
+        return cls(
+            prompt_type=PromptType(data['prompt_type']),
+            success=data['success'],
+            response=data.get('response', ''),
+            error=data.get('error'),
+            processing_time=data.get('processing_time', 0.0),
+            tokens_used=data.get('tokens_used', 0),
+            estimated_cost=data.get('estimated_cost', 0.0),
+            retry_attempts=data.get('retry_attempts', 0),
+            timestamp=datetime.fromisoformat(data['timestamp'])
+        )
+
 
 @dataclass
 class PromptBatch:
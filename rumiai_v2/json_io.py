@@ -0,0 +1,38 @@
+"""
+JSON byte serialization for RumiAI.
+
+Depends only on the standard library (and orjson when installed), so the
+legacy scripts can share these helpers without pulling in rumiai_v2.utils.
+"""
+import json
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:  # stdlib json fallback
+    orjson = None
+
+
+def dumps_json(data: Any, indent: Optional[int] = 2) -> bytes:
+    """
+    Serialize data to UTF-8 JSON bytes.
+    
+    Uses orjson when installed (it only supports 2-space indentation) and
+    falls back to the stdlib for anything orjson cannot encode.
+    """
+    if orjson is not None and indent in (None, 2):
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(data, option=option)
+        except TypeError:
+            pass
+    return json.dumps(data, indent=indent).encode('utf-8')
+
+
+def loads_json(raw: bytes) -> Any:
+    """Parse JSON bytes, preferring orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
@@ -16,6 +16,28 @@ logger = logging.getLogger(__name__)
 class MLDataExtractor:
     """Extract relevant ML data for each prompt type."""
     
+    def __init__(self):
+        # Contexts extracted from _context_analysis, the video being processed
+        self._context_analysis: Optional[UnifiedAnalysis] = None
+        self._context_cache: Dict[PromptType, PromptContext] = {}
+        
+    def extract_for_prompt_cached(self, analysis: UnifiedAnalysis, prompt_type: PromptType) -> PromptContext:
+        """
+        Memoized extract_for_prompt for retries and re-runs within one video.
+        
+        Only the current analysis object's contexts are kept; a different
+        video, or the same video reloaded from disk, clears the cache.
+        """
+        if analysis is not self._context_analysis:
+            self._context_cache.clear()
+            self._context_analysis = analysis
+        
+        context = self._context_cache.get(prompt_type)
+        if context is None:
+            context = self.extract_for_prompt(analysis, prompt_type)
+            self._context_cache[prompt_type] = context
+        return context
+    
     def extract_for_prompt(self, analysis: UnifiedAnalysis, prompt_type: PromptType) -> PromptContext:
         """
         Extract ML data specific to prompt type.
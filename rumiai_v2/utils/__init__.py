@@ -4,10 +4,12 @@ Utility modules for RumiAI v2.
 from .file_handler import FileHandler
 from .logger import Logger
 from .metrics import Metrics, VideoProcessingMetrics
+from .prompt_cache import PromptResultCache
 
 __all__ = [
     'FileHandler',
     'Logger',
     'Metrics',
-    'VideoProcessingMetrics'
+    'VideoProcessingMetrics',
+    'PromptResultCache'
 ]
\ No newline at end of file
@@ -11,6 +11,7 @@ from typing import Dict, Any, Optional
 import logging
 
 from ..core.exceptions import FileSystemError
+from ..json_io import dumps_json, loads_json
 
 logger = logging.getLogger(__name__)
 
@@ -37,23 +38,25 @@ class FileHandler:
             # Ensure parent directory exists
             file_path.parent.mkdir(parents=True, exist_ok=True)
             
+            payload = dumps_json(data, indent)
+            
             if atomic:
                 # Write to temporary file first
                 with tempfile.NamedTemporaryFile(
-                    mode='w',
+                    mode='wb',
                     dir=file_path.parent,
                     delete=False,
                     suffix='.tmp'
                 ) as tmp:
-                    json.dump(data, tmp, indent=indent)
+                    tmp.write(payload)
                     tmp_path = tmp.name
                 
                 # Atomic move
                 shutil.move(tmp_path, file_path)
             else:
                 # Direct write (faster but not atomic)
-                with open(file_path, 'w') as f:
-                    json.dump(data, f, indent=indent)
+                with open(file_path, 'wb') as f:
+                    f.write(payload)
             
             logger.info(f"Saved JSON to {file_path}")
             
@@ -63,8 +66,8 @@ class FileHandler:
     def load_json(self, file_path: Path) -> Dict[str, Any]:
         """Load data from JSON file."""
         try:
-            with open(file_path, 'r') as f:
-                return json.load(f)
+            with open(file_path, 'rb') as f:
+                return loads_json(f.read())
         except FileNotFoundError:
             raise FileSystemError('load', str(file_path), 'File not found')
         except json.JSONDecodeError as e:
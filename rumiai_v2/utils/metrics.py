@@ -12,7 +12,7 @@ class Metrics:
     """Track performance metrics for the system."""
     
     def __init__(self):
-        self.timers = {}
+        self.timers = {}  # name -> perf_counter_ns() at start
         self.counters = defaultdict(int)
         self.gauges = {}
         self.start_time = time.time()
@@ -20,22 +20,21 @@ class Metrics:
     
     def start_timer(self, name: str) -> None:
         """Start a timer."""
-        self.timers[name] = time.time()
+        self.timers[name] = time.perf_counter_ns()
     
     def stop_timer(self, name: str) -> float:
         """Stop a timer and return elapsed time."""
         if name not in self.timers:
             return 0.0
         
-        elapsed = time.time() - self.timers[name]
-        del self.timers[name]
-        return elapsed
+        elapsed_ns = time.perf_counter_ns() - self.timers.pop(name)
+        return elapsed_ns / 1e9
     
     def get_time(self, name: str) -> float:
         """Get elapsed time without stopping timer."""
         if name not in self.timers:
             return 0.0
-        return time.time() - self.timers[name]
+        return (time.perf_counter_ns() - self.timers[name]) / 1e9
     
     def increment(self, name: str, value: int = 1) -> None:
         """Increment a counter."""
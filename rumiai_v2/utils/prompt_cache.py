@@ -0,0 +1,69 @@
+"""
+On-disk cache of Claude prompt results for RumiAI v2.
+
+Re-running a video whose analysis has not changed produces the same prompt
+text, so the previous response can be reused instead of paying for another
+Claude round-trip.
+"""
+import hashlib
+import time
+from pathlib import Path
+from typing import Optional
+import logging
+
+from .file_handler import FileHandler
+from ..core.models.prompt import PromptResult
+
+logger = logging.getLogger(__name__)
+
+# Part of every cache key; bump it to invalidate all entries when something
+# outside the prompt text (response parsing, result format) changes
+PROMPT_CACHE_VERSION = '1'
+
+
+class PromptResultCache:
+    """
+    Successful prompt results keyed by (prompt_type, model, prompt text hash).
+
+    Entries are plain JSON files under <cache_dir>/prompt_results/<prompt_type>/,
+    written atomically by FileHandler, so concurrent prompts and processes
+    can share one cache directory. With a ttl (seconds), entries older than
+    that are treated as misses; the file's mtime is its write time.
+    """
+
+    def __init__(self, cache_dir: Path, ttl: Optional[float] = None,
+                 version: str = PROMPT_CACHE_VERSION):
+        self.handler = FileHandler(Path(cache_dir) / 'prompt_results')
+        self.ttl = ttl
+        self.version = version
+
+    def _path(self, prompt_type: str, model: str, prompt_text: str) -> Path:
+        digest = hashlib.blake2b(
+            f"{self.version}\0{model}\0{prompt_text}".encode('utf-8'), digest_size=16
+        ).hexdigest()
+        return self.handler.get_path(prompt_type, f"{digest}.json")
+
+    def get(self, prompt_type: str, model: str, prompt_text: str) -> Optional[PromptResult]:
+        """Return the cached result for this prompt, or None on a miss."""
+        path = self._path(prompt_type, model, prompt_text)
+        try:
+            written = path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+        if self.ttl is not None and time.time() - written > self.ttl:
+            return None
+        try:
+            return PromptResult.from_dict(self.handler.load_json(path))
+        except Exception as e:
+            # A bad entry only costs a fresh API call
+            logger.warning(f"Ignoring unreadable prompt cache entry {path}: {e}")
+            return None
+
+    def set(self, prompt_type: str, model: str, prompt_text: str, result: PromptResult) -> None:
+        """Store a successful result; failures are never cached."""
+        if not result.success:
+            return
+        try:
+            self.handler.save_json(self._path(prompt_type, model, prompt_text), result.to_dict())
+        except Exception as e:
+            logger.warning(f"Could not write prompt cache entry: {e}")
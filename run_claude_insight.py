@@ -5,61 +5,298 @@ Run a single Claude prompt for one insight and save to the correct folder
 
 import os
 import json
-import requests
+import gzip
+import hashlib
+import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
+from types import MappingProxyType
 
-# Try to load dotenv if available
+# fcntl (POSIX) provides the cross-process lock for metadata.json updates
 try:
-    from dotenv import load_dotenv
-    load_dotenv()
+    import fcntl
 except ImportError:
-    pass
+    fcntl = None
 
-# Try to import temporal marker integration
+# orjson is optional; artifacts fall back to the stdlib encoder without it
 try:
-    from python.claude_temporal_integration import ClaudeTemporalIntegration
-    from python.temporal_marker_integration import extract_temporal_markers
-    TEMPORAL_MARKERS_AVAILABLE = True
+    import orjson
 except ImportError:
-    TEMPORAL_MARKERS_AVAILABLE = False
+    orjson = None
+
+# Heavy dependencies (requests, dotenv, the temporal marker stack) are imported
+# on first use so importing this module as a library stays cheap.
+_dotenv_loaded = False
+_record_claude_request = None
+
+
+def _load_dotenv_once():
+    """Load .env the first time a runner is created (if python-dotenv is installed)"""
+    global _dotenv_loaded
+    if _dotenv_loaded:
+        return
+    _dotenv_loaded = True
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass
+
+
+def _env_int(name, default):
+    """Integer setting from the environment, with an error naming the variable"""
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer, got {raw!r}") from None
+
+
+def _get_monitoring_recorder():
+    """Return python.temporal_monitoring.record_claude_request, or False if unavailable"""
+    global _record_claude_request
+    if _record_claude_request is None:
+        try:
+            from python.temporal_monitoring import record_claude_request
+            _record_claude_request = record_claude_request
+        except ImportError:
+            _record_claude_request = False
+    return _record_claude_request
+
+# Per-prompt timeout configuration (in seconds)
+_PROMPT_TIMEOUTS = MappingProxyType({
+    'creative_density': 60,
+    'emotional_journey': 90,
+    'speech_analysis': 90,
+    'visual_overlay_analysis': 90,
+    'metadata_analysis': 60,
+    'person_framing': 90,
+    'scene_pacing': 60,
+    'default': 120
+})
+
+# Prompts that make up a complete analysis (every timeout entry except 'default');
+# their count is the denominator of completionRate in metadata.json
+PROMPT_NAMES = tuple(name for name in _PROMPT_TIMEOUTS if name != 'default')
+DEFAULT_TOTAL_PROMPTS = len(PROMPT_NAMES)
+
+# Retry policy for Claude API calls. The jitter, gzip and pool settings below
+# apply to the requests fallback session only; the anthropic SDK used for
+# streamed calls has its own jittered retries and a larger connection pool.
+API_MAX_RETRIES = 3
+API_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Upper bound (seconds) of the random jitter added to every retry wait, so
+# concurrent batch prompts that hit a rate limit don't retry in lockstep
+API_RETRY_JITTER = 1.0
+
+# Request bodies larger than this are sent gzip-compressed. Opt-in with
+# RUMIAI_GZIP_REQUESTS=true (read per runner, after .env), since not every
+# endpoint or proxy accepts it
+GZIP_MIN_BYTES = 64 * 1024
+
+# Default number of prompts run_batch_prompts keeps in flight at once;
+# RUMIAI_BATCH_MAX_CONCURRENCY overrides it per runner
+DEFAULT_BATCH_MAX_CONCURRENCY = 5
+
+# Keep-alive connections held per host; never fewer than the batch concurrency so
+# parallel prompts don't overflow the pool and pay a fresh TCP+TLS handshake
+API_POOL_MIN_SIZE = 10
+
+
+def _build_api_session(pool_maxsize=API_POOL_MIN_SIZE):
+    """Create a pooled session that retries transient API failures with backoff"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util import Retry
+
+    class JitteredRetry(Retry):
+        """Retry that adds random jitter to both backoff and Retry-After waits"""
+
+        def get_backoff_time(self):
+            backoff = super().get_backoff_time()
+            return backoff + random.uniform(0, API_RETRY_JITTER) if backoff else backoff
+
+        def get_retry_after(self, response):
+            retry_after = super().get_retry_after(response)
+            if retry_after is None:
+                return None
+            return retry_after + random.uniform(0, API_RETRY_JITTER)
+
+    retry = JitteredRetry(
+        total=API_MAX_RETRIES,
+        backoff_factor=0.5,
+        status_forcelist=API_RETRY_STATUSES,
+        allowed_methods=frozenset({'POST'}),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=10, pool_maxsize=pool_maxsize)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    return session
+
+
+# One pooled session per process so every runner (including the short-lived ones
+# created by run_claude_prompt) reuses the same keep-alive TLS connection
+_api_session = None
+_api_session_lock = threading.Lock()
+
+
+def _get_api_session(pool_maxsize=API_POOL_MIN_SIZE):
+    """Return the shared API session, creating it on first use with pool_maxsize"""
+    global _api_session
+    if _api_session is None:
+        with _api_session_lock:
+            if _api_session is None:
+                _api_session = _build_api_session(max(API_POOL_MIN_SIZE, pool_maxsize))
+    return _api_session
+
+
+# Responses are cached under <base_dir>/.cache keyed by a hash of (model, full prompt)
+RESPONSE_CACHE_DIR = '.cache'
+RESPONSE_CACHE_TTL = 7 * 24 * 3600  # seconds
+
+# Contexts larger than this (compact JSON bytes) have their timelines downsampled
+# before the prompt is built; RUMIAI_CONTEXT_TARGET_BYTES overrides it per runner
+# and 0 disables shrinking
+DEFAULT_CONTEXT_TARGET_BYTES = 150000
+SHRINK_MIN_TIMELINE_ENTRIES = 20
+
+# Context data referenced by <prompt>_complete_*.json lives in insights/<video_id>/_contexts
+CONTEXTS_DIR = '_contexts'
+
+# Prompt and JSON artifacts are written through a 1MB buffer
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Output directories already created by the module-level run_claude_prompt helper
+_known_dirs = set()
+_known_dirs_lock = threading.Lock()
+
+
+def read_json(path):
+    """Load a JSON file (orjson when installed)"""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _dumps_compact(obj, sort_keys=False):
+    """Compact JSON as UTF-8 bytes (orjson when installed)"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        try:
+            return orjson.dumps(obj, option=option, default=str)
+        except TypeError:
+            pass
+    return json.dumps(obj, sort_keys=sort_keys, separators=(',', ':'), default=str).encode('utf-8')
+
+
+def write_json(path, obj, indent=True):
+    """Write obj as JSON in one buffered write (orjson when installed)"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            data = orjson.dumps(obj, option=option)
+        except TypeError:
+            # Types orjson refuses (e.g. mixed-type keys): let the stdlib encoder decide
+            data = None
+        if data is not None:
+            with open(path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+                f.write(data)
+            return
+    with open(path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+        json.dump(obj, f, indent=2 if indent else None)
+
+
+def _tmp_path(path):
+    """Per-process, per-thread temp name next to path (for write + os.replace)"""
+    return f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+
+
+def _replace_json(path, obj, indent=True):
+    """Atomically replace path with obj as JSON; readers never see a partial file"""
+    tmp_file = _tmp_path(path)
+    try:
+        write_json(tmp_file, obj, indent=indent)
+        os.replace(tmp_file, path)
+    finally:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+
+@contextmanager
+def _file_lock(lock_path):
+    """Exclusive advisory lock on lock_path across processes (no-op without fcntl)"""
+    if fcntl is None:
+        yield
+        return
+    with open(lock_path, 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _ensure_dir(output_dir, known_dirs):
+    """Create output_dir once; later calls for the same path skip the stat/mkdir"""
+    if output_dir not in known_dirs:
+        os.makedirs(output_dir, exist_ok=True)
+        known_dirs.add(output_dir)
 
-# Try to import monitoring
-try:
-    from python.temporal_monitoring import record_claude_request
-    MONITORING_AVAILABLE = True
-except ImportError:
-    MONITORING_AVAILABLE = False
 
 class ClaudeInsightRunner:
-    def __init__(self):
+    def __init__(self, use_cache=None, total_prompts=DEFAULT_TOTAL_PROMPTS):
+        _load_dotenv_once()
         self.api_key = os.getenv('ANTHROPIC_API_KEY')
         self.api_url = 'https://api.anthropic.com/v1/messages'
         self.model = 'claude-3-5-sonnet-20241022'
         self.base_dir = 'insights'
+        self._known_dirs = set()
 
-        # Per-prompt timeout configuration (in seconds)
-        self.prompt_timeouts = {
-            'creative_density': 60,
-            'emotional_journey': 90,
-            'speech_analysis': 90,
-            'visual_overlay_analysis': 90,
-            'metadata_analysis': 60,
-            'person_framing': 90,
-            'scene_pacing': 60,
-            'default': 120
-        }
+        # Tuning settings are read here rather than at import so .env values apply
+        self.gzip_requests = os.getenv('RUMIAI_GZIP_REQUESTS', 'false').lower() == 'true'
+        self.batch_max_concurrency = _env_int('RUMIAI_BATCH_MAX_CONCURRENCY',
+                                              DEFAULT_BATCH_MAX_CONCURRENCY)
+        self.context_target_bytes = _env_int('RUMIAI_CONTEXT_TARGET_BYTES',
+                                             DEFAULT_CONTEXT_TARGET_BYTES)
+
+        self._session = _get_api_session(self.batch_max_concurrency)
+        self._anthropic_client = None
+
+        # Response cache (disable with use_cache=False or RUMIAI_NO_CLAUDE_CACHE=true)
+        if use_cache is None:
+            use_cache = os.getenv('RUMIAI_NO_CLAUDE_CACHE', 'false').lower() != 'true'
+        self.use_cache = use_cache
+        self._metadata_lock = threading.Lock()
+
+        # Per-prompt timeout configuration (in seconds), shared read-only mapping
+        self.prompt_timeouts = _PROMPT_TIMEOUTS
+        self.total_prompts = total_prompts
         
         # Initialize temporal marker integration
         self.temporal_integration = None
+        # Videos whose temporal marker extraction already failed this run
+        self._tm_failed = set()
         self._init_temporal_integration()
     
     def _init_temporal_integration(self):
         """Initialize temporal marker integration with config"""
-        if not TEMPORAL_MARKERS_AVAILABLE:
+        try:
+            from python.claude_temporal_integration import ClaudeTemporalIntegration
+            from python.temporal_marker_integration import extract_temporal_markers
+        except ImportError:
             print("⚠️  Temporal markers not available - running without temporal integration")
             return
+        self._extract_temporal_markers = extract_temporal_markers
         
         # Load config from environment or use defaults
         config_path = os.getenv('TEMPORAL_MARKERS_CONFIG', 'config/temporal_markers.json')
@@ -89,33 +326,48 @@ class ClaudeInsightRunner:
             dict - Result with filepath and response
         """
         
-        # Create output directory
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        # Create output directory (one clock read keeps filenames and JSON timestamps in sync)
+        now = datetime.now()
+        timestamp = now.strftime('%Y%m%d_%H%M%S')
+        iso_timestamp = now.isoformat()
         output_dir = os.path.join(self.base_dir, video_id, prompt_name)
-        os.makedirs(output_dir, exist_ok=True)
+        _ensure_dir(output_dir, self._known_dirs)
         
         # Build full prompt with context
-        full_prompt = self._build_full_prompt(prompt_text, context_data, video_id)
+        full_prompt, prompt_info = self._build_full_prompt(prompt_text, context_data, video_id)
         
         # Save prompt
         prompt_file = os.path.join(output_dir, f'{prompt_name}_prompt_{timestamp}.txt')
-        with open(prompt_file, 'w', encoding='utf-8') as f:
-            f.write(full_prompt)
+        # Encode once; the bytes feed the prompt file, the size field and the cache key
+        full_prompt_bytes = full_prompt.encode('utf-8')
+        with open(prompt_file, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            f.write(full_prompt_bytes)
         print(f"📝 Saved prompt to: {prompt_file}")
         
         # Calculate dynamic timeout based on data size
-        timeout = self._calculate_dynamic_timeout(prompt_name, context_data)
-        claude_response = self._call_claude_api(full_prompt, timeout=timeout)
+        timeout = self._calculate_dynamic_timeout(prompt_name, context_data, payload_size=len(full_prompt))
+        response_file = os.path.join(output_dir, f'{prompt_name}_result_{timestamp}.txt')
+        cache_key = self._cache_key(full_prompt_bytes)
+        claude_response = self._load_cached_response(cache_key)
+        cache_hit = bool(claude_response)
+        if cache_hit:
+            print(f"♻️  Using cached response for {prompt_name} ({cache_key})")
+        else:
+            claude_response = self._call_claude_api(full_prompt, timeout=timeout, stream_to=response_file)
+            if claude_response['success']:
+                self._store_cached_response(cache_key, claude_response['response'])
         
-        # Record monitoring data if available
-        if MONITORING_AVAILABLE and hasattr(self, '_last_prompt_info'):
+        # Record monitoring data if available; cache hits made no API request
+        # and would skew the request counts and error rate
+        record_claude_request = _get_monitoring_recorder()
+        if record_claude_request and prompt_info and not cache_hit:
             try:
                 record_claude_request(
                     video_id=video_id,
                     prompt_name=prompt_name,
-                    has_temporal_markers=self._last_prompt_info['has_temporal_markers'],
-                    rollout_decision=self._last_prompt_info['rollout_decision'],
-                    prompt_size_kb=self._last_prompt_info['prompt_size_kb'],
+                    has_temporal_markers=prompt_info['has_temporal_markers'],
+                    rollout_decision=prompt_info['rollout_decision'],
+                    prompt_size_kb=prompt_info['prompt_size_kb'],
                     success=claude_response['success'],
                     error=claude_response.get('error') if not claude_response['success'] else None
                 )
@@ -124,25 +376,32 @@ class ClaudeInsightRunner:
         
         # Save response
         if claude_response['success']:
-            response_file = os.path.join(output_dir, f'{prompt_name}_result_{timestamp}.txt')
-            with open(response_file, 'w', encoding='utf-8') as f:
-                f.write(claude_response['response'])
+            # Streamed responses are already on disk
+            if not claude_response.get('streamed'):
+                with open(response_file, 'w', encoding='utf-8') as f:
+                    f.write(claude_response['response'])
             print(f"✅ Saved {prompt_name} result to: {response_file}")
             
             # Save complete JSON result
+            # The full prompt is already on disk in prompt_file, so only reference it here
             json_file = os.path.join(output_dir, f'{prompt_name}_complete_{timestamp}.json')
             result_data = {
                 'video_id': video_id,
                 'prompt_name': prompt_name,
-                'timestamp': datetime.now().isoformat(),
-                'prompt': full_prompt,
+                'timestamp': iso_timestamp,
+                'prompt_file': os.path.basename(prompt_file),
+                'prompt_size_bytes': len(full_prompt_bytes),
+                'prompt_text': prompt_text,
                 'response': claude_response['response'],
                 'model': self.model,
-                'context_data': context_data
+                'context_data_ref': self._store_context(video_id, context_data)
             }
-            
-            with open(json_file, 'w', encoding='utf-8') as f:
-                json.dump(result_data, f, indent=2)
+
+            # Opt-in: keep an inline copy of the prompt for tools that expect it
+            if os.getenv('RUMIAI_KEEP_FULL_PROMPT_IN_JSON'):
+                result_data['prompt'] = full_prompt
+
+            write_json(json_file, result_data)
             print(f"💾 Saved complete data to: {json_file}")
             
             # Update metadata
@@ -157,12 +416,11 @@ class ClaudeInsightRunner:
         else:
             # Save error
             error_file = os.path.join(output_dir, f'{prompt_name}_error_{timestamp}.json')
-            with open(error_file, 'w', encoding='utf-8') as f:
-                json.dump({
-                    'error': claude_response['error'],
-                    'timestamp': datetime.now().isoformat(),
-                    'prompt': full_prompt
-                }, f, indent=2)
+            write_json(error_file, {
+                'error': claude_response['error'],
+                'timestamp': iso_timestamp,
+                'prompt': full_prompt
+            })
             
             print(f"❌ Error saved to: {error_file}")
             return {
@@ -172,18 +430,26 @@ class ClaudeInsightRunner:
             }
     
     def _build_full_prompt(self, prompt_text, context_data, video_id=None):
-        """Build the full prompt with context and temporal markers"""
+        """
+        Build the full prompt with context and temporal markers
+        
+        Returns:
+            tuple - (full_prompt, monitoring info dict or None when there is no context)
+        """
         if not context_data:
-            return prompt_text
+            return prompt_text, None
+        
+        context_data = self._shrink_context(context_data, self.context_target_bytes)
         
         has_temporal_markers = False
         rollout_decision = 'no_integration'
+        context_str = None
         
-        # Check if we should add temporal markers
-        if self.temporal_integration and video_id and TEMPORAL_MARKERS_AVAILABLE:
+        # Check if we should add temporal markers (only one extraction attempt per video)
+        if self.temporal_integration and video_id and video_id not in self._tm_failed:
             try:
                 # Extract temporal markers for this video
-                temporal_markers = extract_temporal_markers(video_id)
+                temporal_markers = self._extract_temporal_markers(video_id)
                 
                 if temporal_markers:
                     # Check if this video should get temporal markers
@@ -209,40 +475,145 @@ class ClaudeInsightRunner:
                         print(f"📊 Including temporal markers ({size_info['size_kb']:.1f}KB total)")
                     else:
                         # Rollout decision: not included
-                        context_str = "CONTEXT DATA:\n"
-                        context_str += json.dumps(context_data, indent=2)
                         rollout_decision = 'rollout_excluded'
                 else:
                     # No temporal markers found, use regular context
-                    context_str = "CONTEXT DATA:\n"
-                    context_str += json.dumps(context_data, indent=2)
                     rollout_decision = 'no_markers_found'
                     
             except Exception as e:
                 print(f"⚠️  Failed to add temporal markers: {e}")
+                self._tm_failed.add(video_id)
                 # Fall back to regular context
-                context_str = "CONTEXT DATA:\n"
-                context_str += json.dumps(context_data, indent=2)
+                context_str = None
                 rollout_decision = 'extraction_error'
-        else:
-            # Regular context formatting
-            context_str = "CONTEXT DATA:\n"
-            context_str += json.dumps(context_data, indent=2)
+        elif video_id in self._tm_failed:
+            rollout_decision = 'extraction_error'
+        
+        # Every path without temporal markers shares the same regular context formatting
+        if context_str is None:
+            context_str = self._format_context(context_data)
         
         full_prompt = f"{context_str}\n\nANALYSIS REQUEST:\n{prompt_text}"
         
-        # Store monitoring info for later use
-        self._last_prompt_info = {
+        # Monitoring info travels with the prompt so concurrent prompts don't share state
+        prompt_info = {
             'has_temporal_markers': has_temporal_markers,
             'rollout_decision': rollout_decision,
             'prompt_size_kb': len(full_prompt) / 1024
         }
         
-        return full_prompt
+        return full_prompt, prompt_info
+    
+    def _cache_key(self, full_prompt_bytes):
+        """Content hash of everything that determines the response"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self.model.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(full_prompt_bytes)
+        return digest.hexdigest()
+    
+    def _load_cached_response(self, cache_key):
+        """Return a cached successful response younger than RESPONSE_CACHE_TTL, else None"""
+        if not self.use_cache:
+            return None
+        cache_file = os.path.join(self.base_dir, RESPONSE_CACHE_DIR, f'{cache_key}.json')
+        try:
+            if time.time() - os.path.getmtime(cache_file) > RESPONSE_CACHE_TTL:
+                return None
+            response = read_json(cache_file)['response']
+        except (OSError, ValueError, KeyError):
+            return None
+        return {
+            'success': True,
+            'response': response,
+            'cached': True
+        }
+    
+    def _store_cached_response(self, cache_key, response):
+        """Write the response to the cache atomically (temp file + os.replace)"""
+        if not self.use_cache:
+            return
+        cache_dir = os.path.join(self.base_dir, RESPONSE_CACHE_DIR)
+        cache_file = os.path.join(cache_dir, f'{cache_key}.json')
+        try:
+            _ensure_dir(cache_dir, self._known_dirs)
+            _replace_json(cache_file, {'model': self.model, 'response': response}, indent=False)
+        except OSError as e:
+            print(f"Failed to cache response: {e}")
+    
+    def _store_context(self, video_id, context_data):
+        """
+        Save context_data once per video under _contexts/<hash>.json
+        
+        Returns:
+            str - Content hash referenced from the complete JSON (None without context)
+        """
+        if context_data is None:
+            return None
+        encoded = _dumps_compact(context_data, sort_keys=True)
+        ctx_hash = hashlib.blake2b(encoded, digest_size=16).hexdigest()
+        
+        contexts_dir = os.path.join(self.base_dir, video_id, CONTEXTS_DIR)
+        context_file = os.path.join(contexts_dir, f'{ctx_hash}.json')
+        try:
+            if not os.path.exists(context_file):
+                _ensure_dir(contexts_dir, self._known_dirs)
+                tmp_file = _tmp_path(context_file)
+                with open(tmp_file, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+                    f.write(encoded)
+                os.replace(tmp_file, context_file)
+        except OSError as e:
+            print(f"Failed to save context data: {e}")
+        return ctx_hash
     
-    def _calculate_dynamic_timeout(self, prompt_name, context_data):
-        """Calculate timeout based on prompt type and data size"""
-        base_timeout = self.prompt_timeouts.get(prompt_name, self.prompt_timeouts['default'])
+    @staticmethod
+    def _shrink_context(context_data, target_bytes=None):
+        """
+        Downsample timeline entries so the context fits in target_bytes
+        
+        Every dict/list value whose key ends in 'timeline' keeps every Nth entry,
+        with N the ratio of the current size to the target. Short timelines (under
+        SHRINK_MIN_TIMELINE_ENTRIES) are left intact. Returns a shallow copy; the
+        caller's context is never modified.
+        """
+        if target_bytes is None:
+            target_bytes = DEFAULT_CONTEXT_TARGET_BYTES
+        if not target_bytes or not isinstance(context_data, dict):
+            return context_data
+        
+        size = len(_dumps_compact(context_data))
+        if size <= target_bytes:
+            return context_data
+        
+        step = -(-size // target_bytes)  # ceil
+        shrunk = dict(context_data)
+        for key, timeline in context_data.items():
+            if not str(key).lower().endswith('timeline') or not isinstance(timeline, (dict, list)):
+                continue
+            if len(timeline) < max(SHRINK_MIN_TIMELINE_ENTRIES, step + 1):
+                continue
+            if isinstance(timeline, dict):
+                shrunk[key] = {k: v for i, (k, v) in enumerate(timeline.items()) if i % step == 0}
+            elif isinstance(timeline, list):
+                shrunk[key] = timeline[::step]
+        
+        new_size = len(_dumps_compact(shrunk))
+        print(f"✂️  Downsampled timelines 1/{step}: {size:,} -> {new_size:,} bytes ({new_size / size:.0%})")
+        return shrunk
+    
+    @staticmethod
+    def _format_context(context_data):
+        """Regular (non-temporal) context block"""
+        return "CONTEXT DATA:\n" + json.dumps(context_data, indent=2)
+    
+    def _calculate_dynamic_timeout(self, prompt_name, context_data, payload_size=None):
+        """
+        Calculate timeout based on prompt type and data size
+        
+        payload_size is the length of the already-serialized prompt; when given it
+        is used as-is instead of serializing context_data again just to measure it.
+        """
+        base_timeout = self.prompt_timeouts.get(prompt_name) or self.prompt_timeouts['default']
         
         # For person_framing, adjust based on object timeline size
         if prompt_name == 'person_framing' and isinstance(context_data, dict):
@@ -264,7 +635,7 @@ class ClaudeInsightRunner:
         # For other prompts with large data
         if isinstance(context_data, dict):
             # Check overall data size
-            data_size = len(str(context_data))
+            data_size = payload_size if payload_size is not None else len(json.dumps(context_data))
             if data_size > 500000:  # >500KB
                 size_adjustment = min((data_size // 500000) * 15, 60)  # +15s per 500KB, max +60s
                 timeout = base_timeout + size_adjustment
@@ -273,8 +644,18 @@ class ClaudeInsightRunner:
         
         return base_timeout
     
-    def _call_claude_api(self, prompt, timeout=120):
-        """Call Claude API with the prompt"""
+    def _call_claude_api(self, prompt, timeout=120, stream_to=None):
+        """
+        Call Claude API with the prompt
+        
+        If the anthropic SDK is installed and stream_to is given, the response is
+        streamed into that file while it is generated. Otherwise the request goes
+        through the pooled requests session and the caller writes the response;
+        only that path uses the optional gzip body and the jittered HTTPAdapter
+        retries.
+        """
+        import requests
+
         print(f"⏱️ Using timeout: {timeout}s")
         if not self.api_key or self.api_key == 'your-anthropic-api-key-here':
             return {
@@ -282,6 +663,11 @@ class ClaudeInsightRunner:
                 'error': 'API key not configured'
             }
         
+        if stream_to:
+            client = self._get_anthropic_client()
+            if client:
+                return self._stream_claude_api(client, prompt, timeout, stream_to)
+        
         try:
             headers = {
                 'Content-Type': 'application/json',
@@ -299,7 +685,7 @@ class ClaudeInsightRunner:
             }
             
             # Use compact JSON for smaller payload
-            compact_data = json.dumps(data, separators=(',', ':'))
+            compact_data = _dumps_compact(data)
             
             # Log prompt size for debugging
             prompt_size = len(compact_data)
@@ -309,63 +695,50 @@ class ClaudeInsightRunner:
             if prompt_size > 200000:  # 200KB
                 print(f"⚠️ WARNING: Large payload detected! This may cause API errors.")
             
-            # Try with timeout and retry logic
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    # Create fresh session for each request to avoid stale connections
-                    with requests.Session() as session:
-                        response = session.post(
-                            self.api_url, 
-                            headers=headers, 
-                            data=compact_data,
-                            timeout=timeout
-                        )
-                    
-                    if response.status_code == 200:
-                        result = response.json()
-                        return {
-                            'success': True,
-                            'response': result['content'][0]['text']
-                        }
-                    elif response.status_code == 429:  # Rate limit
-                        if attempt < max_retries - 1:
-                            print(f"⏳ Rate limited, retrying in {2 ** attempt} seconds...")
-                            time.sleep(2 ** attempt)
-                            continue
-                        else:
-                            return {
-                                'success': False,
-                                'error': f"API rate limit exceeded after {max_retries} attempts"
-                            }
-                    else:
-                        return {
-                            'success': False,
-                            'error': f"API error {response.status_code}: {response.text}"
-                        }
-                except requests.exceptions.Timeout:
-                    if attempt < max_retries - 1:
-                        print(f"⏱️ Request timed out, retrying (attempt {attempt + 1}/{max_retries})...")
-                        continue
-                    else:
-                        return {
-                            'success': False,
-                            'error': f"Request timed out after {max_retries} attempts"
-                        }
-                except requests.exceptions.ConnectionError as e:
-                    # Handle connection errors (including RemoteDisconnected)
-                    if attempt < max_retries - 1:
-                        wait_time = (attempt + 1) * 5  # 5s, 10s, 15s
-                        print(f"🔌 Connection error: {str(e)}")
-                        print(f"⏳ Retrying in {wait_time}s (attempt {attempt + 1}/{max_retries})...")
-                        time.sleep(wait_time)
-                        continue
-                    else:
-                        return {
-                            'success': False,
-                            'error': f"Connection error after {max_retries} attempts: {str(e)}"
-                        }
-                
+            # Compress large bodies; repetitive timeline JSON shrinks several-fold
+            if self.gzip_requests and prompt_size > GZIP_MIN_BYTES:
+                compact_data = gzip.compress(compact_data, compresslevel=6)
+                headers['Content-Encoding'] = 'gzip'
+                print(f"🗜️  Gzipped request body: {prompt_size:,} -> {len(compact_data):,} bytes")
+            
+            # Retries (429/5xx, connection errors, timeouts) are handled by the
+            # session's HTTPAdapter, honoring Retry-After on rate limits
+            try:
+                response = self._session.post(
+                    self.api_url,
+                    headers=headers,
+                    data=compact_data,
+                    timeout=timeout
+                )
+            except requests.exceptions.Timeout:
+                return {
+                    'success': False,
+                    'error': f"Request timed out after {API_MAX_RETRIES} retries"
+                }
+            except requests.exceptions.ConnectionError as e:
+                # Includes RemoteDisconnected and exhausted read-timeout retries
+                return {
+                    'success': False,
+                    'error': f"Connection error after {API_MAX_RETRIES} retries: {str(e)}"
+                }
+
+            if response.status_code == 200:
+                result = response.json()
+                return {
+                    'success': True,
+                    'response': result['content'][0]['text']
+                }
+            elif response.status_code == 429:  # Rate limit
+                return {
+                    'success': False,
+                    'error': f"API rate limit exceeded after {API_MAX_RETRIES} retries"
+                }
+            else:
+                return {
+                    'success': False,
+                    'error': f"API error {response.status_code}: {response.text}"
+                }
+
         except Exception as e:
             import traceback
             return {
@@ -374,49 +747,138 @@ class ClaudeInsightRunner:
                 'traceback': traceback.format_exc()
             }
     
+    def _get_anthropic_client(self):
+        """Return an anthropic SDK client, or None if the SDK is not installed"""
+        if self._anthropic_client is None:
+            try:
+                import anthropic
+                self._anthropic_client = anthropic.Anthropic(
+                    api_key=self.api_key,
+                    max_retries=API_MAX_RETRIES
+                )
+            except ImportError:
+                self._anthropic_client = False
+        return self._anthropic_client
+    
+    def _stream_claude_api(self, client, prompt, timeout, response_file):
+        """Stream the response into response_file as tokens arrive (SDK handles retries)"""
+        import anthropic
+
+        print(f"📏 Prompt size: {len(prompt):,} chars ({len(prompt)/1024:.1f} KB), streaming response")
+        
+        # Stream into a side file so a failed call never leaves a truncated result behind
+        partial_file = response_file + '.partial'
+        chunks = []
+        try:
+            with open(partial_file, 'w', encoding='utf-8') as f:
+                with client.messages.stream(
+                    model=self.model,
+                    max_tokens=4000,
+                    messages=[{
+                        'role': 'user',
+                        'content': prompt
+                    }],
+                    timeout=timeout
+                ) as stream:
+                    for text in stream.text_stream:
+                        f.write(text)
+                        chunks.append(text)
+            os.replace(partial_file, response_file)
+            return {
+                'success': True,
+                'response': ''.join(chunks),
+                'streamed': True
+            }
+        except anthropic.RateLimitError:
+            return {
+                'success': False,
+                'error': f"API rate limit exceeded after {API_MAX_RETRIES} retries"
+            }
+        except anthropic.APITimeoutError:
+            return {
+                'success': False,
+                'error': f"Request timed out after {API_MAX_RETRIES} retries"
+            }
+        except anthropic.APIConnectionError as e:
+            return {
+                'success': False,
+                'error': f"Connection error after {API_MAX_RETRIES} retries: {str(e)}"
+            }
+        except anthropic.APIStatusError as e:
+            return {
+                'success': False,
+                'error': f"API error {e.status_code}: {e.message}"
+            }
+        except Exception as e:
+            import traceback
+            return {
+                'success': False,
+                'error': f"{type(e).__name__}: {str(e)}",
+                'traceback': traceback.format_exc()
+            }
+        finally:
+            if os.path.exists(partial_file):
+                os.remove(partial_file)
+    
     def _update_metadata(self, video_id, prompt_name):
         """Update video metadata to track completed prompts"""
-        metadata_file = os.path.join(self.base_dir, video_id, 'metadata.json')
+        video_dir = os.path.join(self.base_dir, video_id)
+        metadata_file = os.path.join(video_dir, 'metadata.json')
         
         try:
-            # Load existing metadata
-            if os.path.exists(metadata_file):
-                with open(metadata_file, 'r') as f:
-                    metadata = json.load(f)
-            else:
-                metadata = {
-                    'videoId': video_id,
-                    'createdAt': datetime.now().isoformat(),
-                    'completedPrompts': []
-                }
-            
-            # Update completed prompts
-            if prompt_name not in metadata.get('completedPrompts', []):
-                metadata['completedPrompts'].append(prompt_name)
-                metadata['lastUpdated'] = datetime.now().isoformat()
-                metadata['completionRate'] = (len(metadata['completedPrompts']) / 15) * 100
+            _ensure_dir(video_dir, self._known_dirs)
+            # Batch prompts (and other runner processes) finish concurrently, so the
+            # read-modify-write happens under a thread lock plus a file lock
+            with self._metadata_lock, _file_lock(metadata_file + '.lock'):
+                now = datetime.now().isoformat()
+                # Load existing metadata
+                try:
+                    metadata = read_json(metadata_file)
+                except FileNotFoundError:
+                    metadata = {
+                        'videoId': video_id,
+                        'createdAt': now,
+                        'totalPrompts': self.total_prompts,
+                        'completedPrompts': []
+                    }
                 
-                # Save updated metadata
-                with open(metadata_file, 'w') as f:
-                    json.dump(metadata, f, indent=2)
+                # Update completed prompts
+                if prompt_name not in metadata.get('completedPrompts', []):
+                    metadata['completedPrompts'].append(prompt_name)
+                    metadata['lastUpdated'] = now
+                    total_prompts = metadata.setdefault('totalPrompts', self.total_prompts)
+                    metadata['completionRate'] = (len(metadata['completedPrompts']) / total_prompts) * 100
+                    
+                    # Save updated metadata (machine-read, so compact)
+                    _replace_json(metadata_file, metadata, indent=False)
                     
         except Exception as e:
             print(f"Failed to update metadata: {e}")
     
-    def run_batch_prompts(self, video_id, prompts_dict):
-        """Run multiple prompts for a video"""
-        results = {}
+    def run_batch_prompts(self, video_id, prompts_dict, max_concurrency=None):
+        """
+        Run multiple prompts for a video
         
-        for prompt_name, prompt_data in prompts_dict.items():
+        Prompts are network-bound, so up to max_concurrency of them (default:
+        RUMIAI_BATCH_MAX_CONCURRENCY) are in flight at once on the shared
+        session. Results keep the order of prompts_dict.
+        """
+        if max_concurrency is None:
+            max_concurrency = self.batch_max_concurrency
+        def run_one(prompt_name, prompt_data):
             print(f"\n🔄 Running {prompt_name}...")
             
             prompt_text = prompt_data.get('prompt', '')
             context = prompt_data.get('context', None)
             
-            result = self.run_claude_prompt(video_id, prompt_name, prompt_text, context)
-            results[prompt_name] = result
-            
-        return results
+            return self.run_claude_prompt(video_id, prompt_name, prompt_text, context)
+        
+        if max_concurrency <= 1 or len(prompts_dict) <= 1:
+            return {name: run_one(name, data) for name, data in prompts_dict.items()}
+        
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(prompts_dict))) as pool:
+            futures = {name: pool.submit(run_one, name, data) for name, data in prompts_dict.items()}
+            return {name: future.result() for name, future in futures.items()}
 
 
 # Convenience function matching the requested format
@@ -433,7 +895,8 @@ def run_claude_prompt(video_id, prompt_name, prompt_text, claude_response=None):
         # Just save the provided response
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         output_dir = os.path.join('insights', video_id, prompt_name)
-        os.makedirs(output_dir, exist_ok=True)
+        with _known_dirs_lock:
+            _ensure_dir(output_dir, _known_dirs)
         
         # Save prompt
         with open(os.path.join(output_dir, f'{prompt_name}_prompt_{timestamp}.txt'), 'w') as f:
@@ -475,16 +938,18 @@ def main():
     unified_path = 'unified_analysis/cristiano_7515739984452701457.json'
     context_data = {}
     
-    if os.path.exists(unified_path):
-        with open(unified_path, 'r') as f:
-            unified = json.load(f)
-            context_data = {
-                'first_3_seconds': {
-                    'text_overlays': unified.get('timelines', {}).get('textOverlayTimeline', {}),
-                    'objects': unified.get('timelines', {}).get('objectTimeline', {})
-                },
-                'video_stats': unified.get('static_metadata', {}).get('stats', {})
-            }
+    try:
+        unified = read_json(unified_path)
+    except FileNotFoundError:
+        pass
+    else:
+        context_data = {
+            'first_3_seconds': {
+                'text_overlays': unified.get('timelines', {}).get('textOverlayTimeline', {}),
+                'objects': unified.get('timelines', {}).get('objectTimeline', {})
+            },
+            'video_stats': unified.get('static_metadata', {}).get('stats', {})
+        }
     
     result = runner.run_claude_prompt(
         video_id='cristiano_7515739984452701457',
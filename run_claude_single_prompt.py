@@ -4,44 +4,58 @@ Run a single Claude prompt for debugging/testing
 """
 
 import sys
-import json
 import os
 from pathlib import Path
-from run_claude_insight import ClaudeInsightRunner
+from run_claude_insight import ClaudeInsightRunner, PROMPT_NAMES, read_json
+
+# Same templates the main pipeline sends (prompt_templates/<prompt_name>.txt)
+PROMPT_TEMPLATE_DIR = Path('prompt_templates')
+
+# Short stand-ins used when a template file is missing
+FALLBACK_PROMPT_TEXTS = {
+    'creative_density': "Analyze the creative density and pacing of this TikTok video...",
+    'emotional_journey': "Analyze the emotional journey of this video...",
+    'speech_analysis': "Analyze the speech patterns and delivery...",
+    'visual_overlay_analysis': "Analyze visual overlays and text elements...",
+    'metadata_analysis': "Analyze the metadata, captions, and hashtags...",
+    'person_framing': "Analyze how people are framed in this video...",
+    'scene_pacing': "Analyze the scene changes and pacing..."
+}
 
 def main():
-    if len(sys.argv) < 3:
-        print("Usage: python run_claude_single_prompt.py <video_id> <prompt_name>")
+    # --no-cache forces a fresh API call even if an identical prompt was answered recently
+    use_cache = '--no-cache' not in sys.argv
+    args = [arg for arg in sys.argv[1:] if arg != '--no-cache']
+    
+    if len(args) < 2:
+        print("Usage: python run_claude_single_prompt.py <video_id> <prompt_name> [--no-cache]")
         print("Example: python run_claude_single_prompt.py 7395982344001309957 creative_density")
         sys.exit(1)
     
-    video_id = sys.argv[1]
-    prompt_name = sys.argv[2]
+    video_id = args[0]
+    prompt_name = args[1]
+    
+    # Reject typos before loading data or spending an API call
+    if prompt_name not in PROMPT_NAMES:
+        print(f"Error: Unknown prompt '{prompt_name}'. Choices: {', '.join(sorted(PROMPT_NAMES))}")
+        sys.exit(1)
     
     # Load unified analysis
     unified_path = Path(f'unified_analysis/{video_id}.json')
-    if not unified_path.exists():
+    try:
+        unified_data = read_json(unified_path)
+    except FileNotFoundError:
         print(f"Error: Unified analysis not found at {unified_path}")
         sys.exit(1)
     
-    with open(unified_path, 'r') as f:
-        unified_data = json.load(f)
-    
-    # Get prompt text (simplified for testing)
-    prompt_texts = {
-        'creative_density': "Analyze the creative density and pacing of this TikTok video...",
-        'emotional_journey': "Analyze the emotional journey of this video...",
-        'speech_analysis': "Analyze the speech patterns and delivery...",
-        'visual_overlay_analysis': "Analyze visual overlays and text elements...",
-        'metadata_analysis': "Analyze the metadata, captions, and hashtags...",
-        'person_framing': "Analyze how people are framed in this video...",
-        'scene_pacing': "Analyze the scene changes and pacing..."
-    }
-    
-    prompt_text = prompt_texts.get(prompt_name, "Analyze this video...")
+    # Get prompt text
+    try:
+        prompt_text = (PROMPT_TEMPLATE_DIR / f'{prompt_name}.txt').read_text(encoding='utf-8')
+    except FileNotFoundError:
+        prompt_text = FALLBACK_PROMPT_TEXTS[prompt_name]
     
     # Run the prompt
-    runner = ClaudeInsightRunner()
+    runner = ClaudeInsightRunner(use_cache=use_cache)
     result = runner.run_claude_prompt(
         video_id=video_id,
         prompt_name=prompt_name,
@@ -6,11 +6,11 @@ Ensures only real ML detection data is sent to Claude for analysis
 
 import os
 import sys
-import json
 import argparse
 from datetime import datetime
+from pathlib import Path
 from ml_data_validator import MLDataValidator, validate_ml_data
-from run_claude_insight import ClaudeInsightRunner
+from run_claude_insight import ClaudeInsightRunner, read_json, write_json
 
 def load_unified_analysis(video_id):
     """Load unified analysis data for a video"""
@@ -21,14 +21,12 @@ def load_unified_analysis(video_id):
         print("Please run the complete video analysis first.")
         return None
     
-    with open(unified_file, 'r') as f:
-        return json.load(f)
+    return read_json(unified_file)
 
 def save_validated_data(video_id, prompt_type, validated_data):
     """Save validated data for inspection"""
     output_file = f"validated_data_{video_id}_{prompt_type}.json"
-    with open(output_file, 'w') as f:
-        json.dump(validated_data, f, indent=2)
+    write_json(output_file, validated_data)
     print(f"Validated data saved to: {output_file}")
 
 def run_validated_prompt(video_id, prompt_type, validate_only=False):
@@ -86,8 +84,7 @@ def run_validated_prompt(video_id, prompt_type, validate_only=False):
         
         # Save result
         output_file = f"validated_result_{video_id}_{prompt_type}.json"
-        with open(output_file, 'w') as f:
-            json.dump(result, f, indent=2)
+        write_json(output_file, result)
         
         print(f"Analysis complete. Result saved to: {output_file}")
         return True
@@ -113,10 +110,8 @@ def main():
     
     if args.list_available:
         print("Available unified analysis files:")
-        for file in os.listdir('.'):
-            if file.startswith('unified_analysis_') and file.endswith('.json'):
-                video_id = file.replace('unified_analysis_', '').replace('.json', '')
-                print(f"  {video_id}")
+        for path in Path('.').glob('unified_analysis_*.json'):
+            print(f"  {path.stem.removeprefix('unified_analysis_')}")
         return
     
     print(f"Running validated prompt analysis for video: {args.video_id}")
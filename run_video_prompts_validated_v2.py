@@ -11,7 +11,7 @@ import time
 import statistics
 import re
 from datetime import datetime
-from run_claude_insight import ClaudeInsightRunner
+from run_claude_insight import ClaudeInsightRunner, read_json, write_json
 from statistics import variance
 
 # Initialize the runner
@@ -4122,8 +4122,7 @@ def update_progress(video_id, prompt_name, status, message=""):
 
     try:
         if os.path.exists(progress_file):
-            with open(progress_file, 'r') as f:
-                progress = json.load(f)
+            progress = read_json(progress_file)
         else:
             progress = {'prompts': {}, 'start_time': datetime.now().isoformat()}
         
@@ -4134,8 +4133,7 @@ def update_progress(video_id, prompt_name, status, message=""):
         }
         progress['last_update'] = datetime.now().isoformat()
         
-        with open(progress_file, 'w') as f:
-            json.dump(progress, f, indent=2)
+        write_json(progress_file, progress)
     except Exception as e:
         print(f"⚠️ Failed to update progress file: {e}")
 def run_single_prompt(video_id, prompt_name):
@@ -4156,8 +4154,7 @@ def run_single_prompt(video_id, prompt_name):
 
     # Load unified analysis
     try:
-        with open(unified_path, 'r') as f:
-            unified_data = json.load(f)
+        unified_data = read_json(unified_path)
         print(f"✅ Loaded unified analysis: {len(str(unified_data))} characters")
         update_progress(video_id, prompt_name, 'processing', 'Loaded unified analysis')
     except Exception as e:
@@ -5,47 +5,113 @@ Integrated into the complete flow for any TikTok URL
 """
 
 import os
+import re
 import sys
 import json
 import time
-import statistics
 from datetime import datetime
-from run_claude_insight import ClaudeInsightRunner
+from functools import lru_cache
 
-# Initialize the runner
-runner = ClaudeInsightRunner()
+# The Claude runner is created on first use so --help / dry-run imports stay cheap
+_runner = None
+
+
+def get_runner():
+    """Return the shared ClaudeInsightRunner, creating it on first call"""
+    global _runner
+    if _runner is None:
+        from run_claude_insight import ClaudeInsightRunner
+        _runner = ClaudeInsightRunner()
+    return _runner
+
+
+# Timeline keys look like '0-1s' or '2.5-3.0s'
+_TIMESTAMP_RANGE_RE = re.compile(r'^(\d+(?:\.\d+)?)-(\d+(?:\.\d+)?)s?$')
+
+
+@lru_cache(maxsize=8192)
+def _timestamp_start_second(timestamp):
+    try:
+        return int(timestamp.split('-')[0])
+    except (AttributeError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=8192)
+def _parse_timestamp_range(timestamp):
+    """Parse '0-1s' into (0.0, 1.0), or None if it isn't a range"""
+    match = _TIMESTAMP_RANGE_RE.match(timestamp)
+    if match:
+        return float(match.group(1)), float(match.group(2))
+    return None
 
 
 def parse_timestamp_to_seconds(timestamp):
     """Convert timestamp like '0-1s' to start second"""
     try:
-        return int(timestamp.split('-')[0])
-    except:
+        return _timestamp_start_second(timestamp)
+    except TypeError:  # unhashable input
         return None
 
 
 def is_timestamp_in_second(timestamp, second):
     """Check if a timestamp range overlaps with a given second"""
     try:
-        parts = timestamp.split('-')
-        if len(parts) == 2:
-            start = float(parts[0])
-            end = float(parts[1].replace('s', ''))
-            return start <= second < end
+        timestamp_range = _parse_timestamp_range(timestamp)
+    except TypeError:  # non-string or unhashable input
         return False
-    except:
+    if timestamp_range is None:
         return False
+    start, end = timestamp_range
+    return start <= second < end
+
+
+# Lists at least this long are reduced with numpy; below it numpy's per-call
+# overhead costs more than the pure-Python loop
+NUMPY_MIN_LENGTH = 64
+_numpy = None
+
+
+def _get_numpy():
+    """Import numpy on first use; False if it isn't installed"""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy
+
+
+def _as_float_array(values):
+    """float64 array for long lists when numpy is available, else None"""
+    if len(values) < NUMPY_MIN_LENGTH:
+        return None
+    np = _get_numpy()
+    if not np:
+        return None
+    return np.asarray(values, dtype=np.float64)
 
 
 def mean(values):
     """Calculate mean of a list"""
-    return sum(values) / len(values) if values else 0
+    if not values:
+        return 0
+    array = _as_float_array(values)
+    if array is not None:
+        return float(array.mean())
+    return sum(values) / len(values)
 
 
 def stdev(values):
     """Calculate standard deviation of a list"""
     if len(values) < 2:
         return 0
+    array = _as_float_array(values)
+    if array is not None:
+        return float(array.std(ddof=1))
+    import statistics
     return statistics.stdev(values)
 
 
@@ -53,4 +119,8 @@ def variance(values):
     """Calculate variance of a list"""
     if len(values) < 2:
         return 0
+    array = _as_float_array(values)
+    if array is not None:
+        return float(array.var(ddof=1))
+    import statistics
     return statistics.variance(values)
\ No newline at end of file
@@ -5,33 +5,131 @@ Migration script for RumiAI v1 to v2.
 Handles data migration and compatibility.
 AUTOMATED - NO HUMAN INTERVENTION REQUIRED.
 """
-import json
+import os
 import shutil
 from pathlib import Path
 import sys
 import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple, Union
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from rumiai_v2.core.models import UnifiedAnalysis, Timestamp, Timeline, TimelineEvent
+from rumiai_v2.core.models import (
+    UnifiedAnalysis, MLAnalysisResult, Timestamp, Timeline, TimelineEntry
+)
 from rumiai_v2.utils import Logger
+from rumiai_v2.utils.file_handler import loads_json
+
+try:
+    import ijson
+except ImportError:  # fall back to loading whole files
+    ijson = None
 
 logger = Logger.setup('migration', level='INFO')
 
+# Destination for migrated unified analyses
+V2_UNIFIED_DIR = Path("rumiai_v2_data/unified")
+
+# Prefix ijson reports for each element of timeline.events
+TIMELINE_EVENT_PREFIX = 'timeline.events.item'
+
+# Threads for the single-process path; they overlap one file's blocking
+# writes with the next file's parse
+IO_THREADS = 4
+
+# shutil already tries copy_file_range itself from Python 3.14
+USE_COPY_FILE_RANGE = hasattr(os, 'copy_file_range') and sys.version_info < (3, 14)
+
+
+def _fast_copy(src: Union[str, Path], dst: Union[str, Path]) -> None:
+    """
+    Copy a file with metadata, like shutil.copy2.
+    
+    On Linux the data goes through os.copy_file_range, which lets the kernel
+    share extents (reflink) on copy-on-write filesystems such as Btrfs/XFS
+    instead of moving bytes. Anything unsupported falls back to shutil.copy2.
+    """
+    if USE_COPY_FILE_RANGE:
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                shutil.copystat(src, dst)
+                return
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """
+    copytree copy_function that hardlinks instead of copying bytes.
+    
+    Insight files are written once and then only read, so sharing the inode
+    between v1 and v2 is safe. Falls back to a real copy across filesystems
+    or where links are not supported.
+    """
+    try:
+        os.link(src, dst)
+    except OSError:
+        _fast_copy(src, dst)
+
+
+def _fast_copytree(src: Path, dst: Path, max_workers: int = IO_THREADS) -> None:
+    """
+    Recreate the tree under src at dst, linking or copying each file.
+    
+    Directories are created up front while walking, then each directory's
+    files are handed to a thread pool; link/copy syscalls release the GIL,
+    so large insight trees are populated in parallel.
+    """
+    src, dst = str(src), str(dst)
+    dirs, batches = [], []
+    for root, _dirs, files in os.walk(src):
+        target = os.path.join(dst, os.path.relpath(root, src))
+        os.makedirs(target, exist_ok=True)
+        dirs.append((root, target))
+        if files:
+            batches.append((root, target, files))
+    
+    def copy_batch(batch: Tuple[str, str, list]) -> None:
+        root, target, files = batch
+        for name in files:
+            _link_or_copy(os.path.join(root, name), os.path.join(target, name))
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # list() surfaces the first error, like copytree
+        list(executor.map(copy_batch, batches))
+    
+    # Directory times last, once nothing else is written into them
+    for root, target in dirs:
+        shutil.copystat(root, target)
+
 
 class RumiAIMigrator:
     """Migrate RumiAI v1 data to v2 format."""
     
-    def __init__(self, backup: bool = True):
+    def __init__(self, backup: bool = True, workers: Optional[int] = None,
+                 migration_ts: Optional[str] = None):
         """
         Initialize migrator.
         
         Args:
             backup: Whether to backup files before migration
+            workers: Processes used for unified analyses (default: CPU count)
+            migration_ts: created_at stamped on records that lack one
+                (default: now)
         """
         self.backup = backup
+        self.workers = workers or os.cpu_count() or 1
+        self._migration_ts = migration_ts or datetime.utcnow().isoformat() + 'Z'
         self.stats = {
             'files_found': 0,
             'files_migrated': 0,
@@ -80,51 +178,135 @@ class RumiAIMigrator:
     
     def _migrate_unified_analyses(self, v1_dir: Path, dry_run: bool) -> None:
         """Migrate unified analysis files."""
-        v2_dir = Path("rumiai_v2_data/unified")
+        # scandir hands back names and cached file types without a Path per entry
+        with os.scandir(v1_dir) as entries:
+            paths = [
+                entry.path for entry in entries
+                if entry.name.endswith('.json') and entry.is_file()
+            ]
+        
+        self.stats['files_found'] += len(paths)
+        
+        # Created once here rather than per file by each worker
+        if not dry_run and paths:
+            V2_UNIFIED_DIR.mkdir(parents=True, exist_ok=True)
+        
+        # Each file is independent; parse/convert/save them in worker processes
+        # and keep all logging and stats here in the parent
+        if self.workers > 1 and len(paths) > 1:
+            workers = min(self.workers, len(paths))
+            chunksize = max(1, len(paths) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(
+                    _migrate_one, paths,
+                    [self.backup] * len(paths), [dry_run] * len(paths),
+                    [self._migration_ts] * len(paths),
+                    chunksize=chunksize
+                ))
+        elif len(paths) > 1:
+            with ThreadPoolExecutor(max_workers=min(IO_THREADS, len(paths))) as executor:
+                results = list(executor.map(
+                    self._migrate_unified_file, paths, [dry_run] * len(paths)
+                ))
+        else:
+            results = [self._migrate_unified_file(path, dry_run) for path in paths]
         
-        for json_file in v1_dir.glob("*.json"):
-            self.stats['files_found'] += 1
+        for path, backed_up, error in results:
+            if backed_up:
+                self.stats['backups_created'] += 1
+            if error is None:
+                logger.info(f"✅ Migrated: {os.path.basename(path)}")
+                self.stats['files_migrated'] += 1
+            else:
+                logger.error(f"Failed to migrate {path}: {error}")
+                self.stats['files_failed'] += 1
+    
+    def _migrate_unified_file(self, path: str, dry_run: bool) -> Tuple[str, bool, Optional[str]]:
+        """
+        Migrate one unified analysis file.
+        
+        Returns:
+            (path, backup_created, error message or None)
+        """
+        backed_up = False
+        try:
+            # Load v1 data
+            v1_data = self._load_v1_unified(path)
             
-            try:
-                logger.info(f"Migrating unified analysis: {json_file}")
-                
-                # Load v1 data
-                with open(json_file, 'r') as f:
-                    v1_data = json.load(f)
+            # Convert to v2 format
+            v2_data = self._convert_unified_analysis(v1_data)
+            
+            if not dry_run:
+                # Backup if requested
+                if self.backup:
+                    _fast_copy(path, path + '.v1_backup')
+                    backed_up = True
                 
-                # Convert to v2 format
-                v2_data = self._convert_unified_analysis(v1_data)
+                # Save v2 format (V2_UNIFIED_DIR is created by the caller)
+                v2_path = V2_UNIFIED_DIR / os.path.basename(path)
                 
-                if not dry_run:
-                    # Backup if requested
-                    if self.backup:
-                        backup_path = json_file.with_suffix('.json.v1_backup')
-                        shutil.copy2(json_file, backup_path)
-                        self.stats['backups_created'] += 1
-                    
-                    # Save v2 format
-                    v2_dir.mkdir(parents=True, exist_ok=True)
-                    v2_path = v2_dir / json_file.name
-                    
-                    # Use UnifiedAnalysis model to ensure validity
-                    analysis = UnifiedAnalysis.from_dict(v2_data)
-                    analysis.save_to_file(str(v2_path))
-                    
-                logger.info(f"✅ Migrated: {json_file.name}")
-                self.stats['files_migrated'] += 1
+                # Use UnifiedAnalysis model to ensure validity
+                analysis = self._build_unified_analysis(v2_data, v2_path.stem)
+                analysis.save_to_file(str(v2_path))
+            
+            return path, backed_up, None
+            
+        except Exception as e:
+            return path, backed_up, str(e)
+    
+    def _load_v1_unified(self, json_file: Union[str, Path]) -> Dict[str, Any]:
+        """
+        Load a v1 unified analysis file.
+        
+        With ijson installed, timeline events are converted one at a time as
+        they are parsed, so the raw v1 event list is never held in memory.
+        Those events are stored under '_converted_events' for _convert_timeline.
+        """
+        if ijson is None:
+            with open(json_file, 'rb') as f:
+                return loads_json(f.read())
+        
+        root = ijson.ObjectBuilder()
+        converted = []
+        event_builder = None
+        
+        with open(json_file, 'rb') as f:
+            for prefix, event, value in ijson.parse(f, use_float=True):
+                if prefix == TIMELINE_EVENT_PREFIX and event in ('start_map', 'end_map'):
+                    if event == 'start_map':
+                        event_builder = ijson.ObjectBuilder()
+                    else:
+                        event_builder.event(event, value)
+                        v2_event = self._convert_timeline_event(event_builder.value)
+                        if v2_event:
+                            converted.append(v2_event)
+                        event_builder = None
+                        continue
                 
-            except Exception as e:
-                logger.error(f"Failed to migrate {json_file}: {e}")
-                self.stats['files_failed'] += 1
+                if event_builder is not None:
+                    event_builder.event(event, value)
+                elif not prefix.startswith(TIMELINE_EVENT_PREFIX):
+                    root.event(event, value)
+        
+        v1_data = root.value
+        timeline = v1_data.get('timeline') if isinstance(v1_data, dict) else None
+        if isinstance(timeline, dict) and 'events' in timeline:
+            timeline.pop('events')
+            timeline['_converted_events'] = converted
+        return v1_data
     
     def _convert_unified_analysis(self, v1_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Convert v1 unified analysis to v2 format."""
-        # Start with v1 data
-        v2_data = v1_data.copy()
+        """
+        Convert v1 unified analysis to v2 format.
+        
+        Converts in place: v1_data is freshly loaded per file and not used
+        again, so copying it would only cost an extra dict.
+        """
+        v2_data = v1_data
         
         # Ensure required fields
         v2_data.setdefault('version', '2.0.0')
-        v2_data.setdefault('created_at', datetime.utcnow().isoformat() + 'Z')
+        v2_data.setdefault('created_at', self._migration_ts)
         
         # Convert timeline if present
         if 'timeline' in v2_data and isinstance(v2_data['timeline'], dict):
@@ -147,6 +329,11 @@ class RumiAIMigrator:
             'events': []
         }
         
+        # Events already converted while streaming the file in
+        if '_converted_events' in v1_timeline:
+            v2_timeline['events'] = v1_timeline['_converted_events']
+            return v2_timeline
+        
         # Convert events
         for event in v1_timeline.get('events', []):
             v2_event = self._convert_timeline_event(event)
@@ -156,27 +343,37 @@ class RumiAIMigrator:
         return v2_timeline
     
     def _convert_timeline_event(self, v1_event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Convert v1 timeline event to v2 format."""
-        try:
-            # Parse timestamp
-            ts_value = v1_event.get('timestamp', v1_event.get('time', 0))
-            timestamp = Timestamp.from_value(ts_value)
-            
-            if timestamp is None:
-                logger.warning(f"Skipping event with invalid timestamp: {ts_value}")
-                return None
-            
-            return {
-                'timestamp': timestamp.to_dict(),
-                'event_type': v1_event.get('type', v1_event.get('event_type', 'unknown')),
-                'description': v1_event.get('description', ''),
-                'source': v1_event.get('source', 'v1_migration'),
-                'confidence': float(v1_event.get('confidence', 0.8)),
-                'metadata': v1_event.get('metadata', {})
-            }
-        except Exception as e:
-            logger.warning(f"Failed to convert event: {e}")
+        """
+        Convert v1 timeline event to v2 format.
+        
+        Runs once per event, so fallback keys are only looked up when the
+        primary key is missing and only the confidence conversion is guarded;
+        Timestamp.from_value returns None rather than raising.
+        """
+        # Parse timestamp
+        ts_value = v1_event['timestamp'] if 'timestamp' in v1_event else v1_event.get('time', 0)
+        timestamp = Timestamp.from_value(ts_value)
+        
+        if timestamp is None:
+            logger.warning(f"Skipping event with invalid timestamp: {ts_value}")
             return None
+        
+        confidence = v1_event.get('confidence', 0.8)
+        if type(confidence) is not float:
+            try:
+                confidence = float(confidence)
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Failed to convert event: {e}")
+                return None
+        
+        return {
+            'timestamp': timestamp.to_json(legacy_mode=False),
+            'event_type': v1_event['type'] if 'type' in v1_event else v1_event.get('event_type', 'unknown'),
+            'description': v1_event.get('description', ''),
+            'source': v1_event.get('source', 'v1_migration'),
+            'confidence': confidence,
+            'metadata': v1_event['metadata'] if 'metadata' in v1_event else {}
+        }
     
     def _convert_ml_results(self, v1_ml: Dict[str, Any]) -> Dict[str, Any]:
         """Convert v1 ML results to v2 format."""
@@ -203,13 +400,63 @@ class RumiAIMigrator:
         
         return v2_ml
     
+    def _build_unified_analysis(self, v2_data: Dict[str, Any],
+                                fallback_video_id: str) -> UnifiedAnalysis:
+        """
+        Build the UnifiedAnalysis model from converted v2 data.
+        
+        Timeline events become instantaneous TimelineEntry objects carrying
+        their description, source, confidence and metadata as entry data.
+        The video id falls back to the file name when the record has none.
+        """
+        video_id = v2_data.get('video_id') or fallback_video_id
+        v1_timeline = v2_data.get('timeline') or {}
+        
+        timeline = Timeline(video_id=video_id,
+                            duration=float(v1_timeline.get('duration') or 0.0))
+        for event in v1_timeline.get('events', []):
+            timeline.add_entry(TimelineEntry(
+                start=Timestamp(event['timestamp']),
+                end=None,
+                entry_type=event['event_type'],
+                data={
+                    'description': event['description'],
+                    'source': event['source'],
+                    'confidence': event['confidence'],
+                    'metadata': event['metadata']
+                }
+            ))
+        
+        analysis = UnifiedAnalysis(
+            video_id=video_id,
+            video_metadata=v2_data.get('video_metadata') or {},
+            timeline=timeline,
+            temporal_markers=v2_data.get('temporal_markers'),
+            processing_metadata={
+                'version': v2_data['version'],
+                'created_at': v2_data['created_at'],
+                'migrated_from': 'v1'
+            }
+        )
+        
+        for model_name, result in v2_data.get('ml_results', {}).items():
+            analysis.ml_results[model_name] = MLAnalysisResult(
+                model_name=model_name,
+                model_version=result['metadata'].get('model_version', 'v1'),
+                success=result['success'],
+                data=result['data'],
+                processing_time=result['processing_time']
+            )
+        
+        return analysis
+    
     def _migrate_insights(self, v1_dir: Path, dry_run: bool) -> None:
         """Migrate insights directory."""
         v2_dir = Path("rumiai_v2_data/insights")
         
         if not dry_run and not v2_dir.exists():
             logger.info(f"Copying insights directory to v2 location")
-            shutil.copytree(v1_dir, v2_dir)
+            _fast_copytree(v1_dir, v2_dir)
             self.stats['files_migrated'] += 1
     
     def _migrate_standalone_files(self, dry_run: bool) -> None:
@@ -232,14 +479,21 @@ class RumiAIMigrator:
                     
                     if self.backup and dst.exists():
                         backup = dst.with_suffix(dst.suffix + '.v1_backup')
-                        shutil.copy2(dst, backup)
+                        _fast_copy(dst, backup)
                         self.stats['backups_created'] += 1
                     
-                    shutil.copy2(src, dst)
+                    _fast_copy(src, dst)
                     logger.info(f"Copied {src} to {dst}")
                     self.stats['files_migrated'] += 1
 
 
+def _migrate_one(path: str, backup: bool, dry_run: bool,
+                 migration_ts: str) -> Tuple[str, bool, Optional[str]]:
+    """Process-pool entry point for migrating a single unified analysis file."""
+    migrator = RumiAIMigrator(backup=backup, workers=1, migration_ts=migration_ts)
+    return migrator._migrate_unified_file(path, dry_run)
+
+
 def main():
     """Run migration."""
     import argparse
@@ -249,6 +503,8 @@ def main():
                        help='Simulate migration without making changes')
     parser.add_argument('--no-backup', action='store_true',
                        help='Skip creating backups')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Processes for unified analysis migration (default: CPU count)')
     
     args = parser.parse_args()
     
@@ -258,7 +514,7 @@ def main():
     if args.dry_run:
         print("⚠️  DRY RUN MODE - No changes will be made")
     
-    migrator = RumiAIMigrator(backup=not args.no_backup)
+    migrator = RumiAIMigrator(backup=not args.no_backup, workers=args.workers)
     stats = migrator.migrate_all(dry_run=args.dry_run)
     
     print("\n📊 Migration Summary:")
@@ -10,12 +10,13 @@ import asyncio
 import logging
 import argparse
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Set
 import json
 import os
 import time
 import psutil
 import gc
+import itertools
 
 # Load .env file if it exists
 from dotenv import load_dotenv
@@ -24,22 +25,33 @@ load_dotenv()
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from rumiai_v2.api import ClaudeClient, ApifyClient, MLServices
+from rumiai_v2.api import ClaudeClient
 from rumiai_v2.processors import (
-    VideoAnalyzer, TimelineBuilder, TemporalMarkerProcessor,
+    TimelineBuilder, TemporalMarkerProcessor,
     MLDataExtractor, PromptBuilder, OutputAdapter,
     get_compute_function, COMPUTE_FUNCTIONS
 )
 from rumiai_v2.prompts import PromptManager
 from rumiai_v2.core.models import PromptType, PromptBatch, VideoMetadata
 from rumiai_v2.config import Settings
-from rumiai_v2.utils import FileHandler, Logger, Metrics, VideoProcessingMetrics
+from rumiai_v2.utils import FileHandler, Logger, Metrics, VideoProcessingMetrics, PromptResultCache
 from rumiai_v2.validators import ResponseValidator
 
 # Configure logging
 logger = Logger.setup('rumiai_v2', level=os.getenv('LOG_LEVEL', 'INFO'))
 
 
+def _write_lines(lines) -> None:
+    """
+    Write a block of progress lines to stdout in one call.
+    
+    Keeps each prompt's lines together for the Node.js parent even when
+    several prompts report at once.
+    """
+    sys.stdout.write('\n'.join(lines) + '\n')
+    sys.stdout.flush()
+
+
 class RumiAIRunner:
     """
     Main orchestrator for RumiAI v2.
@@ -47,6 +59,17 @@ class RumiAIRunner:
     CRITICAL: Maintains backward compatibility with old system.
     """
     
+    # Prompts run for every video, in report order
+    PROMPT_TYPES = (
+        PromptType.CREATIVE_DENSITY,
+        PromptType.EMOTIONAL_JOURNEY,
+        PromptType.SPEECH_ANALYSIS,
+        PromptType.VISUAL_OVERLAY,
+        PromptType.METADATA_ANALYSIS,
+        PromptType.PERSON_FRAMING,
+        PromptType.SCENE_PACING
+    )
+    
     def __init__(self, legacy_mode: bool = False):
         """
         Initialize runner.
@@ -58,20 +81,47 @@ class RumiAIRunner:
         self.settings = Settings()
         self.metrics = Metrics()
         self.video_metrics = VideoProcessingMetrics()
+        self._prompt_timer_keys = {pt: f'prompt_{pt.value}' for pt in PromptType}
+        # Increasing suffixes for temporal marker files: seeded from the clock in
+        # microseconds and paired with the pid, so neither reruns nor runner
+        # processes started together overwrite each other's files
+        self._file_seq = itertools.count(time.time_ns() // 1000)
+        self._file_pid = os.getpid()
+        self._prompt_timeouts = {
+            pt: self.settings.prompt_timeouts.get(pt.value, 60) for pt in self.PROMPT_TYPES
+        }
+        
+        # Progress bars for Node.js, indexed by prompts started (v2 loop)
+        # or finished (concurrent legacy loop)
+        n = len(self.PROMPT_TYPES)
+        self._started_bars = [
+            f"[{'█' * (i + 1)}{'░' * (n - i - 1)}] {i + 1}/{n} ({int(i / n * 100)}%)"
+            for i in range(n)
+        ]
+        self._finished_bars = [
+            f"[{'█' * k}{'░' * (n - k)}] {k}/{n} ({int(k / n * 100)}%)"
+            for k in range(1, n + 1)
+        ]
         
         # Initialize file handlers
         self.file_handler = FileHandler(self.settings.output_dir)
         self.unified_handler = FileHandler(self.settings.unified_dir)
         self.insights_handler = FileHandler(self.settings.insights_dir)
+        self._created_dirs: Set[Path] = set()
         self.temporal_handler = FileHandler(self.settings.temporal_dir)
+        self.prompt_cache = (
+            PromptResultCache(self.settings.cache_dir, ttl=self.settings.prompt_cache_ttl)
+            if self.settings.prompt_cache_enabled else None
+        )
         
-        # Initialize clients
-        self.apify = ApifyClient(self.settings.apify_token)
+        # Initialize clients. Scraping and ML clients are created on first use
+        # (see the properties below) since legacy mode only re-runs prompts.
         self.claude = ClaudeClient(self.settings.claude_api_key, self.settings.claude_model)
-        self.ml_services = MLServices()
+        self._apify = None
+        self._ml_services = None
+        self._video_analyzer = None
         
         # Initialize processors
-        self.video_analyzer = VideoAnalyzer(self.ml_services)
         self.timeline_builder = TimelineBuilder()
         self.temporal_processor = TemporalMarkerProcessor()
         self.ml_extractor = MLDataExtractor()
@@ -79,8 +129,34 @@ class RumiAIRunner:
         self.prompt_manager = PromptManager()
         self.output_adapter = OutputAdapter()
         
-        # Verify GPU availability at startup
-        self._verify_gpu()
+        # Verify GPU availability at startup (legacy mode runs no ML models,
+        # so skip the torch import there)
+        if not legacy_mode:
+            self._verify_gpu()
+    
+    @property
+    def apify(self):
+        """Apify client, imported and created on first use."""
+        if self._apify is None:
+            from rumiai_v2.api import ApifyClient
+            self._apify = ApifyClient(self.settings.apify_token)
+        return self._apify
+    
+    @property
+    def ml_services(self):
+        """ML services, imported and created on first use."""
+        if self._ml_services is None:
+            from rumiai_v2.api import MLServices
+            self._ml_services = MLServices()
+        return self._ml_services
+    
+    @property
+    def video_analyzer(self):
+        """Video analyzer, imported and created on first use."""
+        if self._video_analyzer is None:
+            from rumiai_v2.processors import VideoAnalyzer
+            self._video_analyzer = VideoAnalyzer(self.ml_services)
+        return self._video_analyzer
     
     def _verify_gpu(self) -> None:
         """Verify GPU/CUDA availability at startup."""
@@ -180,9 +256,7 @@ class RumiAIRunner:
             unified_analysis.temporal_markers = temporal_markers
             
             # Save temporal markers separately for compatibility
-            temporal_path = self.temporal_handler.get_path(
-                f"{video_id}_{int(time.time())}.json"
-            )
+            temporal_path = self.temporal_handler.get_path(self._temporal_file_name(video_id))
             self.temporal_handler.save_json(temporal_path, temporal_markers)
             
             # Step 6: Save unified analysis
@@ -263,9 +337,7 @@ class RumiAIRunner:
                 unified_analysis.temporal_markers = temporal_markers
                 
                 # Save temporal markers
-                temporal_path = self.temporal_handler.get_path(
-                    f"{video_id}_{int(time.time())}.json"
-                )
+                temporal_path = self.temporal_handler.get_path(self._temporal_file_name(video_id))
                 self.temporal_handler.save_json(temporal_path, temporal_markers)
             
             # Run Claude prompts
@@ -340,87 +412,91 @@ class RumiAIRunner:
     async def _run_claude_prompts(self, analysis) -> Dict[str, Any]:
         """Run all Claude prompts."""
         self.metrics.start_timer('claude_prompts')
+        run_timestamp = time.strftime('%Y%m%d_%H%M%S')
         
-        # Define prompts to run
-        prompt_types = [
-            PromptType.CREATIVE_DENSITY,
-            PromptType.EMOTIONAL_JOURNEY,
-            PromptType.SPEECH_ANALYSIS,
-            PromptType.VISUAL_OVERLAY,
-            PromptType.METADATA_ANALYSIS,
-            PromptType.PERSON_FRAMING,
-            PromptType.SCENE_PACING
-        ]
+        prompt_types = self.PROMPT_TYPES
         
         # Create prompt batch
         batch = PromptBatch(
             video_id=analysis.video_id,
-            prompts=prompt_types
+            prompts=list(prompt_types)
         )
         
-        # Process each prompt
-        for i, prompt_type in enumerate(prompt_types):
-            # Progress output for Node.js
-            progress = int((i / len(prompt_types)) * 100)
-            print(f"\n[{'█' * (i+1)}{'░' * (len(prompt_types)-i-1)}] {i+1}/{len(prompt_types)} ({progress}%)")
-            print(f"🎬 Running {prompt_type.value} for video {analysis.video_id}")
-            
-            try:
-                # Extract relevant data
-                context = self.ml_extractor.extract_for_prompt(analysis, prompt_type)
-                
-                # Build prompt
-                prompt_text = self.prompt_builder.build_prompt(context)
-                
-                # Log prompt info
-                print(f"📏 Payload size: {context.get_size_bytes() / 1024:.1f}KB")
+        # Prompts are independent network round-trips, so run them concurrently.
+        # The semaphore caps calls in flight. On a 429, ClaudeClient waits for the
+        # API's Retry-After (or a jittered exponential backoff) before retrying.
+        semaphore = asyncio.Semaphore(self.settings.max_concurrent_prompts)
+        completed = 0
+        
+        async def run_prompt(prompt_type):
+            nonlocal completed
+            pt_val = prompt_type.value
+            async with semaphore:
+                lines = [f"🎬 Running {pt_val} for video {analysis.video_id}"]
                 
-                # Send to Claude
-                self.metrics.start_timer(f'prompt_{prompt_type.value}')
-                result = self.claude.send_prompt(
-                    prompt_text,
-                    {
+                try:
+                    # Extract relevant data
+                    context = self.ml_extractor.extract_for_prompt_cached(analysis, prompt_type)
+                    
+                    # Build prompt
+                    prompt_text = self.prompt_builder.build_prompt(context)
+                    
+                    # Log prompt info
+                    lines.append(f"📏 {pt_val} payload size: {context.get_size_bytes() / 1024:.1f}KB")
+                    _write_lines(lines)
+                    lines = []
+                    
+                    # Send to Claude (blocking client, so run it off the event loop)
+                    self.metrics.start_timer(self._prompt_timer_keys[prompt_type])
+                    context_data = {
                         'video_id': analysis.video_id,
-                        'prompt_type': prompt_type.value
-                    },
-                    timeout=self.settings.prompt_timeouts.get(prompt_type.value, 60)
-                )
-                prompt_time = self.metrics.stop_timer(f'prompt_{prompt_type.value}')
-                
-                # Record metrics
-                self.video_metrics.record_prompt_time(prompt_type.value, prompt_time)
-                if result.success:
-                    self.video_metrics.record_prompt_cost(prompt_type.value, result.estimated_cost)
-                
-                # Save result
-                self._save_prompt_result(analysis.video_id, prompt_type.value, result)
-                
-                # Add to batch
-                batch.add_result(result)
-                
-                if result.success:
-                    print(f"✅ {prompt_type.value} completed successfully!")
-                    print(f"⏱️  {prompt_type.value} completed in {prompt_time:.1f}s")
-                else:
-                    print(f"❌ {prompt_type.value} failed: {result.error}")
-                
-                # Delay between prompts
-                if i < len(prompt_types) - 1 and self.settings.prompt_delay > 0:
-                    print(f"⏳ Waiting {self.settings.prompt_delay}s before next prompt...")
-                    await asyncio.sleep(self.settings.prompt_delay)
+                        'prompt_type': pt_val
+                    }
+                    result, cache_hit = await asyncio.to_thread(
+                        self._send_prompt,
+                        prompt_text,
+                        context_data,
+                        timeout=self._prompt_timeouts[prompt_type]
+                    )
+                    prompt_time = self.metrics.stop_timer(self._prompt_timer_keys[prompt_type])
+                    if not cache_hit:
+                        self._cache_prompt_result(prompt_text, context_data, result)
                     
-            except Exception as e:
-                logger.error(f"Prompt {prompt_type.value} failed with exception: {str(e)}")
-                print(f"❌ {prompt_type.value} crashed: {str(e)}")
+                    # Record metrics
+                    self.video_metrics.record_prompt_time(pt_val, prompt_time)
+                    if result.success:
+                        self.video_metrics.record_prompt_cost(pt_val, result.estimated_cost)
+                    
+                    # Save result
+                    self._save_prompt_result(analysis.video_id, pt_val, result, run_timestamp)
+                    
+                    if result.success:
+                        lines.append(f"✅ {pt_val} completed successfully!")
+                        lines.append(f"⏱️  {pt_val} completed in {prompt_time:.1f}s")
+                    else:
+                        lines.append(f"❌ {pt_val} failed: {result.error}")
+                        
+                except Exception as e:
+                    logger.error(f"Prompt {pt_val} failed with exception: {str(e)}")
+                    lines.append(f"❌ {pt_val} crashed: {str(e)}")
+                    
+                    # Create failed result
+                    from rumiai_v2.core.models import PromptResult
+                    result = PromptResult(
+                        prompt_type=prompt_type,
+                        success=False,
+                        error=str(e)
+                    )
                 
-                # Create failed result
-                from rumiai_v2.core.models import PromptResult
-                result = PromptResult(
-                    prompt_type=prompt_type,
-                    success=False,
-                    error=str(e)
-                )
-                batch.add_result(result)
+                # Progress output for Node.js
+                completed += 1
+                lines.append(f"\n{self._finished_bars[completed - 1]}")
+                _write_lines(lines)
+                return result
+        
+        # Add results in the fixed prompt order regardless of completion order
+        for result in await asyncio.gather(*(run_prompt(pt) for pt in prompt_types)):
+            batch.add_result(result)
         
         self.metrics.stop_timer('claude_prompts')
         
@@ -434,17 +510,10 @@ class RumiAIRunner:
         """Run Claude prompts with ML precompute (v2 mode)."""
         self.metrics.start_timer('claude_prompts')
         logger.info("Using ML precompute mode (v2)")
+        run_timestamp = time.strftime('%Y%m%d_%H%M%S')
         
-        # Define prompts to run
-        prompt_configs = [
-            ('creative_density', PromptType.CREATIVE_DENSITY),
-            ('emotional_journey', PromptType.EMOTIONAL_JOURNEY),
-            ('speech_analysis', PromptType.SPEECH_ANALYSIS),
-            ('visual_overlay_analysis', PromptType.VISUAL_OVERLAY),
-            ('metadata_analysis', PromptType.METADATA_ANALYSIS),
-            ('person_framing', PromptType.PERSON_FRAMING),
-            ('scene_pacing', PromptType.SCENE_PACING)
-        ]
+        # Precompute functions are named after the prompt type values
+        prompt_configs = [(pt.value, pt) for pt in self.PROMPT_TYPES]
         
         # Create prompt batch
         batch = PromptBatch(
@@ -458,9 +527,10 @@ class RumiAIRunner:
         # Process each prompt
         for i, (compute_name, prompt_type) in enumerate(prompt_configs):
             # Progress output for Node.js
-            progress = int((i / len(prompt_configs)) * 100)
-            print(f"\n[{'█' * (i+1)}{'░' * (len(prompt_configs)-i-1)}] {i+1}/{len(prompt_configs)} ({progress}%)")
-            print(f"🎬 Running {prompt_type.value} for video {analysis.video_id}")
+            _write_lines([
+                f"\n{self._started_bars[i]}",
+                f"🎬 Running {compute_name} for video {analysis.video_id}"
+            ])
             
             try:
                 # Get precompute function
@@ -468,7 +538,7 @@ class RumiAIRunner:
                 if not compute_func:
                     logger.warning(f"No compute function found for {compute_name}, falling back to legacy")
                     # Fall back to legacy extraction
-                    context = self.ml_extractor.extract_for_prompt(analysis, prompt_type)
+                    context = self.ml_extractor.extract_for_prompt_cached(analysis, prompt_type)
                     prompt_text = self.prompt_builder.build_prompt(context)
                 else:
                     # Run precompute function
@@ -480,7 +550,7 @@ class RumiAIRunner:
                         'video_id': analysis.video_id,
                         'video_duration': video_duration,
                         'precomputed_metrics': precomputed_metrics,
-                        'prompt_type': prompt_type.value
+                        'prompt_type': compute_name
                     }
                     
                     # Format prompt using new manager
@@ -494,7 +564,7 @@ class RumiAIRunner:
                     raise ValueError(f"Prompt too large: {size_kb}KB")
                 
                 # Calculate dynamic timeout based on size
-                base_timeout = self.settings.prompt_timeouts.get(prompt_type.value, 60)
+                base_timeout = self._prompt_timeouts[prompt_type]
                 size_factor = max(1, size_kb / 50)  # Scale timeout for larger prompts
                 dynamic_timeout = int(base_timeout * size_factor)
                 
@@ -502,64 +572,67 @@ class RumiAIRunner:
                 model = "claude-3-5-sonnet-20241022" if self.settings.use_claude_sonnet else self.settings.claude_model
                 
                 # Send to Claude
-                self.metrics.start_timer(f'prompt_{prompt_type.value}')
-                result = self.claude.send_prompt(
-                    prompt_text,
-                    {
-                        'video_id': analysis.video_id,
-                        'prompt_type': prompt_type.value,
-                        'model': model
-                    },
-                    timeout=dynamic_timeout
-                )
-                prompt_time = self.metrics.stop_timer(f'prompt_{prompt_type.value}')
+                self.metrics.start_timer(self._prompt_timer_keys[prompt_type])
+                context_data = {
+                    'video_id': analysis.video_id,
+                    'prompt_type': compute_name,
+                    'model': model
+                }
+                result, cache_hit = self._send_prompt(prompt_text, context_data, timeout=dynamic_timeout)
+                prompt_time = self.metrics.stop_timer(self._prompt_timer_keys[prompt_type])
                 
                 # Handle 6-block output format validation
                 if result.success and self.settings.output_format_version == 'v2':
                     # Validate response
                     is_valid, parsed_data, validation_errors = ResponseValidator.validate_6block_response(
                         result.response, 
-                        prompt_type.value
+                        compute_name
                     )
                     
                     if is_valid and parsed_data:
-                        logger.info(f"Received valid 6-block response for {prompt_type.value}")
+                        logger.info(f"Received valid 6-block response for {compute_name}")
                         
                         # Store parsed data for later use
                         result.parsed_response = parsed_data
                         
                         # Convert to legacy format if output format is v1
                         if self.settings.output_format_version == 'v1':
-                            legacy_response = self.output_adapter.convert_6block_to_legacy(parsed_data, prompt_type.value)
+                            legacy_response = self.output_adapter.convert_6block_to_legacy(parsed_data, compute_name)
                             result.response = json.dumps(legacy_response)
                     else:
                         # Try to extract structure from text if JSON parsing failed
                         extracted = ResponseValidator.extract_text_blocks(result.response)
                         if extracted:
-                            logger.warning(f"Extracted 6-block structure from text for {prompt_type.value}")
+                            logger.warning(f"Extracted 6-block structure from text for {compute_name}")
                             result.parsed_response = extracted
                         else:
-                            logger.error(f"Invalid 6-block response for {prompt_type.value}: {', '.join(validation_errors)}")
+                            logger.error(f"Invalid 6-block response for {compute_name}: {', '.join(validation_errors)}")
                             # Mark as failed if we can't parse the response
                             result.success = False
                             result.error = f"Invalid response format: {'; '.join(validation_errors)}"
                 
+                # Cache only once the response has passed validation
+                if not cache_hit:
+                    self._cache_prompt_result(prompt_text, context_data, result)
+                
                 # Record metrics
-                self.video_metrics.record_prompt_time(prompt_type.value, prompt_time)
+                self.video_metrics.record_prompt_time(compute_name, prompt_time)
                 if result.success:
-                    self.video_metrics.record_prompt_cost(prompt_type.value, result.estimated_cost)
+                    self.video_metrics.record_prompt_cost(compute_name, result.estimated_cost)
                 
                 # Save result
-                self._save_prompt_result(analysis.video_id, prompt_type.value, result)
+                self._save_prompt_result(analysis.video_id, compute_name, result, run_timestamp)
                 
                 # Add to batch
                 batch.add_result(result)
                 
                 if result.success:
-                    print(f"✅ {prompt_type.value} completed successfully!")
-                    print(f"⏱️  {prompt_type.value} completed in {prompt_time:.1f}s")
+                    _write_lines([
+                        f"✅ {compute_name} completed successfully!",
+                        f"⏱️  {compute_name} completed in {prompt_time:.1f}s"
+                    ])
                 else:
-                    print(f"❌ {prompt_type.value} failed: {result.error}")
+                    print(f"❌ {compute_name} failed: {result.error}")
                 
                 # Check memory after each prompt
                 if self._check_memory_threshold(threshold_gb=3.5):
@@ -573,8 +646,8 @@ class RumiAIRunner:
                     await asyncio.sleep(self.settings.prompt_delay)
                     
             except Exception as e:
-                logger.error(f"Prompt {prompt_type.value} failed with exception: {str(e)}")
-                print(f"❌ {prompt_type.value} crashed: {str(e)}")
+                logger.error(f"Prompt {compute_name} failed with exception: {str(e)}")
+                print(f"❌ {compute_name} crashed: {str(e)}")
                 
                 # Create failed result
                 from rumiai_v2.core.models import PromptResult
@@ -593,21 +666,66 @@ class RumiAIRunner:
         
         return batch.results
     
-    def _save_prompt_result(self, video_id: str, prompt_name: str, result) -> None:
-        """Save individual prompt result."""
+    def _temporal_file_name(self, video_id: str) -> str:
+        """File name for a new temporal markers file, unique across runs and processes."""
+        return f"{video_id}_{next(self._file_seq)}_{self._file_pid}.json"
+    
+    def _send_prompt(self, prompt_text: str, context_data: Dict[str, Any], timeout: int):
+        """
+        Send a prompt to Claude, reusing the cached result for identical prompts.
+        
+        Returns (result, cache_hit). A cache hit makes no API call, so its cost
+        is reported as zero. Fresh results are not cached here; callers store
+        them with _cache_prompt_result once any response validation has run.
+        """
+        if self.prompt_cache is not None:
+            cached = self.prompt_cache.get(
+                context_data['prompt_type'],
+                context_data.get('model', self.settings.claude_model),
+                prompt_text
+            )
+            if cached is not None:
+                logger.info(f"Prompt cache hit for {context_data['prompt_type']} ({context_data.get('video_id')})")
+                cached.estimated_cost = 0.0
+                return cached, True
+        
+        return self.claude.send_prompt(prompt_text, context_data, timeout=timeout), False
+    
+    def _cache_prompt_result(self, prompt_text: str, context_data: Dict[str, Any], result) -> None:
+        """Store a validated result for reuse; failed results are never cached."""
+        if self.prompt_cache is None:
+            return
+        self.prompt_cache.set(
+            context_data['prompt_type'],
+            context_data.get('model', self.settings.claude_model),
+            prompt_text,
+            result
+        )
+    
+    def _save_prompt_result(self, video_id: str, prompt_name: str, result, timestamp: str) -> None:
+        """
+        Save individual prompt result.
+        
+        Args:
+            timestamp: Filename suffix shared by all prompts of one run
+        """
         # Create directory structure
         prompt_dir = self.insights_handler.get_path(video_id, prompt_name)
-        prompt_dir.mkdir(parents=True, exist_ok=True)
+        if prompt_dir not in self._created_dirs:
+            prompt_dir.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(prompt_dir)
         
         # Save result
-        timestamp = time.strftime('%Y%m%d_%H%M%S')
         result_path = prompt_dir / f"{prompt_name}_result_{timestamp}.txt"
         complete_path = prompt_dir / f"{prompt_name}_complete_{timestamp}.json"
         
         if result.success:
-            # Save response text
-            with open(result_path, 'w') as f:
-                f.write(result.response)
+            # Save response text as one bytes write
+            response = result.response
+            if isinstance(response, str):
+                response = response.encode('utf-8')
+            with open(result_path, 'wb') as f:
+                f.write(response)
         
         # Save complete data
         self.insights_handler.save_json(complete_path, result.to_dict())
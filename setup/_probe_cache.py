@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Disk-backed cache for `--version` style probes used by the setup scripts.
+
+Version strings never change while a binary stays the same, so results are
+keyed on (argv, PATH, resolved binary, binary mtime) and stored in
+~/.cache/rumiai/probes.json. Re-running requirements_check.py or
+setup_helper.py then costs a stat per tool instead of a fork+exec.
+"""
+
+import functools
+import json
+import os
+import shutil
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+CACHE_PATH = Path.home() / ".cache" / "rumiai" / "probes.json"
+
+# Seconds a cached result stays valid; None means until the binary changes
+DEFAULT_TTL = 24 * 3600
+
+_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=1)
+def _load():
+    try:
+        with open(CACHE_PATH, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save(entries):
+    try:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = CACHE_PATH.with_name(f"{CACHE_PATH.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, CACHE_PATH)
+    except OSError:
+        pass  # caching is best effort
+
+@functools.lru_cache(maxsize=4)
+def _path_index(path):
+    """{name: first path on PATH}, built with one scandir per PATH directory"""
+    index = {}
+    for directory in path.split(os.pathsep):
+        try:
+            with os.scandir(directory or os.curdir) as entries:
+                for entry in entries:
+                    index.setdefault(entry.name, entry.path)
+        except OSError:
+            continue
+    return index
+
+def which(name):
+    """
+    shutil.which for bare command names, backed by a single cached PATH scan.
+
+    Missing tools cost a dict lookup instead of a stat per PATH directory.
+    Anything the index can't answer exactly (paths, Windows PATHEXT, a first
+    match that isn't executable) falls back to shutil.which.
+    """
+    if os.name == 'nt' or os.path.dirname(name):
+        return shutil.which(name)
+    candidate = _path_index(os.environ.get('PATH', os.defpath)).get(name)
+    if candidate is None:
+        return None
+    if os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+        return candidate
+    return shutil.which(name)
+
+def spawn(binary, args, timeout=10):
+    """
+    Run a resolved binary and capture its output.
+
+    With an absolute path and close_fds=False, subprocess starts the child
+    with posix_spawn instead of fork+exec, which avoids copying the parent's
+    page tables. Python's own descriptors are non-inheritable (PEP 446), so
+    nothing extra leaks into the child.
+    """
+    return subprocess.run([binary, *args], capture_output=True, text=True,
+                          timeout=timeout, close_fds=False)
+
+@functools.lru_cache(maxsize=64)
+def run_version(argv, ttl=DEFAULT_TTL, timeout=10):
+    """
+    Run a version probe such as ('node', '--version'), reusing earlier results.
+
+    argv is a tuple so results can also be memoized in-process. Returns a
+    CompletedProcess, or None if the binary is missing, fails to start or
+    times out.
+    """
+    binary = which(argv[0])
+    if binary is None:
+        return None
+    try:
+        mtime = os.path.getmtime(binary)
+    except OSError:
+        return None
+
+    key = json.dumps([list(argv), os.environ.get('PATH', ''), binary, mtime])
+    with _lock:
+        entry = _load().get(key)
+    if entry is not None and (ttl is None or time.time() - entry['time'] < ttl):
+        return subprocess.CompletedProcess(list(argv), entry['returncode'],
+                                           entry['stdout'], entry['stderr'])
+
+    try:
+        result = spawn(binary, argv[1:], timeout)
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+    with _lock:
+        entries = _load()
+        entries[key] = {
+            'time': time.time(),
+            'returncode': result.returncode,
+            'stdout': result.stdout,
+            'stderr': result.stderr
+        }
+        _save(entries)
+    return subprocess.CompletedProcess(list(argv), result.returncode, result.stdout, result.stderr)
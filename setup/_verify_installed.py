@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Check whether a requirements file is already satisfied in this interpreter.
+
+Run with the venv's Python by bootstrap.py so pip can be skipped entirely.
+Usage: _verify_installed.py requirements.txt [extra-package ...]
+Exits 0 when every pinned package (and each extra package) is installed
+at the pinned version, 1 otherwise. Lines this script cannot check
+(URLs, options, other specifiers) count as unsatisfied.
+"""
+
+import re
+import sys
+from importlib import metadata
+
+# name[extras]==version or name[extras]>=version
+REQUIREMENT = re.compile(r'^([A-Za-z0-9][A-Za-z0-9._-]*)(?:\[[^\]]*\])?\s*(==|>=)\s*([^\s;]+)$')
+
+def version_key(version):
+    """Numeric release tuple, e.g. '68.0.0' -> (68, 0, 0)"""
+    return tuple(int(part) for part in re.findall(r'\d+', version.split('+')[0]))
+
+def satisfied(line):
+    match = REQUIREMENT.match(line)
+    if not match:
+        return False
+    name, op, wanted = match.groups()
+    try:
+        installed = metadata.version(name).split('+')[0]  # ignore local tags like +cu121
+    except metadata.PackageNotFoundError:
+        return False
+    if op == '==':
+        return installed == wanted
+    return version_key(installed) >= version_key(wanted)
+
+def main(argv):
+    if len(argv) < 2:
+        print(__doc__)
+        return 2
+
+    with open(argv[1], 'r') as f:
+        lines = [line.split('#', 1)[0].strip() for line in f]
+
+    for line in filter(None, lines):
+        if not satisfied(line):
+            print(f"Not satisfied: {line}")
+            return 1
+
+    for name in argv[2:]:
+        try:
+            metadata.version(name)
+        except metadata.PackageNotFoundError:
+            print(f"Not installed: {name}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -11,12 +11,19 @@ import json
 import shutil
 import stat
 import platform
+import hashlib
+import functools
+from collections import deque
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import py312_patches
+
 # ANSI color codes for terminal output
 class Colors:
     GREEN = '\033[92m'
@@ -42,15 +49,97 @@ def print_status(message, status="info"):
         print(f"{message}")
         print(f"{'='*60}{Colors.RESET}\n")
 
+# Prompt templates the pipeline cannot run without
+REQUIRED_TEMPLATES = (
+    'creative_density.txt',
+    'emotional_journey.txt',
+    'metadata_analysis.txt',
+    'person_framing.txt',
+    'scene_pacing.txt',
+    'speech_analysis.txt',
+    'visual_overlay_analysis.txt'
+)
+
+# CLIP is not on PyPI and is installed straight from GitHub
+CLIP_REQUIREMENT = 'git+https://github.com/openai/CLIP.git'
+
+# pip at or above this version is not upgraded during bootstrap
+MIN_PIP_VERSION = (24, 0)
+
+# Appended to requirement lines rewritten by py312_patches
+PY312_NOTE = "Updated for Python 3.12 compatibility"
+
+# Interpreter version line written by `python -m venv`
+PYVENV_VERSION = re.compile(r'^version(?:_info)?\s*=\s*(\d+)\.(\d+)', re.M)
+
+def python_version_tuple(version_output):
+    """(major, minor) from `python --version` output such as 'Python 3.12.3', or None"""
+    match = re.search(r'Python (\d+)\.(\d+)', version_output)
+    return (int(match.group(1)), int(match.group(2))) if match else None
+
+# One KEY=value assignment per line; comments and blank lines never match
+ENV_LINE = re.compile(r'^[ \t]*([A-Za-z_][A-Za-z0-9_.-]*)[ \t]*=(.*)$', re.M)
+
+@functools.lru_cache(maxsize=32)
+def probe(cmd, timeout=10):
+    """
+    Run a short, idempotent probe (e.g. `node --version`) once per run.
+    
+    cmd is a tuple so results can be cached; returns the CompletedProcess,
+    or None if the command is missing, fails to start or times out.
+    """
+    try:
+        return subprocess.run(list(cmd), capture_output=True, text=True, timeout=timeout)
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def probe_commands(commands):
+    """
+    Run version probes concurrently.
+    
+    Takes {name: argv} and returns {name: probe(argv)}.
+    """
+    with ThreadPoolExecutor(max_workers=len(commands) or 1) as executor:
+        futures = {name: executor.submit(probe, tuple(argv)) for name, argv in commands.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+def run_streamed(cmd, cwd=None, prefix=None, tail=200):
+    """
+    Run a long install command, echoing its output live.
+    
+    stdout and stderr are merged and printed line by line (tagged with
+    prefix, since npm and pip may run at once); only the last `tail` lines
+    are kept for error reporting. Returns (returncode, tail output).
+    """
+    lines = deque(maxlen=tail)
+    tag = f"  [{prefix}] " if prefix else ""
+    with subprocess.Popen(cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                          bufsize=1, text=True) as proc:
+        for line in proc.stdout:
+            sys.stdout.write(tag + line)
+            lines.append(line)
+    return proc.returncode, ''.join(lines)
+
 class RumiAIBootstrap:
-    def __init__(self):
-        self.root_dir = Path(__file__).parent.parent
+    def __init__(self, force=False):
+        # Resolved once; every other project path is derived from it here
+        self.root_dir = Path(__file__).resolve().parent.parent
         self.setup_dir = self.root_dir / "setup"
         self.venv_path = self.root_dir / "venv"
+        self.templates_dir = self.root_dir / "prompt_templates"
+        self.requirements_path = self.root_dir / "requirements.txt"
+        self.requirements_py312_path = self.root_dir / "requirements_py312.txt"
+        self.env_path = self.root_dir / ".env"
+        self.venv_cache_root = Path.home() / ".cache" / "rumiai" / "venvs"
+        self.wheel_cache = Path.home() / ".cache" / "rumiai" / "wheels"
+        self._env_cache = None  # (mtime_ns, parsed .env)
+        self.force = force
+        self.fingerprint_path = self.setup_dir / ".bootstrap_fingerprint.json"
         self.report_path = self.setup_dir / "setup_report.txt"
         self.errors = []
         self.warnings = []
         self.successes = []
+        self.clip_failed = False
         
     def run(self):
         """Main bootstrap orchestration"""
@@ -60,25 +149,55 @@ class RumiAIBootstrap:
         print_status("Phase 1: System Checks", "header")
         self.check_system_requirements()
         
-        # Phase 2: Environment setup
-        print_status("Phase 2: Environment Setup", "header")
-        self.setup_python_environment()
-        self.setup_node_environment()
-        self.validate_env_file()
-        
-        # Phase 3: Resource verification
-        print_status("Phase 3: Resource Verification", "header")
-        self.verify_prompt_templates()
-        self.check_model_caches()
+        # Phases 2-4: Environment setup, resource verification, permissions.
+        # These steps are independent and mostly wait on npm, pip or the
+        # filesystem, so the rest run in threads while pip installs here.
+        # Each print_status/list append is a single call, so output lines
+        # and results don't interleave mid-entry.
+        print_status("Phases 2-4: Environment Setup, Resource Verification, Script Permissions", "header")
+        
+        # Steps whose inputs match the last error-free run are skipped
+        fingerprint = self.compute_fingerprint()
+        previous = {} if self.force else self.load_fingerprint()
+        
+        def unchanged(*keys):
+            return bool(previous) and all(previous.get(key) == fingerprint[key] for key in keys)
+        
+        steps = [self.check_model_caches, self.check_script_permissions]
+        for keys, step, label in (
+            (('node', 'node_modules'), self.setup_node_environment, "Node.js environment"),
+            (('env',), self.validate_env_file, "Environment variables"),
+            (('templates',), self.verify_prompt_templates, "Prompt templates")
+        ):
+            if unchanged(*keys):
+                self.skip_unchanged(label)
+            else:
+                steps.append(step)
         
-        # Phase 4: Script permissions
-        print_status("Phase 4: Script Permissions", "header")
-        self.check_script_permissions()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(step) for step in steps]
+            if unchanged('python', 'requirements', 'venv'):
+                self.skip_unchanged("Python environment")
+            else:
+                self.setup_python_environment()
+            for future in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    print_status(f"Setup step failed: {e}", "error")
+                    self.errors.append(f"Setup step failed: {e}")
         
         # Phase 5: Generate report
         print_status("Phase 5: Setup Report", "header")
         self.generate_report()
         
+        if not self.errors:
+            fingerprint = self.compute_fingerprint()
+            if self.clip_failed:
+                # CLIP is only a warning, but the Python step must rerun to retry it
+                fingerprint['python'] = None
+            self.save_fingerprint(fingerprint)
+        
         # Final status
         if self.errors:
             print_status(f"Setup completed with {len(self.errors)} errors", "error")
@@ -87,6 +206,50 @@ class RumiAIBootstrap:
             print_status("Setup completed successfully!", "success")
             return True
     
+    def compute_fingerprint(self):
+        """Hash the inputs of each skippable setup step"""
+        def file_hash(path):
+            try:
+                return hashlib.sha256(path.read_bytes()).hexdigest()
+            except OSError:
+                return None
+        
+        try:
+            templates = sorted(os.listdir(self.templates_dir))
+        except OSError:
+            templates = None
+        
+        return {
+            'python': sys.version,
+            'requirements': [file_hash(self.requirements_path), file_hash(self.requirements_py312_path)],
+            'venv': self.venv_path.exists(),
+            'node': file_hash(self.root_dir / "package.json"),
+            'node_modules': (self.root_dir / "node_modules").exists(),
+            'env': file_hash(self.env_path),
+            'templates': templates
+        }
+    
+    def load_fingerprint(self):
+        """Fingerprint saved by the last error-free run, or {}"""
+        try:
+            with open(self.fingerprint_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def save_fingerprint(self, fingerprint):
+        """Remember this run's inputs so unchanged steps can be skipped next time"""
+        try:
+            with open(self.fingerprint_path, 'w') as f:
+                json.dump(fingerprint, f, indent=2)
+        except OSError as e:
+            print_status(f"Could not save setup fingerprint: {e}", "warning")
+    
+    def skip_unchanged(self, label):
+        """Report a step skipped because its inputs are unchanged"""
+        print_status(f"{label} unchanged since last successful setup, skipping (use --force to re-run)", "success")
+        self.successes.append(f"{label} unchanged")
+    
     def check_system_requirements(self):
         """Check system-level dependencies"""
         print_status("Checking system requirements...")
@@ -123,11 +286,16 @@ class RumiAIBootstrap:
             print_status(f"Python 3.8+ required, found {python_version.major}.{python_version.minor}", "error")
             self.errors.append("Python version < 3.8")
         
+        # Probe Node.js and FFmpeg at the same time
+        probes = probe_commands({
+            'node': ['node', '--version'],
+            'ffmpeg': ['ffmpeg', '-version']
+        })
+        
         # Node.js
         try:
-            node_version = subprocess.run(['node', '--version'], 
-                                        capture_output=True, text=True)
-            if node_version.returncode == 0:
+            node_version = probes['node']
+            if node_version is not None and node_version.returncode == 0:
                 print_status(f"Node.js {node_version.stdout.strip()} found", "success")
                 self.successes.append(f"Node.js: {node_version.stdout.strip()}")
             else:
@@ -138,9 +306,8 @@ class RumiAIBootstrap:
         
         # FFmpeg
         try:
-            ffmpeg_check = subprocess.run(['ffmpeg', '-version'], 
-                                        capture_output=True, text=True)
-            if ffmpeg_check.returncode == 0:
+            ffmpeg_check = probes['ffmpeg']
+            if ffmpeg_check is not None and ffmpeg_check.returncode == 0:
                 print_status("FFmpeg found", "success")
                 self.successes.append("FFmpeg installed")
             else:
@@ -161,30 +328,38 @@ class RumiAIBootstrap:
             self.warnings.append(f"Python {python_version.major}.{python_version.minor} may have compatibility issues")
         
         # Check if venv exists
+        venv_cache = None
         if not self.venv_path.exists():
             print_status("Creating virtual environment...")
             
-            # Try to find Python 3.11 first
+            # Try to find Python 3.11 first. A python3.11 on PATH needs no
+            # probe; otherwise the candidates found on PATH are probed in parallel.
             python_cmd = None
-            for cmd in ['python3.11', 'python3', sys.executable]:
-                try:
-                    result = subprocess.run([cmd, '--version'], 
-                                          capture_output=True, text=True)
-                    if result.returncode == 0:
-                        version_output = result.stdout.strip()
-                        if 'python3.11' in cmd or '3.11' in version_output:
-                            python_cmd = cmd
-                            print_status(f"Using {cmd} for virtual environment", "info")
-                            break
-                        elif python_cmd is None:
-                            python_cmd = cmd  # Fallback to any available Python
-                except:
-                    continue
+            candidates = [cmd for cmd in ('python3', sys.executable) if shutil.which(cmd)]
+            if shutil.which('python3.11'):
+                candidates = []
+                python_cmd = 'python3.11'
+                print_status(f"Using {python_cmd} for virtual environment", "info")
+            probes = probe_commands({cmd: [cmd, '--version'] for cmd in candidates})
+            for cmd in candidates:
+                result = probes[cmd]
+                if result is not None and result.returncode == 0:
+                    if python_version_tuple(result.stdout) == (3, 11):
+                        python_cmd = cmd
+                        print_status(f"Using {cmd} for virtual environment", "info")
+                        break
+                    elif python_cmd is None:
+                        python_cmd = cmd  # Fallback to any available Python
             
             if python_cmd is None:
                 print_status("No suitable Python found", "error")
                 self.errors.append("Could not find Python interpreter")
                 return
+            
+            # Reuse a venv built earlier for this Python + requirements
+            venv_cache = self.get_venv_cache_path(python_cmd)
+            if venv_cache is not None and self.restore_cached_venv(venv_cache, python_cmd):
+                return
                 
             try:
                 subprocess.run([python_cmd, '-m', 'venv', str(self.venv_path)], 
@@ -200,6 +375,7 @@ class RumiAIBootstrap:
             self.successes.append("Python venv exists")
         
         # Install requirements
+        requirements_installed = False
         pip_path = self.venv_path / "bin" / "pip"
         python_exec = self.venv_path / "bin" / "python"
         
@@ -208,14 +384,21 @@ class RumiAIBootstrap:
             python_exec = self.venv_path / "Scripts" / "python.exe"
         
         # Check Python version in venv and select appropriate requirements
-        requirements_path = self.root_dir / "requirements.txt"
-        requirements_py312_path = self.root_dir / "requirements_py312.txt"
+        requirements_path = self.requirements_path
+        requirements_py312_path = self.requirements_py312_path
         
         try:
-            # Get venv Python version
-            version_result = subprocess.run([str(python_exec), '--version'], 
-                                          capture_output=True, text=True)
-            if version_result.returncode == 0 and '3.12' in version_result.stdout:
+            # Get venv Python version from pyvenv.cfg rather than starting it
+            pyvenv_cfg = self.venv_path / "pyvenv.cfg"
+            match = PYVENV_VERSION.search(pyvenv_cfg.read_text()) if pyvenv_cfg.exists() else None
+            if match:
+                venv_version = (int(match.group(1)), int(match.group(2)))
+            else:
+                version_result = probe((str(python_exec), '--version'))
+                venv_version = None
+                if version_result is not None and version_result.returncode == 0:
+                    venv_version = python_version_tuple(version_result.stdout)
+            if venv_version == (3, 12):
                 # Either fix existing or generate new requirements_py312.txt
                 if not requirements_py312_path.exists():
                     print_status("Python 3.12 detected, generating compatible requirements", "info")
@@ -234,33 +417,82 @@ class RumiAIBootstrap:
             pass
         
         if requirements_path.exists():
+            # Skip pip entirely when the venv already has every pinned version and CLIP
+            verifier = self.setup_dir / "_verify_installed.py"
+            try:
+                check = subprocess.run([str(python_exec), str(verifier), str(requirements_path), 'clip'],
+                                     capture_output=True, text=True)
+                if check.returncode == 0:
+                    print_status("Python packages already installed, skipping pip", "success")
+                    self.successes.append("Python requirements already satisfied")
+                    return
+            except OSError:
+                pass
+            
             print_status("Installing Python packages (this may take a few minutes)...")
             try:
-                # Upgrade pip first
-                subprocess.run([str(pip_path), 'install', '--upgrade', 'pip'], 
-                             check=True, capture_output=True)
+                # Upgrade pip first, unless it is already recent enough
+                pip_version = subprocess.run([str(pip_path), '--version'],
+                                           capture_output=True, text=True).stdout
+                match = re.search(r'pip (\d+)\.(\d+)', pip_version)
+                if match and (int(match.group(1)), int(match.group(2))) >= MIN_PIP_VERSION:
+                    print_status(f"pip {match.group(1)}.{match.group(2)} is up to date, skipping upgrade", "info")
+                else:
+                    print_status("Upgrading pip...", "info")
+                    subprocess.run([str(pip_path), 'install', '--upgrade', 'pip'], 
+                                 check=True, capture_output=True)
                 
-                # Install requirements
-                result = subprocess.run([str(pip_path), 'install', '-r', str(requirements_path)], 
-                                      capture_output=True, text=True)
-                if result.returncode == 0:
+                # Install requirements, offline from the wheelhouse when it
+                # already holds this requirements file's wheels
+                wheel_marker = self.wheel_cache / f".{hashlib.sha256(requirements_path.read_bytes()).hexdigest()[:16]}"
+                output = clip_output = ""
+                clip_returncode = None
+                if wheel_marker.exists():
+                    print_status("Installing Python packages from local wheel cache...")
+                    returncode, output = run_streamed([str(pip_path), 'install', '--no-index',
+                                                     '--find-links', str(self.wheel_cache),
+                                                     '-r', str(requirements_path)], prefix='pip')
+                    requirements_installed = returncode == 0
+                    if not requirements_installed:
+                        print_status("Wheel cache incomplete, installing from PyPI", "warning")
+                if not requirements_installed:
+                    # Requirements and CLIP in one pip run (one startup, one
+                    # resolve); on failure, retry separately to see which broke
+                    print_status("Installing requirements and CLIP from GitHub...")
+                    returncode, output = run_streamed([str(pip_path), 'install', '-r', str(requirements_path),
+                                                     CLIP_REQUIREMENT], prefix='pip')
+                    if returncode == 0:
+                        requirements_installed = True
+                        clip_returncode, clip_output = returncode, output
+                    else:
+                        print_status("Combined install failed, retrying requirements and CLIP separately", "warning")
+                        returncode, output = run_streamed([str(pip_path), 'install', '-r', str(requirements_path)],
+                                                        prefix='pip')
+                        requirements_installed = returncode == 0
+                    if requirements_installed:
+                        self.save_wheel_cache(pip_path, requirements_path, wheel_marker)
+                if requirements_installed:
                     print_status("Python packages installed successfully", "success")
                     self.successes.append("Python requirements installed")
                 else:
-                    print_status(f"Package installation failed: {result.stderr}", "error")
+                    print_status(f"Package installation failed: {output}", "error")
                     self.errors.append("Failed to install Python packages")
                     
                 # Always try to install CLIP regardless of main package status
-                print_status("Installing CLIP from GitHub...")
-                clip_result = subprocess.run([str(pip_path), 'install', 
-                                            'git+https://github.com/openai/CLIP.git'],
-                                           capture_output=True, text=True)
-                if clip_result.returncode == 0:
+                if clip_returncode is None:
+                    print_status("Installing CLIP from GitHub...")
+                    clip_returncode, clip_output = run_streamed([str(pip_path), 'install', CLIP_REQUIREMENT],
+                                                              prefix='pip')
+                if clip_returncode == 0:
                     print_status("CLIP installed successfully", "success")
                     self.successes.append("CLIP installed from GitHub")
                 else:
-                    print_status(f"Failed to install CLIP: {clip_result.stderr}", "warning")
+                    print_status(f"Failed to install CLIP: {clip_output}", "warning")
                     self.warnings.append("CLIP installation failed - may need manual installation")
+                    self.clip_failed = True
+                
+                if venv_cache is not None and requirements_installed:
+                    self.save_venv_cache(venv_cache)
             except Exception as e:
                 print_status(f"Failed to install packages: {e}", "error")
                 self.errors.append(f"Python package installation error: {e}")
@@ -268,6 +500,103 @@ class RumiAIBootstrap:
             print_status("requirements.txt not found", "error")
             self.errors.append("requirements.txt missing")
     
+    def get_venv_cache_path(self, python_cmd):
+        """Cache directory for a venv built with python_cmd and the current requirements"""
+        try:
+            result = probe((python_cmd, '-c', 'import platform; print(platform.python_version())'))
+            if result is None or result.returncode != 0:
+                return None
+            py_version = result.stdout.strip()
+            
+            # Patch version is part of the key so ABI changes force a rebuild
+            digest = hashlib.sha256(py_version.encode())
+            for req_path in (self.requirements_path, self.requirements_py312_path):
+                if req_path.exists():
+                    digest.update(req_path.read_bytes())
+            return self.venv_cache_root / f"py{py_version}-{digest.hexdigest()[:16]}"
+        except Exception:
+            return None
+    
+    def venv_python(self, venv_path):
+        """Python executable inside a venv"""
+        python_exec = venv_path / "bin" / "python"
+        if not python_exec.exists():
+            python_exec = venv_path / "Scripts" / "python.exe"  # Windows fallback
+        return python_exec
+    
+    def restore_cached_venv(self, venv_cache, python_cmd):
+        """Copy a cached venv into place; returns False if there is no usable cache"""
+        origin_file = venv_cache / ".rumiai_origin"
+        if not origin_file.exists():
+            return False
+        
+        # Reject broken caches (e.g. base interpreter removed)
+        check = subprocess.run([str(self.venv_python(venv_cache)), '-c', 'import sys'],
+                               capture_output=True)
+        if check.returncode != 0:
+            print_status("Cached virtual environment is broken, rebuilding", "warning")
+            shutil.rmtree(venv_cache, ignore_errors=True)
+            return False
+        
+        print_status(f"Restoring cached virtual environment from {venv_cache}...")
+        try:
+            shutil.copytree(venv_cache, self.venv_path, symlinks=True)
+            (self.venv_path / ".rumiai_origin").unlink()
+            
+            # Scripts and activation files hard-code the venv location
+            subprocess.run([python_cmd, '-m', 'venv', '--upgrade', str(self.venv_path)], check=True)
+            old_path = origin_file.read_text().strip().encode()
+            new_path = str(self.venv_path.resolve()).encode()
+            if old_path != new_path:
+                for bin_dir in (self.venv_path / "bin", self.venv_path / "Scripts"):
+                    if not bin_dir.is_dir():
+                        continue
+                    for script in bin_dir.iterdir():
+                        if script.is_symlink() or not script.is_file():
+                            continue
+                        content = script.read_bytes()
+                        if old_path in content:
+                            script.write_bytes(content.replace(old_path, new_path))
+        except Exception as e:
+            print_status(f"Could not restore cached venv: {e}", "warning")
+            shutil.rmtree(self.venv_path, ignore_errors=True)
+            return False
+        
+        print_status("Virtual environment restored from cache, skipping package install", "success")
+        self.successes.append("Python venv restored from cache")
+        return True
+    
+    def save_venv_cache(self, venv_cache):
+        """Store the freshly installed venv for later bootstraps"""
+        if venv_cache.exists():
+            return
+        tmp_path = venv_cache.with_name(venv_cache.name + f".tmp{os.getpid()}")
+        try:
+            shutil.copytree(self.venv_path, tmp_path, symlinks=True)
+            (tmp_path / ".rumiai_origin").write_text(str(self.venv_path.resolve()))
+            os.replace(tmp_path, venv_cache)
+            print_status(f"Cached virtual environment at {venv_cache}", "info")
+        except Exception as e:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            print_status(f"Could not cache virtual environment: {e}", "warning")
+            self.warnings.append(f"Could not cache Python venv: {e}")
+    
+    def save_wheel_cache(self, pip_path, requirements_path, wheel_marker):
+        """Download wheels for requirements_path into the wheelhouse for offline reinstalls"""
+        print_status(f"Caching wheels in {self.wheel_cache}...")
+        try:
+            self.wheel_cache.mkdir(parents=True, exist_ok=True)
+            # Served from pip's HTTP cache after the install that just ran
+            result = subprocess.run([str(pip_path), 'download', '-r', str(requirements_path),
+                                   '-d', str(self.wheel_cache)],
+                                  capture_output=True, text=True)
+            if result.returncode == 0:
+                wheel_marker.touch()
+            else:
+                print_status("Could not cache wheels; next install will use PyPI", "warning")
+        except Exception as e:
+            print_status(f"Could not cache wheels: {e}", "warning")
+    
     def setup_node_environment(self):
         """Setup Node.js dependencies"""
         print_status("Setting up Node.js environment...")
@@ -286,14 +615,13 @@ class RumiAIBootstrap:
         else:
             print_status("Installing Node.js packages...")
             try:
-                result = subprocess.run(['npm', 'install'], 
-                                      cwd=str(self.root_dir),
-                                      capture_output=True, text=True)
-                if result.returncode == 0:
+                returncode, output = run_streamed(['npm', 'install'], cwd=str(self.root_dir),
+                                                prefix='npm')
+                if returncode == 0:
                     print_status("Node.js packages installed successfully", "success")
                     self.successes.append("Node modules installed")
                 else:
-                    print_status(f"npm install failed: {result.stderr}", "error")
+                    print_status(f"npm install failed: {output}", "error")
                     self.errors.append("Failed to install Node modules")
             except Exception as e:
                 print_status(f"Failed to run npm install: {e}", "error")
@@ -303,7 +631,7 @@ class RumiAIBootstrap:
         """Validate .env file and environment variables"""
         print_status("Validating environment variables...")
         
-        env_path = self.root_dir / ".env"
+        env_path = self.env_path
         env_example_path = self.root_dir / ".env.example"
         
         # Create .env.example if it doesn't exist
@@ -334,13 +662,7 @@ CLAUDE_API_URL=https://api.anthropic.com/v1/messages
             return
         
         # Load and validate .env
-        env_vars = {}
-        with open(env_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    env_vars[key.strip()] = value.strip()
+        env_vars = self.load_env_vars(env_path)
         
         # Check required variables
         required_vars = ['ANTHROPIC_API_KEY', 'APIFY_TOKEN']
@@ -355,30 +677,35 @@ CLAUDE_API_URL=https://api.anthropic.com/v1/messages
                 print_status(f"{var} configured", "success")
                 self.successes.append(f"{var} configured")
     
+    def load_env_vars(self, env_path):
+        """Parse KEY=value lines from a .env file, cached until the file changes"""
+        mtime_ns = env_path.stat().st_mtime_ns
+        if self._env_cache is not None and self._env_cache[0] == mtime_ns:
+            return self._env_cache[1]
+        
+        env_vars = {key: value.strip() for key, value in ENV_LINE.findall(env_path.read_text())}
+        self._env_cache = (mtime_ns, env_vars)
+        return env_vars
+    
     def verify_prompt_templates(self):
         """Verify all required prompt templates exist"""
         print_status("Verifying prompt templates...")
         
-        templates_dir = self.root_dir / "prompt_templates"
-        required_templates = [
-            'creative_density.txt',
-            'emotional_journey.txt',
-            'metadata_analysis.txt',
-            'person_framing.txt',
-            'scene_pacing.txt',
-            'speech_analysis.txt',
-            'visual_overlay_analysis.txt'
-        ]
+        templates_dir = self.templates_dir
+        required_templates = REQUIRED_TEMPLATES
         
-        if not templates_dir.exists():
+        # One directory read instead of a stat per template
+        try:
+            with os.scandir(templates_dir) as entries:
+                present = {entry.name for entry in entries if entry.is_file()}
+        except (FileNotFoundError, NotADirectoryError):
             print_status("prompt_templates directory not found", "error")
             self.errors.append("prompt_templates directory missing")
             return
         
         missing_templates = []
         for template in required_templates:
-            template_path = templates_dir / template
-            if template_path.exists():
+            if template in present:
                 print_status(f"Found {template}", "success")
             else:
                 print_status(f"Missing {template}", "error")
@@ -402,10 +729,14 @@ CLAUDE_API_URL=https://api.anthropic.com/v1/messages
         
         for cache_dir, model_name in cache_dirs:
             try:
-                cache_dir.mkdir(parents=True, exist_ok=True)
-                test_file = cache_dir / ".write_test"
-                test_file.touch()
-                test_file.unlink()
+                # Existing directories only need the permission check; mkdir
+                # is left for the first run
+                if not os.access(cache_dir, os.W_OK | os.X_OK):
+                    if cache_dir.exists():
+                        raise PermissionError(f"no write permission for {cache_dir}")
+                    cache_dir.mkdir(parents=True, exist_ok=True)
+                    if not os.access(cache_dir, os.W_OK | os.X_OK):
+                        raise PermissionError(f"no write permission for {cache_dir}")
                 print_status(f"{model_name} cache directory is writable", "success")
                 self.successes.append(f"{model_name} cache writable")
             except Exception as e:
@@ -425,31 +756,22 @@ CLAUDE_API_URL=https://api.anthropic.com/v1/messages
                     return True
             
             # Fallback: create manually
-            requirements_path = self.root_dir / "requirements.txt"
+            requirements_path = self.requirements_path
             if not requirements_path.exists():
                 return False
                 
             with open(requirements_path, 'r') as f:
                 content = f.read()
             
-            # Apply Python 3.12 compatible versions
-            replacements = [
-                ('torch==2.1.0', 'torch==2.2.0'),
-                ('torchvision==0.16.0', 'torchvision==0.17.0'),
-                ('numpy==1.24.3', 'numpy==1.26.4'),
-                ('mediapipe==0.10.8', 'mediapipe==0.10.14'),
-                ('ultralytics==8.0.200', 'ultralytics==8.3.0'),
-            ]
-            
             # Add setuptools for Python 3.12 (required by deep-sort-realtime)
             if '# Python 3.12 compatibility' not in content:
                 content = "# Python 3.12 compatibility\nsetuptools>=68.0.0\n\n" + content
             
-            for old_ver, new_ver in replacements:
-                content = content.replace(old_ver, new_ver)
+            # Apply Python 3.12 compatible versions
+            content, _ = py312_patches.patch(content, note=PY312_NOTE)
             
             # Write requirements_py312.txt
-            output_path = self.root_dir / "requirements_py312.txt"
+            output_path = self.requirements_py312_path
             with open(output_path, 'w') as f:
                 f.write(content)
             
@@ -465,38 +787,33 @@ CLAUDE_API_URL=https://api.anthropic.com/v1/messages
     def fix_python312_requirements(self, requirements_path):
         """Fix incompatible package versions in requirements_py312.txt"""
         try:
-            with open(requirements_path, 'r') as f:
+            # One handle for the read and, only if needed, the rewrite
+            with open(requirements_path, 'r+', encoding='utf-8') as f:
                 content = f.read()
-            
-            original_content = content
-            
-            # Fix known incompatible versions
-            replacements = [
-                ('torch==2.1.0', 'torch==2.2.0'),
-                ('torchvision==0.16.0', 'torchvision==0.17.0'),
-                ('numpy==1.24.3', 'numpy==1.26.4'),
-                ('mediapipe==0.10.8', 'mediapipe==0.10.14'),
-                ('ultralytics==8.0.200', 'ultralytics==8.3.0'),
-            ]
-            
-            for old_ver, new_ver in replacements:
-                if old_ver in content:
-                    content = content.replace(old_ver, new_ver)
+                
+                # Fix known incompatible versions
+                content, patched = py312_patches.patch(content, note=PY312_NOTE)
+                for old_ver, new_ver in patched:
                     print_status(f"Updated {old_ver} to {new_ver}", "info")
-            
-            # Ensure setuptools is present for Python 3.12
-            if 'setuptools' not in content:
-                # Add after the core dependencies comment if it exists
-                if '# Core dependencies' in content:
-                    content = content.replace('# Core dependencies', '# Core dependencies\nsetuptools>=68.0.0  # Required for pkg_resources in Python 3.12')
-                else:
-                    content = "setuptools>=68.0.0  # Required for pkg_resources in Python 3.12\n\n" + content
-                print_status("Added setuptools for Python 3.12 compatibility", "info")
-            
-            # Only write if changes were made
-            if content != original_content:
-                with open(requirements_path, 'w') as f:
+                changed = bool(patched)
+                
+                # Ensure setuptools is present for Python 3.12
+                if 'setuptools' not in content:
+                    # Add after the core dependencies comment if it exists
+                    if '# Core dependencies' in content:
+                        content = content.replace('# Core dependencies', '# Core dependencies\nsetuptools>=68.0.0  # Required for pkg_resources in Python 3.12')
+                    else:
+                        content = "setuptools>=68.0.0  # Required for pkg_resources in Python 3.12\n\n" + content
+                    print_status("Added setuptools for Python 3.12 compatibility", "info")
+                    changed = True
+                
+                # Only write if changes were made
+                if changed:
+                    f.seek(0)
                     f.write(content)
+                    f.truncate()
+            
+            if changed:
                 print_status("Fixed Python 3.12 compatibility issues in requirements", "success")
                 self.successes.append("Fixed Python 3.12 requirements")
         except Exception as e:
@@ -544,7 +861,7 @@ CLAUDE_API_URL=https://api.anthropic.com/v1/messages
         """Generate setup report"""
         print_status("Generating setup report...")
         
-        report_content = f"""RumiAI Setup Report
+        parts = [f"""RumiAI Setup Report
 Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 {'='*60}
 
@@ -556,37 +873,37 @@ SUMMARY
 
 SUCCESSES
 ---------
-"""
-        for success in self.successes:
-            report_content += f"✅ {success}\n"
+"""]
+        parts.extend(f"✅ {success}\n" for success in self.successes)
         
         if self.warnings:
-            report_content += "\nWARNINGS\n--------\n"
-            for warning in self.warnings:
-                report_content += f"⚠️  {warning}\n"
+            parts.append("\nWARNINGS\n--------\n")
+            parts.extend(f"⚠️  {warning}\n" for warning in self.warnings)
         
         if self.errors:
-            report_content += "\nERRORS\n------\n"
-            for error in self.errors:
-                report_content += f"❌ {error}\n"
+            parts.append("\nERRORS\n------\n")
+            parts.extend(f"❌ {error}\n" for error in self.errors)
         
-        report_content += f"\n{'='*60}\n"
+        parts.append(f"\n{'='*60}\n")
         
         if self.errors:
-            report_content += """
+            parts.append("""
 NEXT STEPS
 ----------
 1. Fix the errors listed above
 2. Run this script again to verify fixes
 3. Once all errors are resolved, run: python setup/verify_setup.py
-"""
+""")
         else:
-            report_content += """
+            parts.append("""
 NEXT STEPS
 ----------
 1. Run verification: python setup/verify_setup.py
 2. Start the service: node test_rumiai_complete_flow.js
-"""
+""")
+        
+        # Joined once; the same text is written and echoed
+        report_content = ''.join(parts)
         
         with open(self.report_path, 'w') as f:
             f.write(report_content)
@@ -595,6 +912,13 @@ NEXT STEPS
         print("\n" + report_content)
 
 if __name__ == "__main__":
-    bootstrap = RumiAIBootstrap()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Prepare a RumiAI checkout for first run')
+    parser.add_argument('--force', action='store_true',
+                        help='Re-run every setup step, even if its inputs are unchanged')
+    args = parser.parse_args()
+    
+    bootstrap = RumiAIBootstrap(force=args.force)
     success = bootstrap.run()
     sys.exit(0 if success else 1)
\ No newline at end of file
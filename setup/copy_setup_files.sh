@@ -28,6 +28,9 @@ cp "$SCRIPT_DIR/requirements_check.py" "$TARGET_DIR/setup/" && echo "✅ Copied
 cp "$SCRIPT_DIR/verify_setup.py" "$TARGET_DIR/setup/" && echo "✅ Copied verify_setup.py"
 cp "$SCRIPT_DIR/setup_helper.py" "$TARGET_DIR/setup/" && echo "✅ Copied setup_helper.py"
 cp "$SCRIPT_DIR/generate_py312_requirements.py" "$TARGET_DIR/setup/" && echo "✅ Copied generate_py312_requirements.py"
+cp "$SCRIPT_DIR/py312_patches.py" "$TARGET_DIR/setup/" && echo "✅ Copied py312_patches.py"
+cp "$SCRIPT_DIR/_verify_installed.py" "$TARGET_DIR/setup/" && echo "✅ Copied _verify_installed.py"
+cp "$SCRIPT_DIR/_probe_cache.py" "$TARGET_DIR/setup/" && echo "✅ Copied _probe_cache.py"
 cp "$SCRIPT_DIR/README.md" "$TARGET_DIR/setup/" && echo "✅ Copied setup README.md"
 
 # Copy requirements files
@@ -6,15 +6,7 @@ Generate Python 3.12 compatible requirements file
 import sys
 from pathlib import Path
 
-# Python 3.12 compatible versions
-PY312_VERSIONS = {
-    'torch': '2.2.0',
-    'torchvision': '0.17.0',
-    'numpy': '1.26.4',
-    'mediapipe': '0.10.14',
-    'ultralytics': '8.3.0',
-    'scipy': '1.11.4',  # This version works with Python 3.12
-}
+from py312_patches import patch
 
 def generate_py312_requirements():
     """Generate a Python 3.12 compatible requirements file"""
@@ -46,31 +38,19 @@ def generate_py312_requirements():
     for line in lines:
         line = line.strip()
         
-        # Skip empty lines and comments
-        if not line or line.startswith('#'):
-            if skip_next_core_deps and line == '# Core dependencies':
-                skip_next_core_deps = False
-                continue  # Skip this line as we already added it
-            new_lines.append(line)
+        # Skip the original "# Core dependencies" line, as we already added it
+        if skip_next_core_deps and line == '# Core dependencies':
+            skip_next_core_deps = False
             continue
-        
-        # Check if this package needs version update
-        updated = False
-        for package, new_version in PY312_VERSIONS.items():
-            if line.startswith(f'{package}=='):
-                new_lines.append(f'{package}=={new_version}')
-                if 'Updated for Python 3.12' not in line:
-                    new_lines[-1] += '  # Updated for Python 3.12 compatibility'
-                updated = True
-                break
-        
-        if not updated:
-            new_lines.append(line)
+        new_lines.append(line)
+    
+    # Update package versions in one pass
+    content, _ = patch('\n'.join(new_lines), note='Updated for Python 3.12 compatibility')
     
     # Write new requirements_py312.txt
     output_path = Path(__file__).parent.parent / 'requirements_py312.txt'
     with open(output_path, 'w') as f:
-        f.write('\n'.join(new_lines))
+        f.write(content)
     
     print(f"✅ Generated {output_path}")
     return True
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Python 3.12 compatible package versions, shared by bootstrap.py and
+generate_py312_requirements.py
+"""
+
+import re
+
+# Python 3.12 compatible versions
+PY312_VERSIONS = {
+    'torch': '2.2.0',
+    'torchvision': '0.17.0',
+    'numpy': '1.26.4',
+    'mediapipe': '0.10.14',
+    'ultralytics': '8.3.0',
+    'scipy': '1.11.4',  # This version works with Python 3.12
+}
+
+# "package==version" at the start of a requirements line, plus anything after it
+PATCH_RE = re.compile(
+    r'^(?P<package>' + '|'.join(map(re.escape, PY312_VERSIONS)) + r')==(?P<version>[^\s#;]+)(?P<rest>.*)$',
+    re.M
+)
+
+def patch(content, note=None):
+    """
+    Pin every PY312_VERSIONS package to its Python 3.12 version in one pass.
+
+    Lines that are rewritten get "  # <note>" appended unless they already
+    mention it. Returns (content, [(old_pin, new_pin), ...]).
+    """
+    changes = []
+
+    def replace(match):
+        package, version, rest = match.group('package', 'version', 'rest')
+        new_version = PY312_VERSIONS[package]
+        if version == new_version:
+            return match.group(0)
+        changes.append((f"{package}=={version}", f"{package}=={new_version}"))
+        if note and note not in rest:
+            rest = f"{rest}  # {note}"
+        return f"{package}=={new_version}{rest}"
+
+    return PATCH_RE.sub(replace, content), changes
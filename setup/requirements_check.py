@@ -3,26 +3,56 @@
 System requirements checker for RumiAI
 """
 
-import os
 import sys
-import subprocess
+import json
+import ctypes
 import shutil
-import platform
+import socket
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+from _probe_cache import run_version
+
+# Result keys in the order check_all runs and reports them
+RESULT_ORDER = ('Python', 'Node.js', 'FFmpeg', 'Disk Space', 'Internet', 'Git', 'CUDA/GPU')
+
+# CUDA driver library names on Linux and Windows
+CUDA_DRIVER_LIBS = ('libcuda.so.1', 'libcuda.so', 'nvcuda.dll')
+
+def cuda_driver_available():
+    """True if the NVIDIA driver loads and cuInit succeeds (in-process, no nvidia-smi)"""
+    for name in CUDA_DRIVER_LIBS:
+        try:
+            driver = ctypes.CDLL(name)
+        except OSError:
+            continue
+        return driver.cuInit(0) == 0  # CUDA_SUCCESS
+    return False
+
 class SystemChecker:
     def __init__(self):
         self.results = {}
         
     def check_all(self):
         """Run all system checks"""
-        self.check_python_version()
-        self.check_nodejs()
-        self.check_ffmpeg()
-        self.check_disk_space()
-        self.check_internet_connection()
-        self.check_git()
-        self.check_cuda()  # Optional for GPU acceleration
+        checks = [
+            self.check_python_version,
+            self.check_nodejs,
+            self.check_ffmpeg,
+            self.check_disk_space,
+            self.check_internet_connection,
+            self.check_git,
+            self.check_cuda  # Optional for GPU acceleration
+        ]
+        
+        # Checks are independent and mostly wait on subprocesses, so run them
+        # together; each writes its own key in self.results
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for future in as_completed([executor.submit(check) for check in checks]):
+                future.result()
+        
+        # Report in the fixed check order, not completion order
+        self.results = {key: self.results[key] for key in RESULT_ORDER if key in self.results}
         return self.results
     
     def check_python_version(self):
@@ -45,17 +75,15 @@ class SystemChecker:
         """Check Node.js installation and version"""
         try:
             # Check node
-            node_result = subprocess.run(['node', '--version'], 
-                                       capture_output=True, text=True)
-            if node_result.returncode != 0:
+            node_result = run_version(('node', '--version'))
+            if node_result is None or node_result.returncode != 0:
                 raise Exception("Node not found")
             
             node_version = node_result.stdout.strip()
             
             # Check npm
-            npm_result = subprocess.run(['npm', '--version'], 
-                                      capture_output=True, text=True)
-            if npm_result.returncode != 0:
+            npm_result = run_version(('npm', '--version'))
+            if npm_result is None or npm_result.returncode != 0:
                 raise Exception("npm not found")
             
             npm_version = npm_result.stdout.strip()
@@ -82,9 +110,8 @@ class SystemChecker:
     def check_ffmpeg(self):
         """Check FFmpeg installation"""
         try:
-            result = subprocess.run(['ffmpeg', '-version'], 
-                                  capture_output=True, text=True)
-            if result.returncode == 0:
+            result = run_version(('ffmpeg', '-version'))
+            if result is not None and result.returncode == 0:
                 # Extract version
                 version_line = result.stdout.split('\n')[0]
                 self.results['FFmpeg'] = {
@@ -104,12 +131,11 @@ class SystemChecker:
         try:
             # Get disk usage for home directory
             home_path = Path.home()
-            stat = os.statvfs(home_path)
+            usage = shutil.disk_usage(home_path)  # also works on Windows, unlike statvfs
             
             # Calculate free space in GB
-            free_gb = (stat.f_bavail * stat.f_frsize) / (1024 ** 3)
-            total_gb = (stat.f_blocks * stat.f_frsize) / (1024 ** 3)
-            used_percent = ((total_gb - free_gb) / total_gb) * 100
+            free_gb = usage.free / (1024 ** 3)
+            used_percent = usage.used * 100 / usage.total
             
             if free_gb >= 10:
                 self.results['Disk Space'] = {
@@ -135,22 +161,15 @@ class SystemChecker:
     def check_internet_connection(self):
         """Check internet connectivity"""
         try:
-            # Try to reach common DNS servers
-            if platform.system() == "Windows":
-                result = subprocess.run(['ping', '-n', '1', '8.8.8.8'], 
-                                      capture_output=True)
-            else:
-                result = subprocess.run(['ping', '-c', '1', '8.8.8.8'], 
-                                      capture_output=True)
-            
-            if result.returncode == 0:
-                self.results['Internet'] = {
-                    'status': 'success',
-                    'message': 'Connected (required for model downloads)'
-                }
-            else:
-                raise Exception()
-        except:
+            # Try to reach a common DNS server over TCP; unlike ping this
+            # needs no raw-socket privileges and returns after one handshake
+            with socket.create_connection(('8.8.8.8', 53), timeout=1.5):
+                pass
+            self.results['Internet'] = {
+                'status': 'success',
+                'message': 'Connected (required for model downloads)'
+            }
+        except OSError:
             self.results['Internet'] = {
                 'status': 'warning',
                 'message': 'No connection detected (required for initial setup)'
@@ -159,9 +178,8 @@ class SystemChecker:
     def check_git(self):
         """Check Git installation"""
         try:
-            result = subprocess.run(['git', '--version'], 
-                                  capture_output=True, text=True)
-            if result.returncode == 0:
+            result = run_version(('git', '--version'))
+            if result is not None and result.returncode == 0:
                 version = result.stdout.strip()
                 self.results['Git'] = {
                     'status': 'success',
@@ -178,10 +196,8 @@ class SystemChecker:
     def check_cuda(self):
         """Check CUDA availability for GPU acceleration"""
         try:
-            # First check if nvidia-smi exists
-            nvidia_result = subprocess.run(['nvidia-smi'], 
-                                         capture_output=True, text=True)
-            if nvidia_result.returncode == 0:
+            # First check for a working NVIDIA driver
+            if cuda_driver_available():
                 # Try to import torch and check CUDA
                 try:
                     import torch
@@ -209,14 +225,23 @@ class SystemChecker:
                 'message': 'Not available (CPU mode will be used)'
             }
 
-def main():
-    """Run standalone system check"""
+def main(results_path=None):
+    """
+    Run standalone system check.
+    
+    If results_path is given, the results are also written there as JSON so
+    verify_setup.py --from-requirements can include them without re-checking.
+    """
     print("RumiAI System Requirements Check")
     print("=" * 60)
     
     checker = SystemChecker()
     results = checker.check_all()
     
+    if results_path:
+        with open(results_path, 'w') as f:
+            json.dump(results, f, indent=2)
+    
     # Print results
     for component, result in results.items():
         status_symbol = {
@@ -240,5 +265,5 @@ def main():
     return True
 
 if __name__ == "__main__":
-    success = main()
+    success = main(sys.argv[1] if len(sys.argv) > 1 else None)
     sys.exit(0 if success else 1)
\ No newline at end of file
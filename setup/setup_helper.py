@@ -5,10 +5,12 @@ Provides guidance for setting up RumiAI with the correct Python version.
 """
 
 import sys
-import subprocess
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from _probe_cache import run_version, which
+
 def check_python_versions():
     """Check available Python versions on the system"""
     print("🔍 Checking available Python versions...\n")
@@ -17,18 +19,23 @@ def check_python_versions():
     print(f"Current Python: {current_version}")
     
     # Check for other Python versions
+    # Only commands on PATH are probed (one cached PATH scan, no spawn), all at once
+    candidates = [(version, cmd)
+                  for version in ['3.11', '3.10', '3.9', '3.12']
+                  for cmd in [f'python{version}', f'python{version.replace(".", "")}']
+                  if which(cmd)]
+    with ThreadPoolExecutor(max_workers=len(candidates) or 1) as executor:
+        # An interpreter's version is fixed per binary, so no TTL
+        results = list(executor.map(lambda vc: run_version((vc[1], '--version'), ttl=None),
+                                    candidates))
+    
     versions_found = {}
-    for version in ['3.11', '3.10', '3.9', '3.12']:
-        for cmd in [f'python{version}', f'python{version.replace(".", "")}']:
-            try:
-                result = subprocess.run([cmd, '--version'], 
-                                      capture_output=True, text=True)
-                if result.returncode == 0:
-                    versions_found[version] = cmd
-                    print(f"✅ Python {version} found: {cmd}")
-                    break
-            except:
-                pass
+    for (version, cmd), result in zip(candidates, results):
+        if version in versions_found:
+            continue
+        if result is not None and result.returncode == 0:
+            versions_found[version] = cmd
+            print(f"✅ Python {version} found: {cmd}")
     
     if '3.11' not in versions_found and sys.version_info.minor >= 12:
         print("\n⚠️  Python 3.11 not found, but you have Python 3.12+")
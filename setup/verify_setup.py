@@ -8,13 +8,126 @@ import os
 import sys
 import subprocess
 import json
+import time
 import importlib
+import functools
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from datetime import datetime
+
+from _probe_cache import spawn
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Runs inside the venv Python. Takes a JSON list of [name, code, expr] and
+# prints one JSON line [name, ok, detail] per check, flushing as it goes so a
+# timeout or crash still leaves the earlier results readable.
+PROBE_SCRIPT = """
+import importlib.util, json, sys
+
+def installed(module):
+    if importlib.util.find_spec(module) is None:
+        raise ModuleNotFoundError(f"No module named {module!r}")
+
+for name, code, expr in json.loads(sys.argv[1]):
+    try:
+        scope = {'installed': installed}
+        exec(code, scope)
+        value = eval(expr, scope) if expr else None
+        print(json.dumps([name, True, None if value is None else str(value)]), flush=True)
+    except BaseException as e:
+        print(json.dumps([name, False, f"{type(e).__name__}: {e}"]), flush=True)
+"""
+
+# (module, display name) imports checked by test_python_packages
+CRITICAL_PACKAGES = (
+    ('numpy', 'NumPy'),
+    ('cv2', 'OpenCV'),
+    ('mediapipe', 'MediaPipe'),
+    ('torch', 'PyTorch'),
+    ('ultralytics', 'Ultralytics YOLO'),
+    ('whisper', 'OpenAI Whisper'),
+    ('anthropic', 'Anthropic SDK'),
+    ('dotenv', 'python-dotenv'),
+    ('moviepy.editor', 'MoviePy'),
+    ('easyocr', 'EasyOCR'),
+    ('scenedetect', 'PySceneDetect'),
+    ('PIL', 'Pillow'),
+    ('deep_sort_realtime', 'DeepSort')
+)
+
+# (module, distribution) versions reported after the imports; read from
+# installed metadata so the modules don't have to be imported
+VERSION_CHECKS = (
+    ('torch', 'torch'),
+    ('ultralytics', 'ultralytics'),
+    ('mediapipe', 'mediapipe'),
+    ('whisper', 'openai-whisper')
+)
+
+# Node.js modules checked when package.json depends on them
+CRITICAL_NODE_MODULES = ('dotenv', 'axios', 'puppeteer')
+
+# (directory, description) pairs checked by test_directories
+CRITICAL_DIRS = (
+    ('prompt_templates', 'Prompt templates directory'),
+    ('venv', 'Python virtual environment'),
+    ('node_modules', 'Node.js modules'),
+)
+
+# Pure-Python packages only checked for presence (find_spec, no import side
+# effects); everything else must import cleanly, e.g. cv2 fails without libGL,
+# PIL without its compiled core and the ML packages in their own init (CUDA,
+# native libraries)
+PRESENCE_ONLY_PACKAGES = {'anthropic', 'dotenv'}
+
+# (name, code) model loading probes run by test_models
+MODEL_PROBES = [
+    ('YOLOv8', 'from ultralytics import YOLO'),
+    ('MediaPipe', 'import mediapipe as mp; mp.solutions.face_mesh'),
+    ('EasyOCR', 'import easyocr'),
+]
+
+# Presence-only stand-ins used unless --deep; importing easyocr sets up its
+# torch backend, which took long enough to need its own timeout
+SHALLOW_MODEL_PROBES = {
+    'EasyOCR': "installed('easyocr')"
+}
+
+def model_probes(deep):
+    """(name, code, expr) probes for test_models"""
+    return [(f'model:{name}', code if deep else SHALLOW_MODEL_PROBES.get(name, code), None)
+            for name, code in MODEL_PROBES]
+
+@functools.lru_cache(maxsize=2)
+def build_probes(deep):
+    """
+    Every import, version and model probe for one run_probes call.
+    
+    Built once per mode; test_models reads its results from the same run.
+    """
+    probes = [('import:CLIP', 'import clip; clip.available_models()', None)]
+    for module_name, display_name in CRITICAL_PACKAGES:
+        # easyocr's import is slow, so it is only imported with --deep
+        if module_name in PRESENCE_ONLY_PACKAGES or (not deep and module_name == 'easyocr'):
+            probes.append((f'import:{display_name}', f'installed({module_name!r})', None))
+        else:
+            probes.append((f'import:{display_name}', f'import {module_name}', None))
+    probes += [(f'version:{module}', 'from importlib.metadata import version', f'version({distribution!r})')
+               for module, distribution in VERSION_CHECKS]
+    probes += model_probes(deep)
+    return probes
+
+# One KEY=value assignment per line; comments and blank lines never match
+ENV_LINE = re.compile(r'^[ \t]*([A-Za-z_][A-Za-z0-9_.-]*)[ \t]*=(.*)$', re.M)
+
+# Upper bound for the whole probe run; cold imports of torch & co. are slow
+PROBE_TIMEOUT = 300
+
+# Venv interpreters importing probe batches side by side
+PROBE_WORKERS = 4
+
 # ANSI color codes
 class Colors:
     GREEN = '\033[92m'
@@ -24,24 +137,37 @@ class Colors:
     RESET = '\033[0m'
     BOLD = '\033[1m'
 
+# Everything in a status line except the timestamp and message
+STATUS_PREFIX = {
+    'success': f"{Colors.GREEN}✅ [",
+    'error': f"{Colors.RED}❌ [",
+    'warning': f"{Colors.YELLOW}⚠️  [",
+    'info': f"{Colors.BLUE}ℹ️  ["
+}
+HEADER_RULE = '=' * 60
+
+# [second, "HH:MM:SS"] for the last status line
+_timestamp_cache = [None, '']
+
+def status_timestamp():
+    """HH:MM:SS for the current second, formatted at most once per second"""
+    now = int(time.time())
+    if now != _timestamp_cache[0]:
+        _timestamp_cache[:] = [now, time.strftime("%H:%M:%S", time.localtime(now))]
+    return _timestamp_cache[1]
+
 def print_status(message, status="info"):
     """Print colored status messages"""
-    timestamp = datetime.now().strftime("%H:%M:%S")
-    if status == "success":
-        print(f"{Colors.GREEN}✅ [{timestamp}] {message}{Colors.RESET}")
-    elif status == "error":
-        print(f"{Colors.RED}❌ [{timestamp}] {message}{Colors.RESET}")
-    elif status == "warning":
-        print(f"{Colors.YELLOW}⚠️  [{timestamp}] {message}{Colors.RESET}")
-    elif status == "info":
-        print(f"{Colors.BLUE}ℹ️  [{timestamp}] {message}{Colors.RESET}")
-    elif status == "header":
-        print(f"\n{Colors.BOLD}{Colors.BLUE}{'='*60}")
-        print(f"{message}")
-        print(f"{'='*60}{Colors.RESET}\n")
+    if status == "header":
+        sys.stdout.write(f"\n{Colors.BOLD}{Colors.BLUE}{HEADER_RULE}\n{message}\n{HEADER_RULE}{Colors.RESET}\n\n")
+        return
+    prefix = STATUS_PREFIX.get(status)
+    if prefix is not None:
+        sys.stdout.write(f"{prefix}{status_timestamp()}] {message}{Colors.RESET}\n")
 
 class SetupVerifier:
-    def __init__(self):
+    def __init__(self, deep=False, requirements_results=None):
+        self.deep = deep
         self.root_dir = Path(__file__).parent.parent
         self.venv_path = self.root_dir / "venv"
         self.python_path = self.venv_path / "bin" / "python"
@@ -55,6 +181,14 @@ class SetupVerifier:
             'models': [],
             'directories': []
         }
+        self.probe_results = None  # {probe name: (ok, detail)} from run_probes
+        
+        # System checks already run by requirements_check.py; warnings are
+        # optional components, so only errors count as failures
+        if requirements_results:
+            system = [(component, result['status'] != 'error')
+                      for component, result in requirements_results.items()]
+            self.test_results = {'system_requirements': system, **self.test_results}
         
     def run(self):
         """Run all verification tests"""
@@ -83,93 +217,111 @@ class SetupVerifier:
         # Summary
         self.print_summary()
     
+    @functools.cached_property
+    def env_vars(self):
+        """KEY -> value from .env, parsed once; None if the file is missing"""
+        env_path = self.root_dir / ".env"
+        if not env_path.exists():
+            return None
+        return {key: value.strip() for key, value in ENV_LINE.findall(env_path.read_text())}
+    
+    @functools.cached_property
+    def package_json(self):
+        """Parsed package.json, loaded once; None if the file is missing"""
+        package_json_path = self.root_dir / "package.json"
+        if not package_json_path.exists():
+            return None
+        with open(package_json_path, 'r') as f:
+            return json.load(f)
+    
+    def run_probes(self, probes, timeout=PROBE_TIMEOUT, workers=PROBE_WORKERS):
+        """
+        Run (name, code, expr) probes in up to `workers` venv Python processes.
+        
+        Probes are dealt round-robin so the heavy imports (torch, mediapipe,
+        easyocr, ...) land in different interpreters and load concurrently.
+        Returns {name: (ok, detail)}. Probes that never reported (timeout or
+        interpreter crash) are left out so callers can tell them apart.
+        """
+        batches = [probes[i::workers] for i in range(min(workers, len(probes)))]
+        results = {}
+        with ThreadPoolExecutor(max_workers=max(len(batches), 1)) as executor:
+            futures = [executor.submit(self._run_probe_batch, batch, timeout) for batch in batches]
+            for future in as_completed(futures):
+                results.update(future.result())  # names are unique across batches
+        return results
+    
+    def _run_probe_batch(self, probes, timeout):
+        """
+        Run one batch of probes in a single venv Python process.
+        
+        The interpreter starts once and execs every probe in the batch, so
+        site/encodings setup and shared imports (torch under ultralytics and
+        easyocr) are paid once per batch rather than once per probe.
+        """
+        try:
+            result = spawn(str(self.python_path), ['-c', PROBE_SCRIPT, json.dumps(probes)], timeout)
+            stdout = result.stdout
+        except subprocess.TimeoutExpired as e:
+            stdout = e.stdout or ''
+            if isinstance(stdout, bytes):
+                stdout = stdout.decode(errors='replace')
+        except Exception as e:
+            print_status(f"Probe run failed: {e}", "error")
+            return {}
+        
+        results = {}
+        for line in stdout.splitlines():
+            try:
+                name, ok, detail = json.loads(line)
+            except ValueError:
+                continue  # stray output printed by an imported package
+            results[name] = (ok, detail)
+        return results
+    
     def test_python_packages(self):
         """Test Python package imports"""
-        critical_packages = [
-            ('numpy', 'NumPy'),
-            ('cv2', 'OpenCV'),
-            ('mediapipe', 'MediaPipe'),
-            ('torch', 'PyTorch'),
-            ('ultralytics', 'Ultralytics YOLO'),
-            ('whisper', 'OpenAI Whisper'),
-            ('anthropic', 'Anthropic SDK'),
-            ('dotenv', 'python-dotenv'),
-            ('moviepy.editor', 'MoviePy'),
-            ('easyocr', 'EasyOCR'),
-            ('scenedetect', 'PySceneDetect'),
-            ('PIL', 'Pillow'),
-            ('deep_sort_realtime', 'DeepSort')
-        ]
+        print_status("Running package probes...")
+        self.probe_results = self.run_probes(build_probes(self.deep))
         
         # Special test for CLIP (needs special import)
-        try:
-            print_status("Testing CLIP installation...")
-            result = subprocess.run([str(self.python_path), '-c', 'import clip; print(clip.available_models())'],
-                                  capture_output=True, text=True)
-            if result.returncode == 0:
-                print_status("CLIP installed correctly", "success")
-                self.test_results['python_packages'].append(('CLIP', True))
-            else:
-                print_status("CLIP not properly installed", "error")
-                self.test_results['python_packages'].append(('CLIP', False))
-        except Exception as e:
-            print_status(f"CLIP test failed: {e}", "error")
-            self.test_results['python_packages'].append(('CLIP', False))
+        print_status("Testing CLIP installation...")
+        ok, _ = self.probe_results.get('import:CLIP', (False, None))
+        if ok:
+            print_status("CLIP installed correctly", "success")
+        else:
+            print_status("CLIP not properly installed", "error")
+        self.test_results['python_packages'].append(('CLIP', ok))
         
         # Test other packages
-        for module_name, display_name in critical_packages:
-            try:
-                # Run import in subprocess with venv Python
-                result = subprocess.run([str(self.python_path), '-c', f'import {module_name}'],
-                                      capture_output=True, text=True)
-                if result.returncode == 0:
-                    print_status(f"{display_name} imported successfully", "success")
-                    self.test_results['python_packages'].append((display_name, True))
-                else:
-                    print_status(f"{display_name} import failed: {result.stderr}", "error")
-                    self.test_results['python_packages'].append((display_name, False))
-            except Exception as e:
-                print_status(f"{display_name} test failed: {e}", "error")
-                self.test_results['python_packages'].append((display_name, False))
+        for module_name, display_name in CRITICAL_PACKAGES:
+            ok, detail = self.probe_results.get(f'import:{display_name}',
+                                                (False, 'probe did not complete'))
+            if ok:
+                print_status(f"{display_name} imported successfully", "success")
+            else:
+                print_status(f"{display_name} import failed: {detail}", "error")
+            self.test_results['python_packages'].append((display_name, ok))
         
         # Check specific versions
         print_status("\nChecking package versions...")
-        version_checks = [
-            ('torch', 'torch.__version__'),
-            ('ultralytics', 'ultralytics.__version__'),
-            ('mediapipe', 'mediapipe.__version__'),
-            ('whisper', 'whisper.__version__')
-        ]
-        
-        for module, version_attr in version_checks:
-            try:
-                result = subprocess.run([str(self.python_path), '-c', 
-                                       f'import {module}; print({version_attr})'],
-                                      capture_output=True, text=True)
-                if result.returncode == 0:
-                    version = result.stdout.strip()
-                    print_status(f"{module} version: {version}", "info")
-            except:
-                pass
+        for module, _ in VERSION_CHECKS:
+            ok, version = self.probe_results.get(f'version:{module}', (False, None))
+            if ok:
+                print_status(f"{module} version: {version}", "info")
     
     def test_node_modules(self):
         """Test Node.js module availability"""
-        package_json_path = self.root_dir / "package.json"
+        package_data = self.package_json
         
-        if not package_json_path.exists():
+        if package_data is None:
             print_status("package.json not found", "error")
             return
         
-        # Read package.json to get dependencies
-        with open(package_json_path, 'r') as f:
-            package_data = json.load(f)
-        
         dependencies = package_data.get('dependencies', {})
-        critical_modules = ['dotenv', 'axios', 'puppeteer']
-        
         node_modules_path = self.root_dir / "node_modules"
         
-        for module in critical_modules:
+        for module in CRITICAL_NODE_MODULES:
             if module in dependencies:
                 module_path = node_modules_path / module
                 if module_path.exists():
@@ -181,22 +333,13 @@ class SetupVerifier:
     
     def test_api_keys(self):
         """Test API key configuration"""
-        env_path = self.root_dir / ".env"
+        env_vars = self.env_vars
         
-        if not env_path.exists():
+        if env_vars is None:
             print_status(".env file not found", "error")
             self.test_results['api_keys'].append(('.env file', False))
             return
         
-        # Load .env
-        env_vars = {}
-        with open(env_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    env_vars[key.strip()] = value.strip()
-        
         # Test Anthropic API key
         if 'ANTHROPIC_API_KEY' in env_vars:
             key_value = env_vars['ANTHROPIC_API_KEY']
@@ -232,66 +375,48 @@ class SetupVerifier:
         """Test model accessibility"""
         print_status("Testing model loading capabilities...")
         
+        # Probed alongside the package imports in test_python_packages
+        if self.probe_results is None:
+            self.probe_results = self.run_probes(model_probes(self.deep))
+        
         # Test YOLOv8
-        try:
-            result = subprocess.run([str(self.python_path), '-c', 
-                                   'from ultralytics import YOLO; print("YOLOv8 ready")'],
-                                  capture_output=True, text=True)
-            if result.returncode == 0:
-                print_status("YOLOv8 can be loaded", "success")
-                self.test_results['models'].append(('YOLOv8', True))
-            else:
-                print_status(f"YOLOv8 load test failed: {result.stderr}", "error")
-                self.test_results['models'].append(('YOLOv8', False))
-        except Exception as e:
-            print_status(f"YOLOv8 test error: {e}", "error")
-            self.test_results['models'].append(('YOLOv8', False))
+        ok, detail = self.probe_results.get('model:YOLOv8', (False, 'probe did not complete'))
+        if ok:
+            print_status("YOLOv8 can be loaded", "success")
+        else:
+            print_status(f"YOLOv8 load test failed: {detail}", "error")
+        self.test_results['models'].append(('YOLOv8', ok))
         
         # Test MediaPipe
-        try:
-            result = subprocess.run([str(self.python_path), '-c', 
-                                   'import mediapipe as mp; mp.solutions.face_mesh; print("MediaPipe ready")'],
-                                  capture_output=True, text=True)
-            if result.returncode == 0:
-                print_status("MediaPipe models accessible", "success")
-                self.test_results['models'].append(('MediaPipe', True))
-            else:
-                print_status("MediaPipe test failed", "error")
-                self.test_results['models'].append(('MediaPipe', False))
-        except Exception as e:
-            print_status(f"MediaPipe test error: {e}", "error")
-            self.test_results['models'].append(('MediaPipe', False))
+        ok, _ = self.probe_results.get('model:MediaPipe', (False, None))
+        if ok:
+            print_status("MediaPipe models accessible", "success")
+        else:
+            print_status("MediaPipe test failed", "error")
+        self.test_results['models'].append(('MediaPipe', ok))
         
         # Test EasyOCR
-        try:
-            result = subprocess.run([str(self.python_path), '-c', 
-                                   'import easyocr; print("EasyOCR ready")'],
-                                  capture_output=True, text=True, timeout=10)
-            if result.returncode == 0:
-                print_status("EasyOCR ready", "success")
-                self.test_results['models'].append(('EasyOCR', True))
-            else:
-                print_status("EasyOCR test failed", "error")
-                self.test_results['models'].append(('EasyOCR', False))
-        except subprocess.TimeoutExpired:
+        if 'model:EasyOCR' not in self.probe_results:
             print_status("EasyOCR test timed out (models will download on first use)", "warning")
             self.test_results['models'].append(('EasyOCR', True))
-        except Exception as e:
-            print_status(f"EasyOCR test error: {e}", "error")
+        elif self.probe_results['model:EasyOCR'][0]:
+            print_status("EasyOCR ready", "success")
+            self.test_results['models'].append(('EasyOCR', True))
+        else:
+            print_status("EasyOCR test failed", "error")
             self.test_results['models'].append(('EasyOCR', False))
     
     def test_directories(self):
         """Test directory structure"""
+        # One listing of the root instead of a stat per directory
+        try:
+            present = {entry.name for entry in os.scandir(self.root_dir)}
+        except OSError:
+            present = set()
+        
         # Critical directories that should exist
-        critical_dirs = [
-            ('prompt_templates', 'Prompt templates directory'),
-            ('venv', 'Python virtual environment'),
-            ('node_modules', 'Node.js modules'),
-        ]
-        
-        for dir_name, description in critical_dirs:
-            dir_path = self.root_dir / dir_name
-            if dir_path.exists():
+        for dir_name, description in CRITICAL_DIRS:
+            if dir_name in present:
                 print_status(f"{description} exists", "success")
                 self.test_results['directories'].append((dir_name, True))
             else:
@@ -300,10 +425,11 @@ class SetupVerifier:
         
         # Check prompt template files
         prompt_dir = self.root_dir / "prompt_templates"
-        if prompt_dir.exists():
-            templates = list(prompt_dir.glob("*.txt"))
-            if templates:
-                print_status(f"Found {len(templates)} prompt templates", "success")
+        if 'prompt_templates' in present:
+            with os.scandir(prompt_dir) as entries:
+                template_count = sum(1 for entry in entries if entry.name.endswith('.txt'))
+            if template_count:
+                print_status(f"Found {template_count} prompt templates", "success")
             else:
                 print_status("No prompt templates found", "error")
                 self.test_results['directories'].append(('prompt_templates/*.txt', False))
@@ -322,6 +448,7 @@ class SetupVerifier:
         
         total_tests = 0
         passed_tests = 0
+        lines = []  # written in one go below
         
         for category, results in self.test_results.items():
             if results:
@@ -330,15 +457,16 @@ class SetupVerifier:
                 total_tests += category_total
                 passed_tests += category_passed
                 
-                print(f"\n{category.replace('_', ' ').title()}:")
-                print(f"  Passed: {category_passed}/{category_total}")
+                lines.append(f"\n{category.replace('_', ' ').title()}:")
+                lines.append(f"  Passed: {category_passed}/{category_total}")
                 
                 for name, passed in results:
                     status = "✅" if passed else "❌"
-                    print(f"  {status} {name}")
+                    lines.append(f"  {status} {name}")
         
-        print(f"\n{'='*60}")
-        print(f"Overall: {passed_tests}/{total_tests} tests passed")
+        lines.append(f"\n{HEADER_RULE}")
+        lines.append(f"Overall: {passed_tests}/{total_tests} tests passed")
+        sys.stdout.write('\n'.join(lines) + '\n')
         
         if passed_tests == total_tests:
             print_status("\n🎉 All tests passed! RumiAI is ready to run.", "success")
@@ -351,7 +479,21 @@ class SetupVerifier:
 
 def main():
     """Run verification"""
-    verifier = SetupVerifier()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Verify a RumiAI installation')
+    parser.add_argument('--deep', action='store_true',
+                        help='Fully import slow packages such as EasyOCR instead of only checking they are installed')
+    parser.add_argument('--from-requirements', metavar='PATH',
+                        help='Include system check results saved by "requirements_check.py PATH" in the summary')
+    args = parser.parse_args()
+    
+    requirements_results = None
+    if args.from_requirements:
+        with open(args.from_requirements, 'r') as f:
+            requirements_results = json.load(f)
+    
+    verifier = SetupVerifier(deep=args.deep, requirements_results=requirements_results)
     success = verifier.run()
     return success
 
@@ -4,53 +4,62 @@ Temporal Marker Monitoring Dashboard
 Displays metrics and health status for temporal marker rollout
 """
 
+import io
+import itertools
 import sys
 import json
+from contextlib import redirect_stdout
 from datetime import datetime, timedelta
 from pathlib import Path
-from python.temporal_monitoring import TemporalMarkerMonitor, get_monitor, check_rollout_health
 
+from python.temporal_monitoring import TemporalMarkerMonitor, get_monitor
 
-def display_dashboard():
-    """Display monitoring dashboard"""
-    monitor = get_monitor()
-    
-    print("\n" + "="*80)
-    print("📊 TEMPORAL MARKER MONITORING DASHBOARD")
-    print("="*80)
-    
-    # Get current metrics
+# Section separators
+SEPARATOR = "=" * 80
+SUBSEPARATOR = "-" * 40
+
+# Rollout percentages compared by --simulate
+SIMULATED_PERCENTAGES = (10, 25, 50, 75, 100)
+
+
+def _render_extraction(monitor):
+    """Extraction counts, timings and marker sizes"""
     current = monitor.get_current_metrics()
-    
-    # Display extraction metrics
     print("\n🔧 EXTRACTION METRICS")
-    print("-" * 40)
+    print(SUBSEPARATOR)
     print(f"Total Extractions: {current['extraction_count']}")
     print(f"Failed Extractions: {current['extraction_errors']} ({current['extraction_error_rate']:.1%} error rate)")
     print(f"Avg Extraction Time: {current['avg_extraction_time']:.2f}s")
     print(f"Avg Marker Size: {current['avg_marker_size_kb']:.1f}KB")
     print(f"Size Range: {current['min_marker_size_kb']:.1f}KB - {current['max_marker_size_kb']:.1f}KB")
-    
-    # Display Claude integration metrics
+
+
+def _render_claude(monitor):
+    """Claude request counts and marker adoption"""
+    current = monitor.get_current_metrics()
     print("\n🤖 CLAUDE INTEGRATION")
-    print("-" * 40)
-    total_requests = current['claude_requests_with_markers'] + current['claude_requests_without_markers']
-    print(f"Total Claude Requests: {total_requests}")
+    print(SUBSEPARATOR)
+    print(f"Total Claude Requests: {current['total_claude_requests']}")
     print(f"  With Temporal Markers: {current['claude_requests_with_markers']} ({current['temporal_marker_adoption']:.1%})")
     print(f"  Without Temporal Markers: {current['claude_requests_without_markers']}")
     print(f"API Error Rate: {current['api_error_rate']:.1%}")
-    
-    # Display rollout decisions
+
+
+def _render_rollout(monitor):
+    """Rollout decision counts"""
+    current = monitor.get_current_metrics()
     print("\n🎯 ROLLOUT DECISIONS")
-    print("-" * 40)
+    print(SUBSEPARATOR)
     for decision, count in current['rollout_decisions'].items():
         print(f"  {decision}: {count}")
-    
-    # Display quality comparison
-    quality = monitor.get_quality_comparison()
+
+
+def _render_quality(monitor):
+    """Insight quality with vs without markers"""
+    quality = monitor.get_quality_comparison() if monitor.quality_sample_count else {}
     if quality:
         print("\n📈 QUALITY COMPARISON (with vs without markers)")
-        print("-" * 40)
+        print(SUBSEPARATOR)
         for prompt_name, data in quality.items():
             improvement = data['improvement']
             sign = "+" if improvement > 0 else ""
@@ -58,11 +67,13 @@ def display_dashboard():
             print(f"  Improvement: {sign}{improvement:.2f}")
             print(f"  With markers: {data['with_markers']['avg_score']:.2f} (n={data['with_markers']['sample_size']})")
             print(f"  Without markers: {data['without_markers']['avg_score']:.2f} (n={data['without_markers']['sample_size']})")
-    
-    # Check rollout health
+
+
+def _render_health(monitor):
+    """Rollout health checks and recommendations"""
     print("\n🏥 ROLLOUT HEALTH CHECK")
-    print("-" * 40)
-    health = check_rollout_health()
+    print(SUBSEPARATOR)
+    health = monitor.check_rollout_health()
     
     if health['healthy']:
         print("✅ All systems healthy - ready for rollout expansion")
@@ -75,22 +86,61 @@ def display_dashboard():
     for check, status in health['checks'].items():
         emoji = "✅" if status else "❌"
         print(f"  {emoji} {check.replace('_', ' ').title()}")
-    
-    # Display recent errors if any
+
+
+def _render_errors(monitor):
+    """Most recent API errors, if any"""
+    current = monitor.get_current_metrics()
     if current['api_errors']:
         print("\n⚠️  RECENT API ERRORS")
-        print("-" * 40)
-        for error in current['api_errors'][-5:]:  # Last 5 errors
+        print(SUBSEPARATOR)
+        last_errors = list(itertools.islice(reversed(current['api_errors']), 5))
+        for error in reversed(last_errors):  # Last 5 errors, oldest first
             print(f"  Video: {error['video_id']}")
             print(f"  Prompt: {error['prompt_name']}")
             print(f"  Has Markers: {error['has_markers']}")
             print(f"  Error: {error['error'][:100]}...")
             print()
+
+
+# Dashboard sections in display order; only the requested ones are computed
+SECTIONS = {
+    'extraction': _render_extraction,
+    'claude': _render_claude,
+    'rollout': _render_rollout,
+    'quality': _render_quality,
+    'health': _render_health,
+    'errors': _render_errors,
+}
+
+
+def display_dashboard(sections=None, save=None):
+    """
+    Display monitoring dashboard, limited to `sections` if given.
+    
+    `save` answers the save-metrics prompt up front (True/False), so
+    unattended runs never block on input; None asks interactively.
+    """
+    monitor = get_monitor()
+    
+    print("\n" + SEPARATOR)
+    print("📊 TEMPORAL MARKER MONITORING DASHBOARD")
+    print(SEPARATOR)
+    
+    for name, render in SECTIONS.items():
+        if sections is None or name in sections:
+            # Collect the section's lines and write them to the terminal at once
+            buffer = io.StringIO()
+            with redirect_stdout(buffer):
+                render(monitor)
+            sys.stdout.write(buffer.getvalue())
+    sys.stdout.flush()
     
     # Save session option
-    print("\n" + "="*80)
-    save = input("💾 Save session metrics? (y/n): ")
-    if save.lower() == 'y':
+    print("\n" + SEPARATOR)
+    if save is None:
+        save = input("💾 Save session metrics? (y/n): ").lower() == 'y'
+    if save:
         monitor.save_session_metrics()
         print("✅ Session metrics saved!")
 
@@ -105,56 +155,70 @@ def generate_report():
     report_path = Path(f"metrics/temporal_markers/report_{timestamp}.txt")
     report_path.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(report_path, 'w') as f:
-        f.write(report)
+    report_path.write_text(report, encoding='utf-8')
     
     print(f"\n📄 Report saved to: {report_path}")
-    print("\n" + "="*80)
+    print("\n" + SEPARATOR)
     print(report)
-    print("="*80)
+    print(SEPARATOR)
 
 
-def simulate_rollout_scenarios():
+def simulate_rollout_scenarios(percentages=SIMULATED_PERCENTAGES):
     """Simulate different rollout percentages to help decision making"""
     monitor = get_monitor()
     current = monitor.get_current_metrics()
     
     print("\n🎲 ROLLOUT SIMULATION")
-    print("="*80)
+    print(SEPARATOR)
     
     total_videos = 1000  # Simulate for 1000 videos
     
-    for percentage in [10, 25, 50, 75, 100]:
-        with_markers = int(total_videos * percentage / 100)
+    # Per-video estimates; each percentage only scales them
+    extraction_time_per_video = current['avg_extraction_time']
+    size_mb_per_video = current['avg_marker_size_kb'] / 1024
+    error_rate = current['api_error_rate']
+    
+    for percentage in percentages:
+        with_markers = total_videos * percentage // 100
         without_markers = total_videos - with_markers
         
         print(f"\n{percentage}% Rollout:")
         print(f"  Videos with markers: {with_markers}")
         print(f"  Videos without markers: {without_markers}")
-        
-        # Estimate resource usage
-        est_extraction_time = with_markers * current['avg_extraction_time']
-        est_total_size = with_markers * current['avg_marker_size_kb'] / 1024  # MB
-        
-        print(f"  Est. extraction time: {est_extraction_time/60:.1f} minutes")
-        print(f"  Est. total marker size: {est_total_size:.1f} MB")
+        print(f"  Est. extraction time: {with_markers * extraction_time_per_video / 60:.1f} minutes")
+        print(f"  Est. total marker size: {with_markers * size_mb_per_video:.1f} MB")
         
         # Estimate API impact
-        if current['api_error_rate'] > 0:
-            est_errors = with_markers * current['api_error_rate']
-            print(f"  Est. API errors: {est_errors:.0f}")
+        if error_rate > 0:
+            print(f"  Est. API errors: {with_markers * error_rate:.0f}")
 
 
 def main():
-    if len(sys.argv) > 1:
-        if sys.argv[1] == '--report':
+    usage = (f"Usage: python temporal_monitoring_dashboard.py "
+             f"[--report|--simulate|--sections={','.join(SECTIONS)}] [--save|--no-save]")
+    # --save/--no-save answer the save prompt for cron/CI runs
+    save_flags = {arg for arg in sys.argv[1:] if arg in ('--save', '--no-save')}
+    args = [arg for arg in sys.argv[1:] if arg not in save_flags]
+    save = None if not save_flags else '--save' in save_flags
+    if len(save_flags) > 1:
+        print(usage)
+    elif args:
+        if args[0] == '--report':
             generate_report()
-        elif sys.argv[1] == '--simulate':
+        elif args[0] == '--simulate':
             simulate_rollout_scenarios()
+        elif args[0].startswith('--sections='):
+            sections = set(filter(None, args[0].split('=', 1)[1].split(',')))
+            unknown = sections - SECTIONS.keys()
+            if unknown:
+                print(f"Unknown sections: {', '.join(sorted(unknown))}")
+                print(usage)
+            else:
+                display_dashboard(sections, save=save)
         else:
-            print("Usage: python temporal_monitoring_dashboard.py [--report|--simulate]")
+            print(usage)
     else:
-        display_dashboard()
+        display_dashboard(save=save)
 
 
 if __name__ == "__main__":
@@ -4,13 +4,24 @@ Temporal Marker Rollout Controller
 Manages gradual rollout of temporal markers with automated health checks
 """
 
-import json
+import math
 import os
 import sys
+import threading
 from datetime import datetime
+from functools import cached_property
 from pathlib import Path
+from typing import Optional
 from python.temporal_monitoring import check_rollout_health, get_monitor
 from python.claude_temporal_integration import ClaudeTemporalIntegration
+from rumiai_v2.json_io import dumps_json, loads_json
+
+# Section separators
+SEPARATOR = "=" * 80
+STATUS_SEPARATOR = "=" * 50
+
+# Seconds to wait for further rollout changes before writing them out
+FLUSH_DELAY = 0.5
 
 
 class TemporalRolloutController:
@@ -18,14 +29,27 @@ class TemporalRolloutController:
     
     def __init__(self, config_path: str = "config/temporal_markers.json"):
         self.config_path = Path(config_path)
-        self.config = self._load_config()
-        self.rollout_history = self._load_rollout_history()
+        self.history_path = self.config_path.parent / "rollout_history.jsonl"
+        # Rollout changes not yet on disk; flushed together after FLUSH_DELAY
+        self._pending_changes = []
+        self._flush_timer = None
+        self._flush_lock = threading.Lock()
+        self._migrate_legacy_history()
+    
+    @cached_property
+    def config(self) -> dict:
+        """Rollout configuration, read from disk the first time it is needed"""
+        return self._load_config()
+    
+    @cached_property
+    def rollout_history(self) -> list:
+        """Full rollout history, read from disk the first time it is needed"""
+        return self._load_rollout_history() + self._pending_changes
         
     def _load_config(self) -> dict:
         """Load current configuration"""
         if self.config_path.exists():
-            with open(self.config_path, 'r') as f:
-                return json.load(f)
+            return loads_json(self.config_path.read_bytes())
         return {
             "enable_temporal_markers": False,
             "rollout_percentage": 0.0,
@@ -35,36 +59,102 @@ class TemporalRolloutController:
     def _save_config(self):
         """Save configuration"""
         self.config_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.config_path, 'w') as f:
-            json.dump(self.config, f, indent=2)
+        # Write aside and rename so a crash never leaves a truncated config
+        tmp_path = self.config_path.with_suffix('.json.tmp')
+        tmp_path.write_bytes(dumps_json(self.config))
+        os.replace(tmp_path, self.config_path)
         print(f"✅ Configuration saved to {self.config_path}")
     
     def _load_rollout_history(self) -> list:
         """Load rollout history"""
-        history_path = self.config_path.parent / "rollout_history.json"
-        if history_path.exists():
-            with open(history_path, 'r') as f:
-                return json.load(f)
-        return []
+        if not self.history_path.exists():
+            return []
+        with open(self.history_path, 'rb') as f:
+            return [loads_json(line) for line in f if line.strip()]
+    
+    def _migrate_legacy_history(self):
+        """Convert the old rollout_history.json array to JSONL, once"""
+        legacy_path = self.config_path.parent / "rollout_history.json"
+        if not legacy_path.exists() or self.history_path.exists():
+            return
+        records = loads_json(legacy_path.read_bytes())
+        tmp_path = self.history_path.with_suffix('.jsonl.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.writelines(dumps_json(record, indent=None) + b'\n' for record in records)
+        os.replace(tmp_path, self.history_path)
+        legacy_path.unlink()
+    
+    def _load_last_history_entry(self) -> Optional[dict]:
+        """Parse only the last rollout history line, reading back from the end"""
+        if self._pending_changes:
+            return self._pending_changes[-1]
+        if not self.history_path.exists():
+            return None
+        with open(self.history_path, 'rb') as f:
+            end = f.seek(0, os.SEEK_END)
+            pos = end
+            tail = b''
+            # Grow the window backwards until it holds a full last line
+            while pos > 0:
+                step = min(4096, pos)
+                pos -= step
+                f.seek(pos)
+                tail = f.read(step) + tail
+                if tail.rstrip(b'\n').rfind(b'\n') != -1:
+                    break
+        lines = tail.rstrip(b'\n').rsplit(b'\n', 1)
+        return loads_json(lines[-1]) if lines[-1].strip() else None
     
-    def _save_rollout_history(self):
-        """Save rollout history"""
-        history_path = self.config_path.parent / "rollout_history.json"
-        with open(history_path, 'w') as f:
-            json.dump(self.rollout_history, f, indent=2)
+    def _count_history_entries(self) -> int:
+        """Number of recorded changes, counted without parsing them"""
+        if not self.history_path.exists():
+            return len(self._pending_changes)
+        count = 0
+        with open(self.history_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 16), b''):
+                count += chunk.count(b'\n')
+        return count + len(self._pending_changes)
+    
+    def _append_rollout_history(self, records: list):
+        """Append changes to the rollout history in a single write"""
+        self.history_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.history_path, 'ab') as f:
+            f.write(b''.join(dumps_json(record, indent=None) + b'\n' for record in records))
+    
+    def _schedule_flush(self):
+        """Write pending changes once no further change arrives for FLUSH_DELAY"""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+        self._flush_timer = threading.Timer(FLUSH_DELAY, self.flush_pending)
+        self._flush_timer.start()
+    
+    def flush_pending(self):
+        """Write pending rollout changes (config and history) now"""
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._pending_changes:
+                return
+            self._save_config()
+            self._append_rollout_history(self._pending_changes)
+            self._pending_changes = []
     
     def get_current_status(self) -> dict:
         """Get current rollout status"""
+        last_entry = self._load_last_history_entry()
         return {
             "enabled": self.config.get("enable_temporal_markers", False),
             "percentage": self.config.get("rollout_percentage", 0.0),
-            "last_change": self.rollout_history[-1]["timestamp"] if self.rollout_history else None,
-            "total_changes": len(self.rollout_history)
+            "last_change": last_entry["timestamp"] if last_entry else None,
+            "total_changes": self._count_history_entries()
         }
     
-    def can_increase_rollout(self) -> tuple[bool, list[str]]:
-        """Check if rollout can be safely increased"""
-        health = check_rollout_health()
+    def can_increase_rollout(self, health: Optional[dict] = None,
+                             now: Optional[datetime] = None) -> tuple[bool, list[str]]:
+        """Check if rollout can be safely increased, reusing `health` and `now` if given"""
+        if health is None:
+            health = check_rollout_health()
         reasons = []
         
         if not health['healthy']:
@@ -72,9 +162,10 @@ class TemporalRolloutController:
             return False, reasons
         
         # Check minimum time since last change (e.g., 24 hours)
-        if self.rollout_history:
-            last_change = datetime.fromisoformat(self.rollout_history[-1]["timestamp"])
-            hours_since = (datetime.now() - last_change).total_seconds() / 3600
+        last_entry = self._load_last_history_entry()
+        if last_entry:
+            last_change = datetime.fromisoformat(last_entry["timestamp"])
+            hours_since = ((now or datetime.now()) - last_change).total_seconds() / 3600
             if hours_since < 24:
                 reasons.append(f"Only {hours_since:.1f} hours since last change (min 24h)")
                 return False, reasons
@@ -91,58 +182,72 @@ class TemporalRolloutController:
         current_percentage = self.config.get("rollout_percentage", 0.0)
         
         # Validate percentage
-        if new_percentage < 0 or new_percentage > 100:
+        if not 0 <= new_percentage <= 100:  # also rejects NaN
             print("❌ Percentage must be between 0 and 100")
             return False
         
+        # Float round-off (e.g. from a computed percentage) is not a change
+        if math.isclose(new_percentage, current_percentage):
+            print("ℹ️  No change needed")
+            return True
+        
+        # One health check and one clock reading serve both the safety check
+        # and the history record
+        health = check_rollout_health()
+        now = datetime.now()
+        
         # Check if decreasing (always allowed)
         if new_percentage < current_percentage:
-            self._apply_rollout_change(new_percentage, "Manual decrease")
+            self._apply_rollout_change(new_percentage, "Manual decrease", health, now)
             return True
         
-        # Check if increasing
-        if new_percentage > current_percentage:
-            can_increase, reasons = self.can_increase_rollout()
-            
-            if not can_increase and not force:
-                print("❌ Cannot increase rollout:")
-                for reason in reasons:
-                    print(f"   - {reason}")
-                print("\nUse --force to override safety checks")
-                return False
-            
-            if force and not can_increase:
-                print("⚠️  Forcing rollout increase despite warnings:")
-                for reason in reasons:
-                    print(f"   - {reason}")
-            
-            self._apply_rollout_change(new_percentage, "Manual increase" + (" (forced)" if force else ""))
-            return True
+        # Otherwise increasing
+        can_increase, reasons = self.can_increase_rollout(health, now)
+        
+        if not can_increase and not force:
+            print("❌ Cannot increase rollout:")
+            for reason in reasons:
+                print(f"   - {reason}")
+            print("\nUse --force to override safety checks")
+            return False
         
-        print("ℹ️  No change needed")
+        if force and not can_increase:
+            print("⚠️  Forcing rollout increase despite warnings:")
+            for reason in reasons:
+                print(f"   - {reason}")
+        
+        self._apply_rollout_change(new_percentage, "Manual increase" + (" (forced)" if force else ""), health, now)
         return True
     
-    def _apply_rollout_change(self, new_percentage: float, reason: str):
+    def _apply_rollout_change(self, new_percentage: float, reason: str,
+                              health: Optional[dict] = None, now: Optional[datetime] = None):
         """Apply rollout percentage change"""
-        old_percentage = self.config.get("rollout_percentage", 0.0)
-        
-        # Update config
-        self.config["rollout_percentage"] = new_percentage
-        if new_percentage > 0:
-            self.config["enable_temporal_markers"] = True
-        
-        # Save config
-        self._save_config()
+        if health is None:
+            health = check_rollout_health()
         
-        # Record in history
-        self.rollout_history.append({
-            "timestamp": datetime.now().isoformat(),
-            "old_percentage": old_percentage,
-            "new_percentage": new_percentage,
-            "reason": reason,
-            "health_status": check_rollout_health()
-        })
-        self._save_rollout_history()
+        # Config and history change under the flush lock so a timer flush
+        # never saves a config that is ahead of or behind its history
+        with self._flush_lock:
+            old_percentage = self.config.get("rollout_percentage", 0.0)
+            
+            # Update config
+            self.config["rollout_percentage"] = new_percentage
+            if new_percentage > 0:
+                self.config["enable_temporal_markers"] = True
+            
+            # Record in history; config and history are written together once
+            # changes stop arriving
+            record = {
+                "timestamp": (now or datetime.now()).isoformat(),
+                "old_percentage": old_percentage,
+                "new_percentage": new_percentage,
+                "reason": reason,
+                "health_status": health
+            }
+            self._pending_changes.append(record)
+            if 'rollout_history' in self.__dict__:  # keep an already loaded copy current
+                self.rollout_history.append(record)
+            self._schedule_flush()
         
         print(f"✅ Rollout updated: {old_percentage}% → {new_percentage}%")
         
@@ -152,6 +257,7 @@ class TemporalRolloutController:
     
     def enable_temporal_markers(self):
         """Enable temporal markers (0% rollout)"""
+        self.flush_pending()
         self.config["enable_temporal_markers"] = True
         self.config["rollout_percentage"] = 0.0
         self._save_config()
@@ -159,6 +265,7 @@ class TemporalRolloutController:
     
     def disable_temporal_markers(self):
         """Disable temporal markers completely"""
+        self.flush_pending()  # record earlier changes before the switch-off
         self.config["enable_temporal_markers"] = False
         self._save_config()
         os.environ['ENABLE_TEMPORAL_MARKERS'] = 'false'
@@ -185,7 +292,7 @@ class TemporalRolloutController:
     def show_rollout_history(self):
         """Display rollout history"""
         print("\n📜 ROLLOUT HISTORY")
-        print("="*80)
+        print(SEPARATOR)
         
         if not self.rollout_history:
             print("No rollout changes recorded")
@@ -207,7 +314,7 @@ def main():
         # Show current status
         status = controller.get_current_status()
         print("\n📊 TEMPORAL MARKER ROLLOUT STATUS")
-        print("="*50)
+        print(STATUS_SEPARATOR)
         print(f"Enabled: {'✅' if status['enabled'] else '❌'}")
         print(f"Current Rollout: {status['percentage']}%")
         print(f"Last Changed: {status['last_change'] or 'Never'}")
@@ -264,6 +371,9 @@ def main():
     
     else:
         print(f"❌ Unknown command: {command}")
+    
+    # Write out any rollout change now rather than waiting for the timer
+    controller.flush_pending()
 
 
 if __name__ == "__main__":
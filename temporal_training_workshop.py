@@ -5,47 +5,20 @@ Teaches team members how to interpret and use temporal data
 """
 
 import json
+import sys
 import time
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
+# Section separators
+SEPARATOR = "=" * 80
+SUBSEPARATOR = "-" * 60
 
-def display_section(title: str, content: str):
-    """Display a training section"""
-    print("\n" + "="*80)
-    print(f"📚 {title}")
-    print("="*80)
-    print(content)
-    input("\nPress Enter to continue...")
-
-
-def interactive_exercise(title: str, question: str, answer: str):
-    """Run an interactive exercise"""
-    print("\n" + "-"*60)
-    print(f"🎯 EXERCISE: {title}")
-    print("-"*60)
-    print(f"\n{question}")
-    
-    user_input = input("\nYour answer (or press Enter to see solution): ")
-    
-    print("\n✅ SOLUTION:")
-    print(answer)
-    
-    if user_input:
-        print(f"\n💭 Your answer: {user_input}")
-    input("\nPress Enter to continue...")
 
-
-def run_workshop():
-    """Run the temporal markers training workshop"""
-    
-    print("\n" + "🎓 TEMPORAL MARKERS TRAINING WORKSHOP 🎓".center(80))
-    print("="*80)
-    print("Welcome to the interactive training for temporal markers!")
-    print("This workshop will teach you how to interpret and use temporal data.")
-    input("\nPress Enter to begin...")
-    
-    # Module 1: Understanding Temporal Markers
-    display_section(
+# (title, content, exercise) per workshop module, in order; exercise is
+# (title, question, answer) or None. Kept at module scope so the workshop
+# can start at any module.
+WORKSHOP_SECTIONS = (
+    (
         "MODULE 1: What Are Temporal Markers?",
         """
 Temporal markers capture WHEN events happen in videos with precision:
@@ -63,19 +36,16 @@ Temporal markers capture WHEN events happen in videos with precision:
 
 💡 Key Insight: We now see the video's timeline like a musical score,
 with every beat precisely mapped.
-"""
-    )
-    
-    # Exercise 1
-    interactive_exercise(
-        "Interpreting Density",
-        """
+""",
+        (
+            "Interpreting Density",
+            """
 Given this density progression: [1, 2, 5, 2, 3]
 
 What can you conclude about the video's pacing strategy?
 Consider: Hook strength, attention patterns, viral potential
 """,
-        """
+            """
 This shows a "building crescendo" pattern:
 - Second 0-1: Low density (1-2 events) - soft opening
 - Second 2: Peak density (5 events) - attention spike  
@@ -88,10 +58,9 @@ This is a STRONG viral pattern because:
 
 Viral potential: HIGH (8/10)
 """
-    )
-    
-    # Module 2: Pattern Recognition
-    display_section(
+        )
+    ),
+    (
         "MODULE 2: Recognizing Viral Patterns",
         """
 🔍 Common Temporal Patterns in Viral Videos:
@@ -119,13 +88,10 @@ Viral potential: HIGH (8/10)
 🎯 Pattern Matching Formula:
 If density[2] > 4 AND text contains "wait" AND emotions > 2 changes
 Then: Viral_Score += 3
-"""
-    )
-    
-    # Exercise 2
-    interactive_exercise(
-        "Pattern Identification",
-        """
+""",
+        (
+            "Pattern Identification",
+            """
 You see this temporal data:
 - Density: [4, 3, 5, 1, 1, 2, 6]
 - Text at 2.0s: "You won't believe this"
@@ -134,7 +100,7 @@ You see this temporal data:
 
 Which viral pattern(s) does this match?
 """,
-        """
+            """
 This matches TWO viral patterns:
 
 1. ✅ "Wait For It" Pattern:
@@ -150,10 +116,9 @@ Missing: Emotional Rollercoaster (only 2 changes, need 3+)
 
 Overall: STRONG viral potential using proven patterns
 """
-    )
-    
-    # Module 3: Writing Temporal Prompts
-    display_section(
+        )
+    ),
+    (
         "MODULE 3: Writing Effective Temporal Prompts",
         """
 📝 Temporal Prompt Formula:
@@ -179,13 +144,10 @@ Overall: STRONG viral potential using proven patterns
 [SPECIFIC QUESTIONS WITH TIMING].
 [PATTERN TO CHECK].
 Provide [TIMESTAMP-BASED OUTPUT]."
-"""
-    )
-    
-    # Exercise 3
-    interactive_exercise(
-        "Write a Temporal Prompt",
-        """
+""",
+        (
+            "Write a Temporal Prompt",
+            """
 Task: Write a prompt to analyze CTA effectiveness
 
 Available data:
@@ -195,7 +157,7 @@ Available data:
 
 Write a temporal-aware prompt:
 """,
-        """
+            """
 Example temporal-aware prompt:
 
 "Analyze CTA effectiveness using the cta_window temporal data.
@@ -214,10 +176,9 @@ For each CTA:
 
 Does this follow the 'CTA Sandwich' pattern with early + late CTAs?"
 """
-    )
-    
-    # Module 4: Interpreting Results
-    display_section(
+        )
+    ),
+    (
         "MODULE 4: Interpreting Temporal Insights",
         """
 🔬 How to Read Claude's Temporal Analysis:
@@ -244,11 +205,10 @@ Does this follow the 'CTA Sandwich' pattern with early + late CTAs?"
 □ Synchronization moments noted
 □ Density values referenced
 □ Timing-based improvements suggested
-"""
-    )
-    
-    # Module 5: Advanced Applications
-    display_section(
+""",
+        None
+    ),
+    (
         "MODULE 5: Advanced Temporal Analysis",
         """
 🚀 Advanced Techniques:
@@ -277,13 +237,10 @@ Does this follow the 'CTA Sandwich' pattern with early + late CTAs?"
    Your brand pattern: Text(1s) + Product(2s) + CTA(4s)
    Test variations: ±0.5s adjustments
    Find optimal timing
-"""
-    )
-    
-    # Exercise 4: Practical Application
-    interactive_exercise(
-        "Real-World Application",
-        """
+""",
+        (
+            "Real-World Application",
+            """
 Your video has:
 - Current density: [2, 1, 3, 1, 2]
 - Text "Check this out" at 3s
@@ -293,7 +250,7 @@ Your video has:
 
 Using temporal patterns, what 3 specific changes would you recommend?
 """,
-        """
+            """
 Recommended changes based on temporal patterns:
 
 1. **Boost Opening Density** (Seconds 0-2):
@@ -316,10 +273,9 @@ Expected improvement:
 - Density pattern: [4,3,3,1,1,2,5] (viral signature)
 - 3 strategic CTAs with gesture alignment
 """
-    )
-    
-    # Module 6: Best Practices
-    display_section(
+        )
+    ),
+    (
         "MODULE 6: Best Practices & Tips",
         """
 ✅ DO's:
@@ -346,13 +302,62 @@ Expected improvement:
 💡 Remember:
 Temporal markers transform video analysis from art to science.
 Every second counts, and now we can count what's in every second!
-"""
+""",
+        None
     )
+)
+
+
+def display_section(title: str, content: str, interactive: bool = True):
+    """Display a training section"""
+    print("\n" + SEPARATOR, f"📚 {title}", SEPARATOR, content, sep="\n")
+    if interactive:
+        input("\nPress Enter to continue...")
+
+
+def interactive_exercise(title: str, question: str, answer: str, interactive: bool = True):
+    """Run an interactive exercise, or print question and answer together"""
+    print("\n" + SUBSEPARATOR, f"🎯 EXERCISE: {title}", SUBSEPARATOR, f"\n{question}", sep="\n")
+    
+    if not interactive:
+        print("\n✅ ANSWER:", answer, sep="\n")
+        return
+    
+    user_input = input("\nYour answer (or press Enter to see solution): ")
+    
+    lines = ["\n✅ SOLUTION:", answer]
+    if user_input:
+        lines.append(f"\n💭 Your answer: {user_input}")
+    print(*lines, sep="\n")
+    input("\nPress Enter to continue...")
+
+
+def run_workshop(start: int = 1, end: Optional[int] = None, interactive: bool = True):
+    """
+    Run the temporal markers training workshop, modules start..end (1-based).
+    
+    With interactive=False the content and exercise answers are printed
+    straight through without waiting for input.
+    """
+    
+    print("\n" + "🎓 TEMPORAL MARKERS TRAINING WORKSHOP 🎓".center(80),
+          SEPARATOR,
+          "Welcome to the interactive training for temporal markers!",
+          "This workshop will teach you how to interpret and use temporal data.",
+          sep="\n")
+    if interactive:
+        input("\nPress Enter to begin...")
+    
+    for title, content, exercise in WORKSHOP_SECTIONS[start - 1:end]:
+        display_section(title, content, interactive)
+        if exercise:
+            interactive_exercise(*exercise, interactive=interactive)
+    
+    if end is not None and end < len(WORKSHOP_SECTIONS):
+        return
     
     # Completion
-    print("\n" + "="*80)
-    print("🎉 WORKSHOP COMPLETE! 🎉".center(80))
-    print("="*80)
+    print("\n" + SEPARATOR, "🎉 WORKSHOP COMPLETE! 🎉".center(80), SEPARATOR, sep="\n")
     print("""
 You've learned:
 ✅ How to interpret temporal markers
@@ -374,9 +379,7 @@ you're reverse-engineering viral mechanics with scientific precision!
 
 def quick_reference():
     """Display quick reference card"""
-    print("\n" + "="*80)
-    print("📋 TEMPORAL MARKERS QUICK REFERENCE")
-    print("="*80)
+    print("\n" + SEPARATOR, "📋 TEMPORAL MARKERS QUICK REFERENCE", SEPARATOR, sep="\n")
     print("""
 DENSITY PATTERNS:
 [4,3,5,2,3] = Viral signature
@@ -412,22 +415,59 @@ PROMPT CHECKLIST:
 """)
 
 
+def offer_quick_reference(show: Optional[bool] = None):
+    """Show the quick reference card, asking first unless `show` is given"""
+    if show is None:
+        print("\nWould you like the quick reference card? (y/n)")
+        show = input().lower() == 'y'
+    if show:
+        quick_reference()
+
+
 def main():
-    print("\n🎓 TEMPORAL MARKERS TRAINING SYSTEM")
-    print("="*80)
-    print("1. Run Full Workshop (30 mins)")
-    print("2. Quick Reference Card")
-    print("3. Exit")
+    usage = (f"Usage: python temporal_training_workshop.py [--module 1-{len(WORKSHOP_SECTIONS)}] "
+             f"[--read-only] [--reference|--no-reference]")
+    # --reference/--no-reference answer the post-workshop prompt up front
+    reference_flags = {arg for arg in sys.argv[1:] if arg in ('--reference', '--no-reference')}
+    # --read-only prints everything without waiting for input
+    interactive = '--read-only' not in sys.argv[1:]
+    args = [arg for arg in sys.argv[1:] if arg not in reference_flags and arg != '--read-only']
+    show_reference = None if not reference_flags else '--reference' in reference_flags
+    if not interactive and show_reference is None:
+        show_reference = False
+    if len(reference_flags) > 1:
+        print(usage)
+        return
+    if args or not interactive:
+        if not args:
+            run_workshop(interactive=False)
+            offer_quick_reference(show_reference)
+        elif args[0] == '--module' and len(args) == 2 and args[1].isdigit() \
+                and 1 <= int(args[1]) <= len(WORKSHOP_SECTIONS):
+            run_workshop(start=int(args[1]), interactive=interactive)
+            offer_quick_reference(show_reference)
+        else:
+            print(usage)
+        return
     
-    choice = input("\nSelect option (1-3): ")
+    print("\n🎓 TEMPORAL MARKERS TRAINING SYSTEM",
+          SEPARATOR,
+          "1. Run Full Workshop (30 mins)",
+          "2. Quick Reference Card",
+          "3. Exit",
+          "4. Read-Only Workshop (no prompts, answers shown)",
+          sep="\n")
+    
+    choice = input("\nSelect option (1-4): ")
     
     if choice == "1":
         run_workshop()
-        print("\nWould you like the quick reference card? (y/n)")
-        if input().lower() == 'y':
-            quick_reference()
+        offer_quick_reference(show_reference)
     elif choice == "2":
         quick_reference()
+    elif choice == "4":
+        run_workshop(interactive=False)
+        offer_quick_reference(bool(show_reference))
     else:
         print("\nThank you for learning about temporal markers!")
 
@@ -118,8 +118,9 @@ class TestClaudeClient(unittest.TestCase):
         self.assertFalse(result.success)
         self.assertIn("timed out", result.error)
     
+    @patch('time.sleep')
     @patch('requests.Session')
-    def test_rate_limit_handling(self, mock_session_class):
+    def test_rate_limit_handling(self, mock_session_class, mock_sleep):
         """Test rate limit error handling."""
         mock_session = MagicMock()
         mock_response = Mock()
@@ -137,6 +138,25 @@ class TestClaudeClient(unittest.TestCase):
         
         self.assertFalse(result.success)
         self.assertIn("Rate limit", result.error)
+        
+        # Retry-After from the API is honoured between attempts
+        mock_sleep.assert_called_with(60.0)
+        self.assertEqual(mock_sleep.call_count, self.client.max_retries - 1)
+    
+    def test_retry_delay_backoff(self):
+        """Test jittered exponential backoff and Retry-After parsing."""
+        for attempt in range(3):
+            backoff = self.client.base_delay * (2 ** attempt)
+            delay = self.client._retry_delay(attempt)
+            self.assertGreaterEqual(delay, backoff / 2)
+            self.assertLessEqual(delay, backoff)
+        
+        self.assertEqual(self.client._retry_delay(0, '2'), 2.0)
+        self.assertEqual(self.client._retry_delay(0, '3600'), self.client.max_delay)
+        # A date in the past means retry now
+        self.assertEqual(self.client._retry_delay(0, 'Wed, 21 Oct 2015 07:28:00 GMT'), 0.0)
+        # Unparseable values fall back to backoff
+        self.assertLessEqual(self.client._retry_delay(0, 'soon'), self.client.base_delay)
     
     @patch('requests.Session')
     def test_successful_request(self, mock_session_class):
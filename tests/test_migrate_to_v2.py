@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Smoke test for the v1 to v2 migration script.
+"""
+import unittest
+import tempfile
+import shutil
+import json
+import sys
+import os
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from migrate_to_v2 import RumiAIMigrator
+from rumiai_v2.core.models import UnifiedAnalysis
+
+FIXTURE_PATH = Path(__file__).parent / "fixtures" / "v1_unified_analysis.json"
+
+
+class TestMigrateToV2(unittest.TestCase):
+    """Test migrating a v1 unified analysis end to end."""
+
+    def setUp(self):
+        """Lay out a v1 data directory in a temporary working directory."""
+        self.work_dir = tempfile.mkdtemp()
+        self.old_cwd = os.getcwd()
+        os.chdir(self.work_dir)
+        Path("unified_analysis").mkdir()
+        shutil.copy(FIXTURE_PATH, "unified_analysis/v1_fixture_456.json")
+
+    def tearDown(self):
+        """Restore the working directory and remove the temporary one."""
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.work_dir)
+
+    def test_migrates_unified_analysis(self):
+        """Test that a v1 file is converted, saved and backed up."""
+        migrator = RumiAIMigrator(backup=True, workers=1,
+                                  migration_ts='2024-01-01T00:00:00Z')
+        stats = migrator.migrate_all()
+
+        self.assertEqual(stats['files_found'], 1)
+        self.assertEqual(stats['files_migrated'], 1)
+        self.assertEqual(stats['files_failed'], 0)
+        self.assertEqual(stats['backups_created'], 1)
+        self.assertTrue(Path("unified_analysis/v1_fixture_456.json.v1_backup").exists())
+
+        v2_path = Path("rumiai_v2_data/unified/v1_fixture_456.json")
+        with open(v2_path) as f:
+            saved = json.load(f)
+
+        self.assertEqual(saved['video_id'], 'v1_fixture_456')
+        self.assertEqual(saved['metadata']['author'], 'testuser')
+        self.assertEqual(saved['duration'], 30.0)
+        self.assertEqual(saved['processing_metadata']['created_at'], '2024-01-01T00:00:00Z')
+        self.assertEqual(saved['objectDetection'], {'objects': ['person', 'bottle']})
+        self.assertTrue(saved['pipeline_status']['whisper'])
+
+        # The event with an unparseable timestamp is dropped
+        entries = saved['timeline']['entries']
+        self.assertEqual([e['entry_type'] for e in entries], ['start', 'scene_change'])
+        self.assertEqual(entries[0]['data']['confidence'], 1.0)
+        self.assertEqual(entries[1]['start'], '12s')
+        self.assertEqual(entries[1]['data']['metadata'], {'transition_type': 'cut'})
+
+        # The saved file loads back through the model
+        analysis = UnifiedAnalysis.load_from_file(str(v2_path))
+        self.assertEqual(analysis.video_id, 'v1_fixture_456')
+
+    def test_dry_run_writes_nothing(self):
+        """Test that a dry run converts without saving or backing up."""
+        stats = RumiAIMigrator(workers=1).migrate_all(dry_run=True)
+
+        self.assertEqual(stats['files_migrated'], 1)
+        self.assertEqual(stats['backups_created'], 0)
+        self.assertFalse(Path("rumiai_v2_data").exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
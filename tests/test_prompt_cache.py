@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test suite for the on-disk prompt result cache.
+"""
+import unittest
+import tempfile
+import shutil
+import sys
+import os
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from rumiai_v2.utils import PromptResultCache
+from rumiai_v2.core.models import PromptResult, PromptType
+
+
+class TestPromptResultCache(unittest.TestCase):
+    """Test prompt result caching by prompt content."""
+
+    def setUp(self):
+        """Create a cache in a temporary directory."""
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = PromptResultCache(Path(self.cache_dir))
+        self.result = PromptResult(
+            prompt_type=PromptType.SCENE_PACING,
+            success=True,
+            response='{"pacing": "fast"}',
+            tokens_used=120,
+            estimated_cost=0.002
+        )
+
+    def tearDown(self):
+        """Remove the temporary cache directory."""
+        shutil.rmtree(self.cache_dir)
+
+    def test_round_trip(self):
+        """Test that a stored result comes back unchanged."""
+        self.cache.set('scene_pacing', 'model-a', 'prompt text', self.result)
+        cached = self.cache.get('scene_pacing', 'model-a', 'prompt text')
+
+        self.assertIsNotNone(cached)
+        self.assertEqual(cached.prompt_type, PromptType.SCENE_PACING)
+        self.assertEqual(cached.response, self.result.response)
+        self.assertEqual(cached.tokens_used, 120)
+        self.assertEqual(cached.timestamp, self.result.timestamp)
+
+    def test_key_includes_prompt_and_model(self):
+        """Test that a different prompt text or model misses."""
+        self.cache.set('scene_pacing', 'model-a', 'prompt text', self.result)
+
+        self.assertIsNone(self.cache.get('scene_pacing', 'model-a', 'other text'))
+        self.assertIsNone(self.cache.get('scene_pacing', 'model-b', 'prompt text'))
+
+    def test_failed_results_not_cached(self):
+        """Test that failures are always retried."""
+        failed = PromptResult(prompt_type=PromptType.SCENE_PACING, success=False, error='timeout')
+        self.cache.set('scene_pacing', 'model-a', 'prompt text', failed)
+
+        self.assertIsNone(self.cache.get('scene_pacing', 'model-a', 'prompt text'))
+
+    def test_expired_entry_is_a_miss(self):
+        """Test that entries older than the TTL are ignored."""
+        cache = PromptResultCache(Path(self.cache_dir), ttl=60)
+        cache.set('scene_pacing', 'model-a', 'prompt text', self.result)
+        self.assertIsNotNone(cache.get('scene_pacing', 'model-a', 'prompt text'))
+
+        old = time.time() - 120
+        for path in Path(self.cache_dir).rglob('*.json'):
+            os.utime(path, (old, old))
+
+        self.assertIsNone(cache.get('scene_pacing', 'model-a', 'prompt text'))
+        self.assertIsNotNone(self.cache.get('scene_pacing', 'model-a', 'prompt text'))
+
+    def test_version_bump_invalidates(self):
+        """Test that a different cache version misses."""
+        self.cache.set('scene_pacing', 'model-a', 'prompt text', self.result)
+        bumped = PromptResultCache(Path(self.cache_dir), version='2')
+
+        self.assertIsNone(bumped.get('scene_pacing', 'model-a', 'prompt text'))
+
+    def test_corrupt_entry_is_a_miss(self):
+        """Test that an unreadable entry falls back to a miss."""
+        self.cache.set('scene_pacing', 'model-a', 'prompt text', self.result)
+        for path in Path(self.cache_dir).rglob('*.json'):
+            path.write_text('{not json')
+
+        self.assertIsNone(self.cache.get('scene_pacing', 'model-a', 'prompt text'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -62,6 +62,7 @@ class TestTemporalMonitoring:
         metrics = monitor.get_current_metrics()
         assert metrics['claude_requests_with_markers'] == 1
         assert metrics['claude_requests_without_markers'] == 0
+        assert metrics['total_claude_requests'] == 1
         assert metrics['temporal_marker_adoption'] == 1.0
         assert metrics['rollout_decisions']['included'] == 1
     
@@ -204,4 +205,39 @@ class TestTemporalMonitoring:
         
         metrics = monitor.get_current_metrics()
         assert metrics['api_error_rate'] == 0.2  # 2/10 = 20%
-        assert len(metrics['api_errors']) == 2
\ No newline at end of file
+        assert len(metrics['api_errors']) == 2
+    
+    def test_derived_metrics_cached_until_next_event(self, monitor):
+        """Test derived metrics are reused until a new event is recorded"""
+        monitor.record_extraction("test_1", True, 2.0, marker_size_kb=40.0)
+        
+        health = monitor.check_rollout_health()
+        assert monitor.check_rollout_health() is health
+        assert monitor.get_current_metrics()['extraction_count'] == 1
+        
+        monitor.record_extraction("test_2", True, 4.0, marker_size_kb=60.0)
+        
+        assert monitor.check_rollout_health() is not health
+        metrics = monitor.get_current_metrics()
+        assert metrics['extraction_count'] == 2
+        assert metrics['avg_marker_size_kb'] == 50.0
+    
+    def test_api_errors_bounded(self, monitor):
+        """Test only recent API errors are kept while the rate counts all of them"""
+        from python.temporal_monitoring import MAX_RECENT_API_ERRORS
+        
+        total = MAX_RECENT_API_ERRORS + 20
+        for i in range(total):
+            monitor.record_claude_request(
+                f"test_fail_{i}", "hook_analysis", True, "included", 100.0, False,
+                error="Rate limit exceeded"
+            )
+        
+        metrics = monitor.get_current_metrics()
+        assert len(metrics['api_errors']) == MAX_RECENT_API_ERRORS
+        assert metrics['api_errors'][-1]['video_id'] == f"test_fail_{total - 1}"
+        assert metrics['api_error_rate'] == 1.0
+        
+        monitor.save_session_metrics()
+        saved = json.loads((monitor.metrics_dir / "historical_metrics.json").read_text())
+        assert len(saved['sessions'][0]['api_errors']) == MAX_RECENT_API_ERRORS
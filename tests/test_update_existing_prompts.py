@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test suite for the temporal prompt template helpers.
+"""
+import unittest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from update_existing_prompts import (
+    PROMPT_TEMPLATES, TEMPLATE_RENDERERS, compile_template, split_template,
+    build_messages, build_batched_prompt, parse_batched_response
+)
+
+
+class TestCompileTemplate(unittest.TestCase):
+    """Test template compilation and rendering."""
+
+    def test_fills_fields(self):
+        """Test that {identifier} fields are substituted."""
+        render = compile_template("Density: {density} at {peak}s")
+        self.assertEqual(render(density=3.5, peak=12), "Density: 3.5 at 12s")
+
+    def test_braces_in_prose_are_kept(self):
+        """Test that braces around non-identifiers are left as text."""
+        template = "Early CTAs: {list with timestamps}\nMoments: {text_moments, gesture_moments}"
+        self.assertEqual(compile_template(template)(), template)
+
+    def test_missing_field_raises_key_error(self):
+        """Test that a missing field raises KeyError like str.format."""
+        render = compile_template("A {first} and {second}")
+        with self.assertRaises(KeyError):
+            render(first='x')
+
+    def test_renderers_match_format(self):
+        """Test that precompiled renderers agree with str.format."""
+        render = TEMPLATE_RENDERERS['timestamp_correlation']
+        expected = PROMPT_TEMPLATES['timestamp_correlation'].format(data_a='[1, 2]', data_b='[3]')
+        self.assertEqual(render(data_a='[1, 2]', data_b='[3]'), expected)
+
+
+class TestSplitTemplate(unittest.TestCase):
+    """Test the static/dynamic split used for prompt caching."""
+
+    def test_prefix_stops_at_first_field(self):
+        """Test that the static prefix ends before the first field."""
+        static, render_rest = split_template("Instructions.\nData: {data}\nEnd {note}")
+        self.assertEqual(static, "Instructions.\nData: ")
+        self.assertEqual(render_rest(data='[1]', note='!'), "[1]\nEnd !")
+
+    def test_template_without_fields_is_all_static(self):
+        """Test that a template with no fields has an empty dynamic part."""
+        static, render_rest = split_template("Only {prose here}.")
+        self.assertEqual(static, "Only {prose here}.")
+        self.assertEqual(render_rest(), "")
+
+    def test_build_messages_blocks(self):
+        """Test that the static block is cached and dynamic text follows."""
+        blocks = build_messages('creative_density', context='{"a": 1}',
+                                density_progression='[1, 2, 3]')
+        self.assertEqual(len(blocks), 2)
+        self.assertEqual(blocks[0]['cache_control'], {'type': 'ephemeral'})
+        self.assertTrue(blocks[0]['text'].endswith('**Density Progression**: '))
+        self.assertTrue(blocks[1]['text'].startswith('[1, 2, 3]'))
+        self.assertTrue(blocks[1]['text'].endswith('CONTEXT DATA:\n{"a": 1}'))
+        self.assertNotIn('cache_control', blocks[1])
+
+    def test_build_messages_skips_empty_dynamic_block(self):
+        """Test that no empty text block is produced."""
+        blocks = build_messages('cta_effectiveness')
+        self.assertEqual(len(blocks), 1)
+        self.assertIn('{list with timestamps}', blocks[0]['text'])
+
+
+class TestBatchedPrompts(unittest.TestCase):
+    """Test building and parsing multi-video prompts."""
+
+    def test_build_batched_prompt(self):
+        """Test that each video gets a numbered section."""
+        prompt = build_batched_prompt('creative_density',
+                                      [{'density_progression': [1]}, {'density_progression': [2]}])
+        self.assertIn("(see density_progression for each video below)", prompt)
+        self.assertIn("### Video 1:", prompt)
+        self.assertIn("### Video 2:", prompt)
+        self.assertIn("Return a JSON array of 2 analyses", prompt)
+
+    def test_parse_fenced_array(self):
+        """Test that an array inside a fenced code block is parsed."""
+        text = 'Here you go:\n```json\n[{"score": 7}, {"score": 4}]\n```'
+        self.assertEqual(parse_batched_response(text, 2), [{'score': 7}, {'score': 4}])
+
+    def test_short_array_raises(self):
+        """Test that an array with too few results is rejected."""
+        with self.assertRaises(ValueError):
+            parse_batched_response('[{"score": 7}]', 2)
+
+    def test_missing_array_raises(self):
+        """Test that a response without a JSON array is rejected."""
+        with self.assertRaises(ValueError):
+            parse_batched_response('No analysis available.', 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,18 +4,21 @@ Update existing prompts to leverage temporal markers
 Shows before/after examples and provides updated versions
 """
 
+import functools
 import json
+import re
 from pathlib import Path
 from prompts.temporal_aware_prompts import TemporalAwarePrompts
 
 
-# Example existing prompts that could be enhanced
+# Example existing prompts that could be enhanced; 'enhanced' is the prompt
+# text or a builder for it, resolved on first use by enhanced_prompt()
 EXISTING_PROMPTS = {
     'hook_analysis': {
         'original': """Analyze the hook effectiveness in the first 3 seconds of this TikTok video. 
 Consider what elements appear early to grab attention and how well they work.""",
         
-        'enhanced': TemporalAwarePrompts.hook_effectiveness(),
+        'enhanced': TemporalAwarePrompts.hook_effectiveness,
         
         'key_improvements': [
             "Now references specific density progression data",
@@ -29,7 +32,7 @@ Consider what elements appear early to grab attention and how well they work."""
         'original': """Identify all engagement tactics used in this TikTok video. 
 Focus on psychological triggers, visual techniques, and viewer retention strategies.""",
         
-        'enhanced': TemporalAwarePrompts.engagement_tactics(),
+        'enhanced': TemporalAwarePrompts.engagement_tactics,
         
         'key_improvements': [
             "Analyzes pacing through density patterns",
@@ -80,7 +83,7 @@ Provide specific density values and timestamps for all findings.""",
         'original': """Describe the emotional journey of the video and how it engages viewers 
 emotionally throughout its duration.""",
         
-        'enhanced': TemporalAwarePrompts.emotional_journey_mapping(),
+        'enhanced': TemporalAwarePrompts.emotional_journey_mapping,
         
         'key_improvements': [
             "Tracks exact emotion sequence with timestamps",
@@ -134,6 +137,173 @@ Rate current CTA strategy (1-10) with specific timestamp-based improvements.""",
 }
 
 
+# Reusable templates; [BRACKETED] parts are filled in by hand, {fields} per video
+PROMPT_TEMPLATES = {
+    'density_analysis': """
+[TASK]: Analyze [ASPECT] using density progression data.
+
+Examine:
+1. Density values: {density_progression}
+2. Peak moments: When and why do spikes occur?
+3. Patterns: Does this match known [PATTERN_TYPE] patterns?
+4. Optimization: How could density be adjusted for [GOAL]?
+
+Provide specific second-by-second analysis.
+""",
+    
+    'timestamp_correlation': """
+[TASK]: Identify when [EVENT_A] and [EVENT_B] occur together.
+
+Analyze:
+1. [EVENT_A] timestamps: {data_a}
+2. [EVENT_B] timestamps: {data_b}  
+3. Synchronization: Which events align within 0.5s?
+4. Impact: What's the effect of synchronization?
+5. Opportunities: Where could better alignment help?
+
+List all correlations with exact timestamps.
+""",
+    
+    'pattern_matching': """
+[TASK]: Match this video against [PATTERN_NAME] pattern.
+
+Pattern definition: [PATTERN_FORMULA]
+Video data: {temporal_markers}
+
+Check:
+1. Does the video follow this pattern?
+2. Where does it deviate? (timestamps)
+3. How strong is the match? (1-10)
+4. What adjustments would perfect the pattern?
+
+Provide timestamp-specific analysis.
+""",
+    
+    'temporal_optimization': """
+[TASK]: Optimize [METRIC] using temporal data.
+
+Current state:
+- Density: {density_progression}
+- Key moments: {text_moments, gesture_moments}
+- Performance: [CURRENT_METRIC]
+
+Recommend:
+1. Specific timestamp adjustments
+2. Element additions/removals with timing
+3. Density modifications by second
+4. Expected improvement: X% → Y%
+
+Focus on actionable, timestamp-based changes.
+"""
+}
+
+
+# {identifier} placeholders; other braces ({list with timestamps}) are prose
+TEMPLATE_FIELD = re.compile(r'\{(\w+)\}')
+
+
+def compile_template(template: str):
+    """
+    Split a template once into literal text and field names.
+    
+    The returned render(**fields) only joins strings, so a prompt rendered
+    for thousands of videos is parsed a single time. Missing fields raise
+    KeyError, as with str.format.
+    """
+    parts = TEMPLATE_FIELD.split(template)
+    literals, fields = parts[0::2], parts[1::2]
+    
+    def render(**values) -> str:
+        pieces = [literals[0]]
+        for field, literal in zip(fields, literals[1:]):
+            pieces.append(str(values[field]))
+            pieces.append(literal)
+        return ''.join(pieces)
+    
+    return render
+
+
+@functools.cache
+def enhanced_prompt(prompt_name: str) -> str:
+    """Enhanced prompt text, built the first time it is asked for"""
+    enhanced = EXISTING_PROMPTS[prompt_name]['enhanced']
+    return enhanced() if callable(enhanced) else enhanced
+
+
+@functools.cache
+def enhanced_renderer(prompt_name: str):
+    """Compiled renderer for an enhanced prompt, built on first use"""
+    return compile_template(enhanced_prompt(prompt_name))
+
+
+# Template renderers compiled at import, keyed like PROMPT_TEMPLATES
+TEMPLATE_RENDERERS = {name: compile_template(template)
+                      for name, template in PROMPT_TEMPLATES.items()}
+
+
+def split_template(template: str):
+    """(static prefix, renderer for the rest); the prefix is the same for every video"""
+    match = TEMPLATE_FIELD.search(template)
+    cut = match.start() if match else len(template)
+    return template[:cut], compile_template(template[cut:])
+
+
+@functools.cache
+def cacheable_prompt(prompt_name: str):
+    """split_template() of an enhanced prompt, computed once"""
+    return split_template(enhanced_prompt(prompt_name))
+
+
+def build_messages(prompt_name: str, context: str = '', **fields) -> list:
+    """
+    Build an enhanced prompt as Anthropic content blocks, static text first.
+    
+    The instruction text before the first per-video field is marked with
+    cache_control so repeated calls reuse the cached prefix; the rendered
+    remainder and any context data follow uncached. Usable as the `system`
+    array or as user message content.
+    """
+    static, render_rest = cacheable_prompt(prompt_name)
+    dynamic = render_rest(**fields)
+    if context:
+        dynamic = f"{dynamic}\n\nCONTEXT DATA:\n{context}"
+    blocks = [{'type': 'text', 'text': static, 'cache_control': {'type': 'ephemeral'}}]
+    if dynamic.strip():  # the API rejects empty text blocks
+        blocks.append({'type': 'text', 'text': dynamic})
+    return blocks
+
+
+def build_batched_prompt(prompt_name: str, videos: list) -> str:
+    """
+    One prompt asking for the same analysis of several videos at once.
+    
+    `videos` holds each video's field values (e.g. its temporal markers).
+    The instructions are sent once, with per-video fields pointing at the
+    numbered video sections, and the answer is requested as a JSON array
+    in video order (see parse_batched_response).
+    """
+    template = enhanced_prompt(prompt_name)
+    fields = {field: f"(see {field} for each video below)"
+              for field in TEMPLATE_FIELD.findall(template)}
+    sections = [enhanced_renderer(prompt_name)(**fields)]
+    for i, video in enumerate(videos, 1):
+        sections.append(f"### Video {i}:\n{json.dumps(video, indent=2)}")
+    sections.append(f"Return a JSON array of {len(videos)} analyses, where index i "
+                    f"corresponds to Video i+1. Return only the JSON array.")
+    return "\n\n".join(sections)
+
+
+def parse_batched_response(response_text: str, video_count: int) -> list:
+    """Split a batched response back into one result per video"""
+    start, end = response_text.find('['), response_text.rfind(']')
+    if start == -1 or end < start:
+        raise ValueError("Batched response contains no JSON array")
+    results = json.loads(response_text[start:end + 1])
+    if len(results) != video_count:
+        raise ValueError(f"Expected {video_count} results, got {len(results)}")
+    return results
+
+
 def show_prompt_evolution():
     """Show how prompts evolve with temporal awareness"""
     
@@ -150,7 +320,7 @@ def show_prompt_evolution():
         
         print("\n✅ ENHANCED TEMPORAL PROMPT:")
         # Show first 400 chars for brevity
-        enhanced = prompt_data['enhanced']
+        enhanced = enhanced_prompt(prompt_name)
         if len(enhanced) > 400:
             print(enhanced[:400] + "...\n[Full prompt contains detailed temporal analysis instructions]")
         else:
@@ -220,66 +390,7 @@ def create_prompt_templates():
     print("🏗️ REUSABLE TEMPORAL PROMPT TEMPLATES")
     print("="*80)
     
-    templates = {
-        'density_analysis': """
-[TASK]: Analyze [ASPECT] using density progression data.
-
-Examine:
-1. Density values: {density_progression}
-2. Peak moments: When and why do spikes occur?
-3. Patterns: Does this match known [PATTERN_TYPE] patterns?
-4. Optimization: How could density be adjusted for [GOAL]?
-
-Provide specific second-by-second analysis.
-""",
-        
-        'timestamp_correlation': """
-[TASK]: Identify when [EVENT_A] and [EVENT_B] occur together.
-
-Analyze:
-1. [EVENT_A] timestamps: {data_a}
-2. [EVENT_B] timestamps: {data_b}  
-3. Synchronization: Which events align within 0.5s?
-4. Impact: What's the effect of synchronization?
-5. Opportunities: Where could better alignment help?
-
-List all correlations with exact timestamps.
-""",
-        
-        'pattern_matching': """
-[TASK]: Match this video against [PATTERN_NAME] pattern.
-
-Pattern definition: [PATTERN_FORMULA]
-Video data: {temporal_markers}
-
-Check:
-1. Does the video follow this pattern?
-2. Where does it deviate? (timestamps)
-3. How strong is the match? (1-10)
-4. What adjustments would perfect the pattern?
-
-Provide timestamp-specific analysis.
-""",
-        
-        'temporal_optimization': """
-[TASK]: Optimize [METRIC] using temporal data.
-
-Current state:
-- Density: {density_progression}
-- Key moments: {text_moments, gesture_moments}
-- Performance: [CURRENT_METRIC]
-
-Recommend:
-1. Specific timestamp adjustments
-2. Element additions/removals with timing
-3. Density modifications by second
-4. Expected improvement: X% → Y%
-
-Focus on actionable, timestamp-based changes.
-"""
-    }
-    
-    for template_name, template in templates.items():
+    for template_name, template in PROMPT_TEMPLATES.items():
         print(f"\n📄 {template_name.upper()} TEMPLATE:")
         print(template)
 
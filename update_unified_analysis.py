@@ -3,11 +3,16 @@
 Update unified analysis with all available data
 """
 
-import json
+import argparse
+import os
 import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
+from rumiai_v2.json_io import dumps_json, loads_json
+
 # Import temporal marker integration
 try:
     from python.temporal_marker_integration import TemporalMarkerPipeline
@@ -16,18 +21,51 @@ except ImportError:
     TEMPORAL_MARKERS_AVAILABLE = False
     print("⚠️  Temporal markers module not available")
 
+def list_files(directory) -> set:
+    """Names in `directory` from a single scandir; empty if it doesn't exist"""
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries}
+    except (FileNotFoundError, NotADirectoryError):
+        return set()
+
+
+# One 'last_updated' stamp per run, shared by every video updated in it
+RUN_TIMESTAMP = datetime.now().isoformat()
+
+# Skip pretty-printing unified files (about half the write cost) in production runs
+COMPACT_JSON = os.getenv('RUMIAI_COMPACT_JSON', 'false').lower() == 'true'
+
+
+def load_json(path):
+    """Read a JSON file"""
+    return loads_json(Path(path).read_bytes())
+
+
+def dump_json(data, path):
+    """
+    Write data as JSON.
+    
+    The file is written aside and renamed into place, so readers never see
+    a partial write. Output is indented unless RUMIAI_COMPACT_JSON=true.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    tmp_path.write_bytes(dumps_json(data, indent=None if COMPACT_JSON else 2))
+    os.replace(tmp_path, path)
+
 
 def update_unified_analysis(video_id):
     """Update unified analysis with all available data sources"""
     
     unified_path = Path(f'unified_analysis_{video_id}.json')
-    if not unified_path.exists():
-        print(f"❌ Unified analysis not found: {unified_path}")
-        return False
     
     # Load existing unified analysis
-    with open(unified_path, 'r') as f:
-        unified = json.load(f)
+    try:
+        unified = load_json(unified_path)
+    except FileNotFoundError:
+        print(f"❌ Unified analysis not found: {unified_path}")
+        return False
     
     print(f"📋 Updating unified analysis for {video_id}")
     
@@ -37,55 +75,59 @@ def update_unified_analysis(video_id):
         f'outputs/tiktok_profiles/{video_id}_metadata.json'
     ]
     
+    # Opening directly costs one syscall per candidate instead of stat + open
     for path in metadata_paths:
-        if Path(path).exists():
-            with open(path, 'r') as f:
-                metadata = json.load(f)
-                
-            # Update static metadata
-            unified['static_metadata'] = {
-                'captionText': metadata.get('text', ''),
-                'hashtags': [h['name'] for h in metadata.get('hashtags', []) if h.get('name')],
-                'duration': metadata.get('videoMeta', {}).get('duration', 0),
-                'createTime': metadata.get('createTimeISO'),
-                'author': metadata.get('authorMeta', {}),
-                'stats': {
-                    'views': metadata.get('playCount', 0),
-                    'likes': metadata.get('diggCount', 0),
-                    'comments': metadata.get('commentCount', 0),
-                    'shares': metadata.get('shareCount', 0),
-                    'saves': metadata.get('collectCount', 0),
-                    'engagementRate': (metadata.get('diggCount', 0) / max(metadata.get('playCount', 1), 1)) * 100
-                },
-                'music': metadata.get('musicMeta', {})
-            }
-            
-            # Update video info
-            video_meta = metadata.get('videoMeta', {})
-            unified['video_info'] = {
-                'width': video_meta.get('width', 0),
-                'height': video_meta.get('height', 0),
-                'duration': video_meta.get('duration', 0),
-                'format': video_meta.get('format', 'mp4')
-            }
-            
-            print("   ✅ Updated with TikTok metadata")
-            break
+        try:
+            metadata = load_json(path)
+        except FileNotFoundError:
+            continue
+        
+        # Update static metadata
+        views = metadata.get('playCount', 0)
+        likes = metadata.get('diggCount', 0)
+        unified['static_metadata'] = {
+            'captionText': metadata.get('text', ''),
+            'hashtags': [h['name'] for h in metadata.get('hashtags', []) if h.get('name')],
+            'duration': metadata.get('videoMeta', {}).get('duration', 0),
+            'createTime': metadata.get('createTimeISO'),
+            'author': metadata.get('authorMeta', {}),
+            'stats': {
+                'views': views,
+                'likes': likes,
+                'comments': metadata.get('commentCount', 0),
+                'shares': metadata.get('shareCount', 0),
+                'saves': metadata.get('collectCount', 0),
+                'engagementRate': (likes / max(views, 1)) * 100
+            },
+            'music': metadata.get('musicMeta', {})
+        }
+        
+        # Update video info
+        video_meta = metadata.get('videoMeta', {})
+        unified['video_info'] = {
+            'width': video_meta.get('width', 0),
+            'height': video_meta.get('height', 0),
+            'duration': video_meta.get('duration', 0),
+            'format': video_meta.get('format', 'mp4')
+        }
+        
+        print("   ✅ Updated with TikTok metadata")
+        break
+    
+    # One directory scan tells which of the analysis files below exist
+    analysis_dir = Path(f'downloads/analysis/{video_id}')
+    analysis_files = list_files(analysis_dir)
     
     # 2. Load local analysis
-    analysis_path = Path(f'downloads/analysis/{video_id}/complete_analysis.json')
-    if not analysis_path.exists():
-        analysis_path = Path(f'downloads/analysis/{video_id}/basic_analysis.json')
+    analysis_path = analysis_dir / 'complete_analysis.json'
+    if analysis_path.name not in analysis_files:
+        analysis_path = analysis_dir / 'basic_analysis.json'
     
-    if analysis_path.exists():
-        with open(analysis_path, 'r') as f:
-            analysis = json.load(f)
+    if analysis_path.name in analysis_files:
+        analysis = load_json(analysis_path)
         
         # Merge timelines
-        if 'timelines' in analysis:
-            for timeline_type, timeline_data in analysis['timelines'].items():
-                if timeline_data:  # Only add non-empty timelines
-                    unified['timelines'][timeline_type] = timeline_data
+        merge_timelines(unified['timelines'], analysis.get('timelines', {}))
         
         # Add analysis metadata
         unified['local_analysis'] = {
@@ -98,10 +140,9 @@ def update_unified_analysis(video_id):
         print("   ✅ Updated with local analysis")
     
     # 3. Load PySceneDetect results if available
-    scene_path = Path(f'downloads/analysis/{video_id}/scene_detection.json')
-    if scene_path.exists():
-        with open(scene_path, 'r') as f:
-            scenes = json.load(f)
+    scene_path = analysis_dir / 'scene_detection.json'
+    if scene_path.name in analysis_files:
+        scenes = load_json(scene_path)
         
         # Add scene detection timeline
         if 'scenes' in scenes:
@@ -116,16 +157,12 @@ def update_unified_analysis(video_id):
         print("   ✅ Updated with PySceneDetect results")
     
     # 4. Load enhanced human analyzer data if available
-    enhanced_path = Path(f'downloads/analysis/{video_id}/enhanced_human_analysis.json')
-    if enhanced_path.exists():
-        with open(enhanced_path, 'r') as f:
-            enhanced = json.load(f)
+    enhanced_path = analysis_dir / 'enhanced_human_analysis.json'
+    if enhanced_path.name in analysis_files:
+        enhanced = load_json(enhanced_path)
         
         # Merge enhanced timelines
-        if 'timelines' in enhanced:
-            for timeline_type, timeline_data in enhanced['timelines'].items():
-                if timeline_data:
-                    unified['timelines'][timeline_type] = timeline_data
+        merge_timelines(unified['timelines'], enhanced.get('timelines', {}))
         
         unified['enhanced_analysis'] = {
             'analyzed': True,
@@ -160,7 +197,7 @@ def update_unified_analysis(video_id):
     unified['insights'] = calculate_insights(unified)
     
     # 7. Update metadata
-    unified['last_updated'] = datetime.now().isoformat()
+    unified['last_updated'] = RUN_TIMESTAMP
     unified['data_sources'] = {
         'tiktok_metadata': bool(unified.get('static_metadata', {}).get('author')),
         'local_analysis': 'local_analysis' in unified,
@@ -170,22 +207,27 @@ def update_unified_analysis(video_id):
     }
     
     # Save updated unified analysis
-    with open(unified_path, 'w') as f:
-        json.dump(unified, f, indent=2)
+    dump_json(unified, unified_path)
     
     print(f"✅ Unified analysis updated: {unified_path}")
     return True
 
 
+def merge_timelines(timelines, new_timelines):
+    """Copy the non-empty entries of `new_timelines` into `timelines`"""
+    timelines.update({timeline_type: timeline_data
+                      for timeline_type, timeline_data in new_timelines.items()
+                      if timeline_data})
+
+
 def process_scene_changes(scenes):
     """Convert scene detection results to timeline format"""
     timeline = {}
-    for i, scene in enumerate(scenes):
+    for scene_number, scene in enumerate(scenes, 1):
         start_time = scene.get('start_time', 0)
         end_time = scene.get('end_time', start_time + 1)
-        time_key = f"{start_time:.1f}-{end_time:.1f}s"
-        timeline[time_key] = {
-            'scene_number': i + 1,
+        timeline[f"{start_time:.1f}-{end_time:.1f}s"] = {
+            'scene_number': scene_number,
             'start_time': start_time,
             'end_time': end_time,
             'duration': scene.get('duration', end_time - start_time),
@@ -210,69 +252,81 @@ def calculate_insights(unified):
     }
     
     timelines = unified.get('timelines', {})
-    duration = unified.get('duration_seconds', 1)
-    
-    # Timeline statistics
+    duration = max(unified.get('duration_seconds', 1), 1)  # per-second rates divide by this
+    
+    # Timeline statistics; counts are kept in locals for the rates below
+    text_count = len(timelines.get('textOverlayTimeline', ()))
+    object_count = len(timelines.get('objectTimeline', ()))
+    gesture_count = len(timelines.get('gestureTimeline', ()))
+    expression_count = len(timelines.get('expressionTimeline', ()))
+    sticker_count = len(timelines.get('stickerTimeline', ()))
+    scene_change_count = len(timelines.get('sceneChangeTimeline', ()))
     insights['timelineStats'] = {
-        'textOverlayCount': len(timelines.get('textOverlayTimeline', {})),
-        'objectDetectionCount': len(timelines.get('objectTimeline', {})),
-        'gestureCount': len(timelines.get('gestureTimeline', {})),
-        'expressionCount': len(timelines.get('expressionTimeline', {})),
-        'speechSegmentCount': len(timelines.get('speechTimeline', {})),
-        'stickerCount': len(timelines.get('stickerTimeline', {})),
-        'sceneChangeCount': len(timelines.get('sceneChangeTimeline', {}))
+        'textOverlayCount': text_count,
+        'objectDetectionCount': object_count,
+        'gestureCount': gesture_count,
+        'expressionCount': expression_count,
+        'speechSegmentCount': len(timelines.get('speechTimeline', ())),
+        'stickerCount': sticker_count,
+        'sceneChangeCount': scene_change_count
     }
     
-    # Count objects from object timeline
-    object_counts = {}
-    for timestamp, data in timelines.get('objectTimeline', {}).items():
-        objects = data.get('objects', []) if isinstance(data, dict) else []
-        for obj in objects:
-            if isinstance(obj, dict):
-                obj_name = obj.get('class', obj.get('object', 'unknown'))
-                object_counts[obj_name] = object_counts.get(obj_name, 0) + 1
+    # Count objects from object timeline; a single Counter() over the whole
+    # timeline runs the tally in C, and most_common(k) only heap-selects the top k.
+    # Entries and objects are dicts per the timeline schema, so that is assumed
+    # first; anything else raises and the checked count runs instead
+    object_timeline = timelines.get('objectTimeline', {})
+    try:
+        object_counts = Counter(
+            obj['class'] if 'class' in obj else obj.get('object', 'unknown')
+            for data in object_timeline.values()
+            for obj in data.get('objects', ())
+        )
+    except (TypeError, AttributeError):
+        object_counts = Counter(
+            obj.get('class', obj.get('object', 'unknown'))
+            for data in object_timeline.values() if isinstance(data, dict)
+            for obj in data.get('objects', ()) if isinstance(obj, dict)
+        )
     
     # Get top objects
     if object_counts:
-        sorted_objects = sorted(object_counts.items(), key=lambda x: x[1], reverse=True)
-        insights['primaryObjects'] = [obj[0] for obj in sorted_objects[:5]]
+        insights['primaryObjects'] = [name for name, _ in object_counts.most_common(5)]
         insights['objectDiversity'] = len(object_counts)
     
-    # Count expressions
-    expression_counts = {}
-    for timestamp, data in timelines.get('expressionTimeline', {}).items():
-        if isinstance(data, dict) and 'expressions' in data:
-            for expr in data['expressions']:
-                if isinstance(expr, dict):
-                    expr_name = expr.get('expression', 'neutral')
-                    expression_counts[expr_name] = expression_counts.get(expr_name, 0) + 1
+    # Count expressions, again trying the schema-conforming fast path first
+    expression_timeline = timelines.get('expressionTimeline', {})
+    try:
+        expression_counts = Counter(
+            expr.get('expression', 'neutral')
+            for data in expression_timeline.values()
+            for expr in data.get('expressions', ())
+        )
+    except (TypeError, AttributeError):
+        expression_counts = Counter(
+            expr.get('expression', 'neutral')
+            for data in expression_timeline.values()
+            if isinstance(data, dict) and 'expressions' in data
+            for expr in data['expressions'] if isinstance(expr, dict)
+        )
     
     if expression_counts:
-        sorted_expressions = sorted(expression_counts.items(), key=lambda x: x[1], reverse=True)
-        insights['dominantExpressions'] = [expr[0] for expr in sorted_expressions[:3]]
+        insights['dominantExpressions'] = [name for name, _ in expression_counts.most_common(3)]
     
     # Calculate frequencies
-    insights['textOverlayFrequency'] = insights['timelineStats']['textOverlayCount'] / max(duration, 1)
-    insights['gestureCount'] = insights['timelineStats']['gestureCount']
+    insights['textOverlayFrequency'] = text_count / duration
+    insights['gestureCount'] = gesture_count
     
     # Calculate creative density (elements per second)
-    total_elements = (
-        insights['timelineStats']['textOverlayCount'] +
-        insights['timelineStats']['objectDetectionCount'] +
-        insights['timelineStats']['gestureCount'] +
-        insights['timelineStats']['stickerCount']
-    )
-    insights['creativeDensity'] = total_elements / max(duration, 1)
+    total_elements = text_count + object_count + gesture_count + sticker_count
+    insights['creativeDensity'] = total_elements / duration
     
     # Scene complexity
-    insights['sceneComplexity'] = insights['timelineStats']['sceneChangeCount'] / max(duration, 1)
+    insights['sceneComplexity'] = scene_change_count / duration
     
     # Human presence rate (simplified - based on person detections and expressions)
-    human_indicators = (
-        insights['timelineStats']['expressionCount'] +
-        object_counts.get('person', 0)
-    )
-    insights['humanPresenceRate'] = min(human_indicators / max(duration, 1), 1.0)
+    human_indicators = expression_count + object_counts['person']
+    insights['humanPresenceRate'] = min(human_indicators / duration, 1.0)
     
     # Engagement indicators based on available data
     engagement_indicators = []
@@ -331,20 +385,40 @@ def calculate_insights(unified):
 
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python update_unified_analysis.py <video_id>")
-        sys.exit(1)
-    
-    video_id = sys.argv[1]
-    
-    success = update_unified_analysis(video_id)
-    
-    if success:
-        print("\n✅ Unified analysis update completed successfully")
+    parser = argparse.ArgumentParser(description="Update unified analysis with all available data")
+    parser.add_argument('video_id', nargs='?', help="Video to update")
+    parser.add_argument('--batch', metavar='FILE',
+                        help="Update every video ID listed in FILE (one per line) in this process")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Processes to spread a --batch run over (default: 1)")
+    args = parser.parse_args()
+    if (args.video_id is None) == (args.batch is None):
+        parser.error("give either a video_id or --batch FILE")
+    
+    if args.video_id is not None:
+        success = update_unified_analysis(args.video_id)
+        
+        if success:
+            print("\n✅ Unified analysis update completed successfully")
+        else:
+            print("\n❌ Unified analysis update failed")
+            sys.exit(1)
+        return
+    
+    video_ids = [line.strip() for line in Path(args.batch).read_text().splitlines() if line.strip()]
+    # Videos are independent, so they can also be spread over worker processes
+    if args.workers > 1:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            results = list(executor.map(update_unified_analysis, video_ids))
     else:
-        print("\n❌ Unified analysis update failed")
+        results = [update_unified_analysis(video_id) for video_id in video_ids]
+    
+    failed = [video_id for video_id, success in zip(video_ids, results) if not success]
+    print(f"\n{'❌' if failed else '✅'} Updated {len(video_ids) - len(failed)}/{len(video_ids)} unified analyses")
+    if failed:
+        print(f"   Failed: {', '.join(failed)}")
         sys.exit(1)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()